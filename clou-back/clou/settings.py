@@ -160,8 +160,13 @@ REST_FRAMEWORK = {
         # 'rest_framework.authentication.BasicAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.TokenAuthentication',
-    ]
+    ],
+    # 목록 API 기본 페이지 크기 (함수형 뷰가 movies.pagination / emotions.pagination 의 클래스를 직접 사용 -
+    # 전역 DEFAULT_PAGINATION_CLASS 는 두지 않음)
+    'PAGE_SIZE': 20,
 }
+# 위처럼 PAGE_SIZE 만 전역으로 두고 페이지네이션 클래스는 뷰마다 지정하므로 DRF 의 경고를 끔
+SILENCED_SYSTEM_CHECKS = ['rest_framework.W001']
 
 # 미디어 추가
 MEDIA_URL = '/media/'
@@ -171,7 +176,30 @@ MEDIA_ROOT = BASE_DIR / 'media'
 SPOTIFY_CLIENT_ID = config('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = config('SPOTIFY_CLIENT_SECRET')
 
+# OST 캐시 유효 시간(초) - 결과 있음 / 결과 없음 / 검색 실패
+OST_CACHE_TTL = config('OST_CACHE_TTL', default=60 * 60 * 24 * 7, cast=int)
+OST_NEGATIVE_CACHE_TTL = config('OST_NEGATIVE_CACHE_TTL', default=60 * 60 * 24, cast=int)
+OST_ERROR_CACHE_TTL = config('OST_ERROR_CACHE_TTL', default=60 * 10, cast=int)
+# 만료된 캐시는 기존 값을 응답하고 백그라운드 스레드에서 갱신
+# (끄면 만료/미스 때 요청 안에서 바로 Spotify 를 호출)
+OST_CACHE_BACKGROUND_REFRESH = config('OST_CACHE_BACKGROUND_REFRESH', default=True, cast=bool)
+# 백그라운드 갱신 스레드 수와 대기열 최대 길이 (넘치면 건너뛰고 warm_osts 에 맡김)
+OST_REFRESH_WORKERS = config('OST_REFRESH_WORKERS', default=2, cast=int)
+OST_REFRESH_MAX_PENDING = config('OST_REFRESH_MAX_PENDING', default=100, cast=int)
+
+# 영화 저장 시 태깅 필드가 바뀌었으면 해당 영화만 감정 태그를 다시 계산
+EMOTION_AUTO_RETAG = config('EMOTION_AUTO_RETAG', default=True, cast=bool)
+
 # Django-allauth 이메일 확인 설정 간소화
 ACCOUNT_EMAIL_VERIFICATION = 'none'  # 이메일 확인 이메일 전송 안함
 ACCOUNT_EMAIL_REQUIRED = False       # 이메일 필수 입력 아님
 SITE_ID = 1                          # django.contrib.sites 설정
+
+# 다이어리 감정 프로필 - 이 일수가 지난 기록은 가중치가 절반이 됨
+DIARY_PROFILE_HALF_LIFE_DAYS = config('DIARY_PROFILE_HALF_LIFE_DAYS', default=30, cast=float)
+# 다이어리 기반 추천 결과 캐시 시간(초) - 다이어리가 바뀌면 그 전이라도 새로 계산
+DIARY_RECOMMENDATION_CACHE_TTL = config('DIARY_RECOMMENDATION_CACHE_TTL', default=60 * 60, cast=int)
+
+# 감정 점수 = (태깅 점수 x 이 값 + 다이어리 투표 수) / (이 값 + 영화의 전체 투표 수)
+# 태깅 점수를 투표 몇 표만큼으로 볼지 (클수록 투표가 쌓여야 점수가 움직임)
+EMOTION_VOTE_PRIOR_WEIGHT = config('EMOTION_VOTE_PRIOR_WEIGHT', default=3, cast=float)
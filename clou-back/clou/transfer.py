@@ -0,0 +1,253 @@
+import csv
+import datetime
+import io
+import json
+from collections import namedtuple
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+# 대량 내보내기/가져오기 (NDJSON, CSV) 공통 처리
+# 내보내기는 .iterator(chunk_size=...) 로 읽은 행을 바로 텍스트로 바꿔 StreamingHttpResponse 로 흘려보내고,
+# 가져오기는 IMPORT_BATCH_SIZE 행씩 검증(참조하는 값은 배치마다 한 번에 조회)한 뒤 bulk_create 한다.
+# 어느 쪽도 전체 행을 메모리에 올리지 않으므로 기록이 10개든 10만 개든 메모리 사용량이 일정하다.
+# 앱마다 필드 목록과 행 <-> 모델 변환만 Transfer 로 정의한다. (movies.transfer, diary.transfer)
+
+TRANSFER_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# DB 에서 한 번에 읽어오는 행 수
+EXPORT_CHUNK_SIZE = 2000
+# 응답으로 한 번에 써 보내는 행 수
+EXPORT_FLUSH_ROWS = 500
+# 가져오기 때 한 번에 검증/저장하는 행 수
+IMPORT_BATCH_SIZE = 500
+# 결과에 담는 오류 행 최대 개수 (나머지는 개수만 셈)
+MAX_IMPORT_ERRORS = 100
+
+# name: 파일 이름, label: 메시지에 쓰는 이름, fields: 내보내는 열
+# export_rows(사용자) -> dict 행 iterator, importer(사용자, read_rows 결과, batch_size) -> import_rows 결과
+Transfer = namedtuple('Transfer', ['name', 'label', 'fields', 'export_rows', 'importer'])
+
+
+class ImportRowError(Exception):
+    """가져오기 중 한 행이 올바르지 않음 (그 행만 건너뜀)"""
+
+
+def _drain(buffer):
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_chunks(rows, fields, fmt):
+    """dict 행을 NDJSON/CSV 텍스트로 바꿔 EXPORT_FLUSH_ROWS 행씩 묶어서 내보낸다"""
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+
+        def write(row):
+            writer.writerow([_csv_value(row[field]) for field in fields])
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+        def write(row):
+            buffer.write(encoder.encode({field: row[field] for field in fields}))
+            buffer.write('\n')
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= EXPORT_FLUSH_ROWS:
+            yield _drain(buffer)
+            pending = 0
+    yield _drain(buffer)
+
+
+def export_response(request, transfer):
+    """?output=ndjson|csv 로 현재 사용자의 행을 스트리밍 응답으로 내보낸다"""
+    fmt = request.query_params.get('output', 'ndjson')
+    if fmt not in TRANSFER_FORMATS:
+        return Response({'error': 'output 은 ndjson 또는 csv 여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    response = StreamingHttpResponse(
+        export_chunks(transfer.export_rows(request.user), transfer.fields, fmt),
+        content_type=f'{TRANSFER_FORMATS[fmt]}; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{transfer.name}.{fmt}"'
+    return response
+
+
+def import_response(request, transfer):
+    """요청 본문을 현재 사용자에게 가져온다
+
+    일부 행이 올바르지 않아도 나머지는 가져오고 200 으로 결과를 돌려준다. (본문 자체가 잘못되면 import_rows 가 400)
+    """
+    return Response(transfer.importer(request.user, request_rows(request)))
+
+
+def decode_lines(stream):
+    """바이트 줄 iterator(요청 본문 등) -> 문자열 줄 (UTF-8, 첫 줄의 BOM 제거)"""
+    for number, line in enumerate(stream):
+        text = line.decode('utf-8', errors='replace')
+        yield text.lstrip('\ufeff') if number == 0 else text
+
+
+def import_format(content_type):
+    """요청 Content-Type 으로 가져오기 형식을 정한다 (text/csv 면 CSV, 그 외는 NDJSON)"""
+    return 'csv' if content_type.split(';')[0].strip() == 'text/csv' else 'ndjson'
+
+
+def request_rows(request):
+    """요청 본문을 한 줄씩 읽는 read_rows (request.data 처럼 본문 전체를 읽어 두지 않음)"""
+    return read_rows(decode_lines(request.stream or ()), import_format(request.content_type or ''))
+
+
+def read_rows(lines, fmt):
+    """텍스트 줄 iterator -> (줄 번호, dict 또는 None, 오류 메시지 또는 None)
+
+    CSV 의 빈 칸은 None 으로 읽는다.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, {key: value or None for key, value in row.items() if key is not None}, None
+        return
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, '올바른 JSON 이 아닙니다.'
+            continue
+        if not isinstance(row, dict):
+            yield number, None, 'JSON 객체가 아닙니다.'
+            continue
+        yield number, row, None
+
+
+def import_rows(rows, prepare, build, save, batch_size=IMPORT_BATCH_SIZE):
+    """read_rows 결과를 batch_size 행씩 검증해서 저장한다
+
+    prepare(배치 행 목록) -> 배치에서 참조하는 값 조회 결과 (쿼리는 여기서 한 번에)
+    build(행, 조회 결과) -> 저장할 객체 (올바르지 않으면 ImportRowError)
+    save(객체 목록) -> 트랜잭션 안에서 bulk_create 등으로 저장
+
+    올바르지 않은 행은 건너뛰고 결과의 skipped/errors 에 담는다.
+    읽을 수 있는 행이 하나도 없으면(빈 본문, 전부 깨진 JSON) 본문 자체가 잘못된 것으로 보고 ParseError(400).
+    """
+    result = {'created': 0, 'skipped': 0, 'errors': []}
+    parsed_rows = 0
+
+    def fail(line, message):
+        result['skipped'] += 1
+        if len(result['errors']) < MAX_IMPORT_ERRORS:
+            result['errors'].append({'line': line, 'error': message})
+
+    rows = iter(rows)
+    batch_size = max(batch_size, 1)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        parsed = []
+        for line, row, error in batch:
+            if error is not None:
+                fail(line, error)
+            else:
+                parsed.append((line, row))
+        parsed_rows += len(parsed)
+
+        lookups = prepare([row for _, row in parsed])
+        objects = []
+        for line, row in parsed:
+            try:
+                objects.append(build(row, lookups))
+            except ImportRowError as e:
+                fail(line, str(e))
+
+        if objects:
+            with transaction.atomic():
+                save(objects)
+            result['created'] += len(objects)
+
+    if not parsed_rows:
+        raise ParseError({'error': '가져올 행이 없습니다.', 'errors': result['errors']})
+    return result
+
+
+def _get_user(username):
+    user = get_user_model().objects.filter(username=username).first()
+    if user is None:
+        raise CommandError(f'사용자 {username} 이 없습니다.')
+    return user
+
+
+class ExportCommand(BaseCommand):
+    """사용자 한 명의 행을 파일/표준 출력으로 내보내는 명령 (transfer 만 지정해서 씀)"""
+
+    transfer = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='내보낼 사용자 이름')
+        parser.add_argument('--format', choices=sorted(TRANSFER_FORMATS), default='ndjson', help='출력 형식')
+        parser.add_argument('--output', default='-', help='저장할 파일 경로 (기본값: 표준 출력)')
+
+    def handle(self, *args, **options):
+        user = _get_user(options['username'])
+        chunks = export_chunks(self.transfer.export_rows(user), self.transfer.fields, options['format'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f'{options["output"]} 에 {self.transfer.label}를 내보냈습니다.'))
+
+
+class ImportCommand(BaseCommand):
+    """파일의 행을 사용자 한 명에게 가져오는 명령 (transfer 만 지정해서 씀)"""
+
+    transfer = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='가져올 사용자 이름')
+        parser.add_argument('path', help='가져올 파일 경로')
+        parser.add_argument('--format', choices=sorted(TRANSFER_FORMATS), default=None,
+                            help='입력 형식 (기본값: 확장자가 .csv 면 csv, 아니면 ndjson)')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='한 번에 검증/저장할 행 수')
+
+    def handle(self, *args, **options):
+        user = _get_user(options['username'])
+        fmt = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+        with open(options['path'], encoding='utf-8-sig', newline='') as f:
+            try:
+                result = self.transfer.importer(user, read_rows(f, fmt), batch_size=options['batch_size'])
+            except ParseError as e:
+                raise CommandError(e.detail['error'])
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f'{error["line"]}번째 줄: {error["error"]}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.transfer.label} {result["created"]}개를 가져왔습니다. (건너뛴 행 {result["skipped"]}개)'
+        ))
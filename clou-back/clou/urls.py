@@ -31,5 +31,6 @@ urlpatterns = [
     # 기타 API 엔드포인트
     path('api/v1/diary/', include('diary.urls')),
     path('api/v1/movies/', include('movies.urls')),
+    path('api/v1/movies/', include('osts.urls')),
     path('api/v1/emotions/', include('emotions.urls')),
 ]
@@ -0,0 +1,6 @@
+from clou.transfer import ExportCommand
+from diary.transfer import DIARY_TRANSFER
+
+class Command(ExportCommand):
+    help = '사용자의 다이어리 전체를 NDJSON/CSV 로 내보냅니다 (기록을 나눠 읽으며 바로 씀)'
+    transfer = DIARY_TRANSFER
@@ -0,0 +1,6 @@
+from clou.transfer import ImportCommand
+from diary.transfer import DIARY_TRANSFER
+
+class Command(ImportCommand):
+    help = 'NDJSON/CSV 파일의 다이어리를 사용자에게 가져옵니다 (배치마다 검증 후 bulk_create)'
+    transfer = DIARY_TRANSFER
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('diary', '0002_alter_diaryentry_options_diaryentry_date_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEmotionProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weights', models.JSONField(default=dict)),
+                ('reference_date', models.DateField(blank=True, null=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='emotion_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
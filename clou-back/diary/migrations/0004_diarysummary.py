@@ -0,0 +1,77 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# 아래 집계는 diary.summary.rebuild_summaries 를 이 마이그레이션 시점 그대로 옮겨 둔 것
+# (앱 코드가 바뀌어도 이 마이그레이션이 하는 일은 달라지지 않도록)
+FILL_CHUNK_SIZE = 2000
+
+
+def fill_summaries(apps, schema_editor):
+    DiaryEntry = apps.get_model('diary', 'DiaryEntry')
+    DiarySummary = apps.get_model('diary', 'DiarySummary')
+    Movie = apps.get_model('movies', 'Movie')
+
+    genres = {}
+    rows = Movie.genre_tags.through.objects.filter(
+        movie_id__in=DiaryEntry.objects.filter(movie__isnull=False).values('movie_id')
+    )
+    for movie_id, name in rows.values_list('movie_id', 'genre__name'):
+        genres.setdefault(movie_id, []).append(name)
+
+    def add(counts, key):
+        counts[str(key)] = counts.get(str(key), 0) + 1
+
+    # (사용자, 날짜) 순으로 읽으므로 키가 바뀌면 앞의 요약은 끝난 것 - 다 모은 요약만 나눠서 저장
+    pending = []
+    summary = None
+    entries = (
+        DiaryEntry.objects.order_by('user_id', 'date')
+        .values_list('user_id', 'date', 'emotion_id', 'movie_id').iterator(chunk_size=FILL_CHUNK_SIZE)
+    )
+    for user_id, date, emotion_id, movie_id in entries:
+        if summary is None or (summary.user_id, summary.date) != (user_id, date):
+            summary = DiarySummary(user_id=user_id, date=date, emotion_counts={}, genre_counts={})
+            pending.append(summary)
+            if len(pending) > 500:
+                DiarySummary.objects.bulk_create(pending[:-1])
+                pending = pending[-1:]
+        summary.entry_count += 1
+        if emotion_id is not None:
+            add(summary.emotion_counts, emotion_id)
+        for genre in genres.get(movie_id, []):
+            add(summary.genre_counts, genre)
+    DiarySummary.objects.bulk_create(pending)
+
+
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('diary', '0003_useremotionprofile'),
+        ('movies', '0010_movie_relations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiarySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('emotion_counts', models.JSONField(default=dict)),
+                ('genre_counts', models.JSONField(default=dict)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='diary_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='diarysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_diary_summary_user_date'),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
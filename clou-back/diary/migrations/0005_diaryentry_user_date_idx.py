@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0004_diarysummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diaryentry',
+            index=models.Index(fields=['user', 'date'], name='diaryentry_user_date_idx'),
+        ),
+    ]
@@ -14,8 +14,52 @@ class DiaryEntry(models.Model):
 
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            # 사용자별 날짜 범위 조회 (월별 다이어리, 캘린더)
+            models.Index(fields=['user', 'date'], name='diaryentry_user_date_idx'),
+        ]
         # unique_together = ('user', 'date') # 하루에 하나의 다이어리만 작성 가능하게 할 경우 활성화
 
     def __str__(self):
         emotion_str = self.emotion.name if self.emotion else '감정 없음'
-        return f"{self.user.nickname}의 {self.date} 다이어리 ({emotion_str})"
\ No newline at end of file
+        return f"{self.user.nickname}의 {self.date} 다이어리 ({emotion_str})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 수정 시 감정 프로필에서 예전 값을 빼기 위해 DB에서 읽은 값을 기억
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+# 사용자별 감정 프로필 - 다이어리 감정의 시간 감쇠 히스토그램
+# weights 는 reference_date 기준 값 ({감정 id: 가중치}), 다이어리 저장/삭제 때마다 증분 갱신
+class UserEmotionProfile(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='emotion_profile')
+    weights = models.JSONField(default=dict)
+    reference_date = models.DateField(null=True, blank=True)
+    # 갱신될 때마다 1씩 증가 (추천 결과 캐시 키에 사용)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.nickname}의 감정 프로필"
+
+
+# 사용자별 하루 다이어리 요약 - 통계 화면은 다이어리 대신 이 표를 날짜 범위로 읽는다
+# 다이어리 저장/수정/삭제 때 해당 날짜 행만 증감 (diary.summary)
+class DiarySummary(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='diary_summaries')
+    date = models.DateField()
+    entry_count = models.PositiveIntegerField(default=0)
+    # {감정 id: 기록 수}, {장르 이름: 기록 수} (장르는 기록할 때의 영화 장르 기준)
+    emotion_counts = models.JSONField(default=dict)
+    genre_counts = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_diary_summary_user_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.nickname}의 {self.date} 요약 ({self.entry_count}개)"
\ No newline at end of file
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from .models import DiaryEntry, UserEmotionProfile
+
+# 다이어리 감정 프로필 (시간 감쇠 히스토그램)
+# 날짜 d 의 기록은 reference_date 기준 0.5 ** ((reference_date - d) / 반감기) 만큼 감정 가중치에 더해진다.
+# 더 최근 날짜의 기록이 들어오면 기존 가중치 전체에 같은 비율을 곱해서 기준일을 옮기므로
+# 다이어리 하나가 추가/삭제될 때 전체를 다시 계산하지 않고 해당 감정 값만 더하거나 빼면 된다.
+
+# 이보다 작아진 가중치는 0으로 보고 지움 (빼기를 반복하며 생기는 부동소수점 찌꺼기)
+MIN_WEIGHT = 1e-9
+
+# 전체 다시 계산할 때 DB 에서 한 번에 읽어오는 기록 수
+REBUILD_CHUNK_SIZE = 2000
+
+
+def decay(days):
+    return 0.5 ** (days / settings.DIARY_PROFILE_HALF_LIFE_DAYS)
+
+
+def _apply(profile, emotion_id, date, sign):
+    weights = profile.weights
+    if profile.reference_date is None:
+        profile.reference_date = date
+    elif date > profile.reference_date:
+        factor = decay((date - profile.reference_date).days)
+        weights = {key: value * factor for key, value in weights.items()}
+        profile.reference_date = date
+
+    key = str(emotion_id)
+    value = weights.get(key, 0.0) + sign * decay((profile.reference_date - date).days)
+    if value > MIN_WEIGHT:
+        weights[key] = value
+    else:
+        weights.pop(key, None)
+    profile.weights = weights
+
+
+def weights_at(profile, date):
+    """기준일을 date 로 옮긴 가중치 ({감정 id 문자열: 가중치})"""
+    if profile.reference_date is None:
+        return dict(profile.weights)
+    factor = decay((date - profile.reference_date).days)
+    return {key: value * factor for key, value in profile.weights.items()}
+
+
+def rebuild_profile(user_id):
+    """다이어리 전체로 프로필을 다시 계산 (프로필이 없을 때, 또는 보정용)"""
+    # 기록 수와 관계없이 메모리가 일정하도록 기준일은 집계로 먼저 구하고 기록은 나눠 읽는다
+    entries = DiaryEntry.objects.filter(user_id=user_id, emotion__isnull=False).order_by()
+    with transaction.atomic():
+        profile, _ = UserEmotionProfile.objects.select_for_update().get_or_create(user_id=user_id)
+        profile.weights = {}
+        profile.reference_date = entries.aggregate(latest=Max('date'))['latest']
+        for emotion_id, date in entries.values_list('emotion_id', 'date').iterator(chunk_size=REBUILD_CHUNK_SIZE):
+            _apply(profile, emotion_id, date, 1)
+        profile.version += 1
+        profile.save()
+    return profile
+
+
+def update_profile(user_id, removed=None, added=None):
+    """다이어리 하나가 바뀐 만큼만 프로필에 반영 - removed/added 는 (감정 id, 날짜) 또는 None
+
+    프로필이 아직 없으면 기록이 추가된 경우에만 전체 기록으로 새로 만든다.
+    (삭제만 있을 때는 만들지 않음 - 사용자 탈퇴로 기록이 함께 지워지는 중일 수 있음)
+    """
+    with transaction.atomic():
+        profile = UserEmotionProfile.objects.select_for_update().filter(user_id=user_id).first()
+        if profile is None:
+            return rebuild_profile(user_id) if added is not None else None
+        if removed is not None:
+            _apply(profile, *removed, -1)
+        if added is not None:
+            _apply(profile, *added, 1)
+        profile.version += 1
+        profile.save()
+    return profile
+
+
+def get_profile(user):
+    profile = UserEmotionProfile.objects.filter(user=user).first()
+    return profile if profile is not None else rebuild_profile(user.id)
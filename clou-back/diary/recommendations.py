@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
+from emotions.vectors import get_emotion_matrix
+from .models import DiaryEntry
+from .profile import get_profile
+
+# 다이어리 감정 프로필 기반 영화 추천
+# 프로필 벡터와 영화별 감정 점수 행렬(emotions.vectors)의 코사인 유사도로 아직 기록하지 않은 영화를 정렬한다.
+# 결과는 (프로필 버전, 감정 행렬 버전)을 키로 캐시하므로 다이어리나 영화 감정이 바뀌면 자동으로 새로 계산된다.
+
+MAX_RECOMMENDATIONS = 50
+
+
+def recommend_for_user(user, limit=20):
+    """(프로필, [(영화 id, 점수)])"""
+    profile = get_profile(user)
+    matrix = get_emotion_matrix()
+    catalogue_version, scores_version = matrix.version
+    cache_key = f'diary:recommendations:{user.id}:{profile.version}:{catalogue_version}:{scores_version}'
+
+    scored = cache.get(cache_key)
+    if scored is None:
+        weights = {int(emotion_id): weight for emotion_id, weight in profile.weights.items()}
+        seen = DiaryEntry.objects.filter(user=user, movie__isnull=False).values_list('movie_id', flat=True)
+        scored = matrix.matching_emotion_ids(weights, limit=MAX_RECOMMENDATIONS, exclude_movie_ids=set(seen))
+        cache.set(cache_key, scored, settings.DIARY_RECOMMENDATION_CACHE_TTL)
+    return profile, scored[:limit]
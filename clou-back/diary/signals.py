@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from emotions.votes import update_votes
+from .models import DiaryEntry
+from .profile import rebuild_profile, update_profile
+from .summary import rebuild_summaries, update_summary
+
+
+def _emotion_point(values):
+    """(감정 id, 날짜) - 감정이 없는 기록은 프로필에 반영하지 않음"""
+    if values.get('emotion_id') is None:
+        return None
+    return values['emotion_id'], values['date']
+
+
+def _movie_vote(values):
+    """(영화 id, 감정 id) - 영화와 감정이 모두 있는 기록만 영화 감정 투표로 셈"""
+    if values.get('movie_id') is None or values.get('emotion_id') is None:
+        return None
+    return values['movie_id'], values['emotion_id']
+
+
+TRACKED_FIELDS = ('movie_id', 'emotion_id', 'date')
+
+
+def _current_values(instance):
+    return {field: getattr(instance, field) for field in TRACKED_FIELDS}
+
+
+def _loaded_values(instance):
+    """DB에서 읽었을 때의 (영화, 감정, 날짜) - 읽은 적이 없으면 None"""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return None
+    return {field: loaded.get(field) for field in TRACKED_FIELDS}
+
+
+@receiver(post_save, sender=DiaryEntry)
+def update_aggregates_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous = {} if created else _loaded_values(instance)
+    if previous is None:
+        # DB에서 읽지 않은 객체를 저장한 경우 - 예전 값을 모르므로 프로필/요약은 전체 다시 계산
+        # (투표 수는 이전 값을 뺄 수 없어서 그대로 둠)
+        rebuild_profile(instance.user_id)
+        rebuild_summaries([instance.user_id])
+        return
+    current = _current_values(instance)
+    instance._loaded_values = {**getattr(instance, '_loaded_values', {}), **current}
+
+    if _emotion_point(previous) != _emotion_point(current):
+        update_profile(instance.user_id, removed=_emotion_point(previous), added=_emotion_point(current))
+    update_votes(removed=_movie_vote(previous), added=_movie_vote(current))
+    if previous != current:
+        update_summary(instance.user_id, removed=previous or None, added=current)
+
+
+@receiver(post_delete, sender=DiaryEntry)
+def update_aggregates_on_delete(sender, instance, **kwargs):
+    values = _loaded_values(instance) or _current_values(instance)
+    removed = _emotion_point(values)
+    if removed is not None:
+        update_profile(instance.user_id, removed=removed)
+    update_votes(removed=_movie_vote(values))
+    update_summary(instance.user_id, removed=values)
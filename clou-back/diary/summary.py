@@ -0,0 +1,129 @@
+import datetime
+from collections import Counter
+
+from django.db import transaction
+from movies.models import Movie
+from .models import DiaryEntry, DiarySummary
+
+# 하루 단위 다이어리 요약(DiarySummary) 유지와 기간 통계 계산
+# 다이어리 하나가 바뀌면 그 날짜 행 하나만 ±1 하고, 통계 API 는 기간의 요약 행(최대 366개)만 읽는다.
+
+TOP_GENRES = 5
+
+# 전체 다시 계산할 때 DB 에서 한 번에 읽어오는 기록 수
+REBUILD_CHUNK_SIZE = 2000
+
+
+def _movie_genres(movie_id):
+    if movie_id is None:
+        return []
+    return list(Movie.genre_tags.through.objects.filter(movie_id=movie_id).values_list('genre__name', flat=True))
+
+
+def _add(counts, key, delta):
+    key = str(key)
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def apply_entry(user_id, values, sign):
+    """다이어리 하나(values: movie_id, emotion_id, date)를 그 날짜 요약에 더하거나(1) 뺀다(-1)"""
+    genres = _movie_genres(values['movie_id'])
+    with transaction.atomic():
+        summary = DiarySummary.objects.select_for_update().filter(user_id=user_id, date=values['date']).first()
+        if summary is None:
+            if sign < 0:
+                return
+            summary = DiarySummary(user_id=user_id, date=values['date'])
+
+        summary.entry_count = max(summary.entry_count + sign, 0)
+        if values['emotion_id'] is not None:
+            _add(summary.emotion_counts, values['emotion_id'], sign)
+        for genre in genres:
+            _add(summary.genre_counts, genre, sign)
+
+        if summary.entry_count == 0:
+            if summary.pk:
+                summary.delete()
+        else:
+            summary.save()
+
+
+def update_summary(user_id, removed=None, added=None):
+    """removed/added 는 {'movie_id', 'emotion_id', 'date'} 또는 None"""
+    with transaction.atomic():
+        if removed is not None:
+            apply_entry(user_id, removed, -1)
+        if added is not None:
+            apply_entry(user_id, added, 1)
+
+
+def rebuild_summaries(user_ids):
+    """다이어리 전체로 요약을 다시 만든다 (가져오기 후, 보정용)"""
+    # 기록은 나눠 읽고 메모리에는 날짜별 요약과 영화별 장르만 둔다
+    entries = DiaryEntry.objects.filter(user_id__in=user_ids).order_by()
+    genres = {}
+    rows = Movie.genre_tags.through.objects.filter(movie_id__in=entries.filter(movie__isnull=False).values('movie_id'))
+    for movie_id, name in rows.values_list('movie_id', 'genre__name'):
+        genres.setdefault(movie_id, []).append(name)
+
+    summaries = {}
+    entries = entries.values_list('user_id', 'date', 'emotion_id', 'movie_id').iterator(chunk_size=REBUILD_CHUNK_SIZE)
+    for user_id, date, emotion_id, movie_id in entries:
+        summary = summaries.get((user_id, date))
+        if summary is None:
+            summary = summaries[(user_id, date)] = DiarySummary(user_id=user_id, date=date)
+        summary.entry_count += 1
+        if emotion_id is not None:
+            _add(summary.emotion_counts, emotion_id, 1)
+        for genre in genres.get(movie_id, []):
+            _add(summary.genre_counts, genre, 1)
+
+    with transaction.atomic():
+        DiarySummary.objects.filter(user_id__in=user_ids).delete()
+        DiarySummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+def longest_streak(dates):
+    """연속으로 기록한 가장 긴 기간 (일수, 시작일, 마지막일) - dates 는 정렬된 날짜 목록"""
+    best = (0, None, None)
+    start = previous = None
+    for date in dates:
+        if previous is None or date - previous != datetime.timedelta(days=1):
+            start = date
+        length = (date - start).days + 1
+        if length > best[0]:
+            best = (length, start, date)
+        previous = date
+    return best
+
+
+def period_stats(user, start_date, end_date):
+    """기간(양 끝 포함)의 일별 기록 수, 감정 분포, 최장 연속 기록, 많이 본 장르 - 요약 표 범위 조회 한 번"""
+    summaries = list(
+        DiarySummary.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
+        .order_by('date').values('date', 'entry_count', 'emotion_counts', 'genre_counts')
+    )
+    emotions = Counter()
+    genres = Counter()
+    months = Counter()
+    for summary in summaries:
+        emotions.update({int(k): v for k, v in summary['emotion_counts'].items()})
+        genres.update(summary['genre_counts'])
+        months[summary['date'].month] += summary['entry_count']
+
+    streak_days, streak_start, streak_end = longest_streak([s['date'] for s in summaries])
+    return {
+        'total': sum(s['entry_count'] for s in summaries),
+        'days': [{'date': s['date'], 'count': s['entry_count']} for s in summaries],
+        'months': months,
+        'emotions': emotions,
+        'longest_streak': {'days': streak_days, 'start': streak_start, 'end': streak_end},
+        'top_genres': [
+            {'genre': genre, 'count': count}
+            for genre, count in sorted(genres.items(), key=lambda item: (-item[1], item[0]))[:TOP_GENRES]
+        ],
+    }
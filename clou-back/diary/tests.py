@@ -1,3 +1,298 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from accounts.models import User
+from emotions.models import Emotion, MovieEmotionVote
+from emotions.services import save_movie_emotions
+from movies.models import Movie
+from clou.transfer import read_rows
+from .models import DiaryEntry, DiarySummary, UserEmotionProfile
+from .profile import rebuild_profile, weights_at
+from .summary import rebuild_summaries
+from .transfer import import_diary_entries
 
 # Create your tests here.
+@override_settings(DIARY_PROFILE_HALF_LIFE_DAYS=10)
+class EmotionProfileTests(TestCase):
+    """다이어리 저장/수정/삭제 시 증분 갱신한 프로필이 전체 재계산과 같은지 확인"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.sad = Emotion.objects.get(name='슬픔')
+        self.happy = Emotion.objects.get(name='행복')
+
+    def assertMatchesRebuild(self):
+        profile = UserEmotionProfile.objects.get(user=self.user)
+        expected = rebuild_profile(self.user.id)
+        # 삭제 후에는 기준일이 다를 수 있으므로 같은 날짜 기준으로 비교
+        date = max(profile.reference_date, expected.reference_date)
+        actual, expected = weights_at(profile, date), weights_at(expected, date)
+        self.assertEqual(actual.keys(), expected.keys())
+        for key, weight in expected.items():
+            self.assertAlmostEqual(actual[key], weight)
+
+    def test_incremental_updates(self):
+        day = datetime.date(2025, 1, 1)
+        first = DiaryEntry.objects.create(user=self.user, emotion=self.sad, date=day)
+        DiaryEntry.objects.create(user=self.user, emotion=self.happy, date=day + datetime.timedelta(days=10))
+        profile = UserEmotionProfile.objects.get(user=self.user)
+        # 10일 전 기록은 반감기(10일)만큼 가중치가 절반
+        self.assertAlmostEqual(profile.weights[str(self.sad.id)], 0.5)
+        self.assertAlmostEqual(profile.weights[str(self.happy.id)], 1.0)
+
+        entry = DiaryEntry.objects.get(pk=first.pk)
+        entry.emotion = self.happy
+        entry.date = day + datetime.timedelta(days=20)
+        entry.save()
+        self.assertMatchesRebuild()
+
+        entry.delete()
+        self.assertMatchesRebuild()
+        self.assertNotIn(str(self.sad.id), UserEmotionProfile.objects.get(user=self.user).weights)
+
+    def test_note_only_edit_keeps_profile(self):
+        entry = DiaryEntry.objects.create(user=self.user, emotion=self.sad)
+        version = UserEmotionProfile.objects.get(user=self.user).version
+
+        entry = DiaryEntry.objects.get(pk=entry.pk)
+        entry.note = '메모'
+        entry.save()
+        self.assertEqual(UserEmotionProfile.objects.get(user=self.user).version, version)
+
+
+class DiaryRecommendationTests(TestCase):
+    """프로필 감정과 가까운 영화 중 아직 기록하지 않은 영화를 추천하는지 확인"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        emotion_ids = dict(Emotion.objects.values_list('name', 'id'))
+        self.movies = {}
+        scored = {}
+        for tmdb_id, emotions in {1: [('슬픔', 1.0)], 2: [('슬픔', 0.8), ('희망', 0.4)], 3: [('공포', 1.0)]}.items():
+            movie = Movie.objects.create(tmdb_id=tmdb_id, title=f'영화{tmdb_id}', poster_path='/a.jpg')
+            self.movies[tmdb_id] = movie
+            scored[movie.id] = emotions
+        with self.captureOnCommitCallbacks(execute=True):
+            save_movie_emotions(scored, emotion_ids)
+
+        self.sad = Emotion.objects.get(name='슬픔')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def recommended(self):
+        response = self.client.get('/api/v1/diary/recommendations/')
+        self.assertEqual(response.status_code, 200)
+        return [movie['tmdb_id'] for movie in response.data['results']]
+
+    def test_ranks_unseen_movies_by_profile(self):
+        DiaryEntry.objects.create(user=self.user, emotion=self.sad, movie=self.movies[1])
+        self.assertEqual(self.recommended(), [2])
+
+    def test_cache_follows_diary_changes(self):
+        self.assertEqual(self.recommended(), [])
+        entry = DiaryEntry.objects.create(user=self.user, emotion=self.sad)
+        self.assertEqual(self.recommended(), [1, 2])
+
+        entry.delete()
+        self.assertEqual(self.recommended(), [])
+
+    def test_requires_login(self):
+        response = APIClient().get('/api/v1/diary/recommendations/')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(UserEmotionProfile.objects.exists())
+
+
+class DiaryStatsTests(TestCase):
+    """하루 요약 표가 다이어리 변경을 따라가고 통계 API 가 요약 표만 읽는지 확인"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.sad = Emotion.objects.get(name='슬픔')
+        self.happy = Emotion.objects.get(name='행복')
+        self.movie = Movie.objects.create(tmdb_id=1, title='영화', poster_path='/a.jpg', genres='드라마, 가족')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def write(self, day, emotion=None, movie=None):
+        return DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, day), emotion=emotion, movie=movie)
+
+    def test_month_stats(self):
+        for day in (1, 2, 3, 10):
+            self.write(day, self.sad, self.movie)
+        self.write(10, self.happy)
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/diary/stats/2025/3/')
+        data = response.data
+        self.assertEqual(data['total'], 5)
+        self.assertEqual(data['days'][-1], {'date': datetime.date(2025, 3, 10), 'count': 2})
+        self.assertEqual([(e['name'], e['count']) for e in data['emotions']], [('슬픔', 4), ('행복', 1)])
+        self.assertEqual(data['longest_streak']['days'], 3)
+        self.assertEqual(data['top_genres'], [{'genre': '가족', 'count': 4}, {'genre': '드라마', 'count': 4}])
+
+    def test_summary_follows_updates_and_deletes(self):
+        entry = self.write(1, self.sad, self.movie)
+        entry = DiaryEntry.objects.get(pk=entry.pk)
+        entry.date = datetime.date(2025, 4, 1)
+        entry.save()
+
+        data = self.client.get('/api/v1/diary/stats/2025/').data
+        self.assertEqual([m['count'] for m in data['months'][2:4]], [0, 1])
+
+        entry.delete()
+        self.assertFalse(DiarySummary.objects.filter(user=self.user).exists())
+
+    def test_rebuild_matches_incremental(self):
+        self.write(1, self.sad, self.movie)
+        entry = self.write(1, self.happy)
+        DiaryEntry.objects.get(pk=entry.pk).delete()
+        incremental = list(DiarySummary.objects.values('date', 'entry_count', 'emotion_counts', 'genre_counts'))
+
+        rebuild_summaries([self.user.id])
+        rebuilt = list(DiarySummary.objects.values('date', 'entry_count', 'emotion_counts', 'genre_counts'))
+        self.assertEqual(incremental, rebuilt)
+
+    def test_requires_login(self):
+        response = APIClient().get('/api/v1/diary/stats/2025/3/')
+        self.assertEqual(response.status_code, 401)
+
+
+class MonthlyCalendarTests(TestCase):
+    """?view=calendar 가 쿼리 한 번으로 평평한 값 목록을 내려주는지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.movie = Movie.objects.create(tmdb_id=1, title='영화', poster_path='/a.jpg')
+        self.emotion = Emotion.objects.create(name='슬픔')
+        self.first = DiaryEntry.objects.create(
+            user=self.user, date=datetime.date(2025, 3, 2), movie=self.movie, emotion=self.emotion,
+        )
+        self.second = DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, 5))
+        DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 4, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_calendar_view(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/diary/monthly/2025/3/', {'view': 'calendar'})
+        self.assertEqual(response.data, [
+            {'id': self.first.id, 'date': datetime.date(2025, 3, 2), 'emotion_id': self.emotion.id, 'poster_path': '/a.jpg'},
+            {'id': self.second.id, 'date': datetime.date(2025, 3, 5), 'emotion_id': None, 'poster_path': None},
+        ])
+
+    def test_full_view_query_count_is_constant(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/diary/monthly/2025/3/')
+        self.assertEqual(response.data[0]['movie_detail']['title'], '영화')
+
+
+class DiaryTransferTests(TestCase):
+    """다이어리 내보내기/가져오기가 스트리밍으로 동작하고 가져온 뒤 집계가 맞는지 확인"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.sad = Emotion.objects.get(name='슬픔')
+        self.movie = Movie.objects.create(tmdb_id=7, title='영화', poster_path='/a.jpg', genres='드라마')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, output):
+        response = self.client.get('/api/v1/diary/export/', {'output': output})
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_formats(self):
+        DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, 2), movie=self.movie, emotion=self.sad, note='메모, "따옴표"')
+        DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, 1))
+
+        lines = [json.loads(line) for line in self.export('ndjson').splitlines()]
+        self.assertEqual([(row['date'], row['movie_tmdb_id'], row['emotion_name']) for row in lines],
+                         [('2025-03-01', None, None), ('2025-03-02', 7, '슬픔')])
+
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        self.assertEqual(rows[1]['note'], '메모, "따옴표"')
+        self.assertEqual(rows[0]['movie_tmdb_id'], '')
+        self.assertEqual(self.client.get('/api/v1/diary/export/', {'output': 'xml'}).status_code, 400)
+
+    @patch('clou.transfer.EXPORT_FLUSH_ROWS', 2)
+    def test_export_streams_in_chunks(self):
+        for day in range(1, 6):
+            DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, day))
+        response = self.client.get('/api/v1/diary/export/')
+        chunks = [chunk for chunk in response.streaming_content if chunk]
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [2, 2, 1])
+
+    def test_import_updates_aggregates(self):
+        body = '\n'.join([
+            json.dumps({'date': '2025-03-01', 'movie_tmdb_id': 7, 'emotion_name': '슬픔', 'note': '첫'}),
+            '{깨진 줄',
+            json.dumps({'date': '2025-03-02', 'movie_tmdb_id': 999}),
+            json.dumps({'date': '2025-03-02', 'emotion_name': '없는 감정'}),
+            json.dumps({'date': '3월', 'emotion_name': '슬픔'}),
+            json.dumps({'date': '2025-03-02', 'movie_tmdb_id': 7, 'emotion_name': '슬픔'}),
+        ])
+        # 배치 경계에 걸치도록 두 행씩 검증/저장
+        result = import_diary_entries(self.user, read_rows(body.splitlines(), 'ndjson'), batch_size=2)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([error['line'] for error in result['errors']], [2, 3, 4, 5])
+        self.assertEqual(MovieEmotionVote.objects.get(movie=self.movie, emotion=self.sad).count, 2)
+        self.assertEqual(DiarySummary.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(list(UserEmotionProfile.objects.get(user=self.user).weights), [str(self.sad.id)])
+
+    def test_csv_roundtrip(self):
+        DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, 2), movie=self.movie, emotion=self.sad, note='줄\n바꿈')
+        exported = self.export('csv')
+        DiaryEntry.objects.all().delete()
+
+        response = self.client.post('/api/v1/diary/import/', exported.encode(), content_type='text/csv')
+        self.assertEqual(response.data['created'], 1)
+        entry = DiaryEntry.objects.get(user=self.user)
+        self.assertEqual((entry.date, entry.movie_id, entry.emotion_id, entry.note),
+                         (datetime.date(2025, 3, 2), self.movie.id, self.sad.id, '줄\n바꿈'))
+
+    def test_import_status(self):
+        body = json.dumps({'date': '2025-03-02', 'movie_tmdb_id': 999})
+        response = self.client.post('/api/v1/diary/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['skipped']), (0, 1))
+
+        response = self.client.post('/api/v1/diary/import/', 'not json', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+
+    def test_commands_roundtrip(self):
+        DiaryEntry.objects.create(user=self.user, date=datetime.date(2025, 3, 2), movie=self.movie, emotion=self.sad)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'diary.csv')
+            call_command('export_diary', 'user', '--format', 'csv', '--output', path, stderr=io.StringIO())
+            DiaryEntry.objects.all().delete()
+
+            out = io.StringIO()
+            call_command('import_diary', 'user', path, stdout=out)
+            self.assertIn('다이어리 1개를 가져왔습니다. (건너뛴 행 0개)', out.getvalue())
+            self.assertEqual(DiaryEntry.objects.get(user=self.user).movie_id, self.movie.id)
+
+            open(path, 'w').close()
+            with self.assertRaises(CommandError):
+                call_command('import_diary', 'user', path, stdout=io.StringIO())
+
+    def test_requires_login(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/v1/diary/export/').status_code, 401)
+        self.assertEqual(client.post('/api/v1/diary/import/', '', content_type='application/x-ndjson').status_code, 401)
@@ -0,0 +1,79 @@
+import datetime
+from collections import Counter
+
+from django.db.models import F
+from emotions.models import Emotion
+from emotions.votes import record_vote
+from clou.transfer import EXPORT_CHUNK_SIZE, IMPORT_BATCH_SIZE, ImportRowError, Transfer, import_rows
+from movies.transfer import movie_ids_by_tmdb_id, resolve_movie_id
+from .models import DiaryEntry
+from .profile import rebuild_profile
+from .summary import rebuild_summaries
+
+# 다이어리 내보내기/가져오기 - 행 <-> 모델 변환만 여기서 정의하고 스트리밍/배치 처리는 clou.transfer
+# 영화는 tmdb_id, 감정은 이름으로 내보내서 다른 DB 로 옮겨도 그대로 가져올 수 있다.
+
+DIARY_EXPORT_FIELDS = ('id', 'date', 'movie_tmdb_id', 'emotion_name', 'note', 'created_at')
+
+
+def diary_export_rows(user):
+    return (
+        DiaryEntry.objects.filter(user=user)
+        .order_by('date', 'id')
+        .values('id', 'date', 'note', 'created_at', movie_tmdb_id=F('movie__tmdb_id'), emotion_name=F('emotion__name'))
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def _parse_date(value):
+    if not isinstance(value, str):
+        raise ImportRowError('date 가 필요합니다. (YYYY-MM-DD)')
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f'date 형식이 올바르지 않습니다: {value}')
+
+
+def import_diary_entries(user, rows, batch_size=IMPORT_BATCH_SIZE):
+    """다이어리 가져오기
+
+    bulk_create 는 저장 시그널을 보내지 않으므로 영화 감정 투표는 배치마다 (영화, 감정) 별로 한 번에 더하고,
+    감정 프로필과 하루 요약은 가져오기가 끝난 뒤 한 번 다시 계산한다.
+    """
+    emotion_ids = dict(Emotion.objects.values_list('name', 'id'))
+
+    def build(row, movie_ids):
+        emotion_id = None
+        emotion = row.get('emotion_name')
+        if emotion is not None and emotion != '':
+            if emotion not in emotion_ids:
+                raise ImportRowError(f'감정 "{emotion}" 이 없습니다.')
+            emotion_id = emotion_ids[emotion]
+        note = row.get('note') or ''
+        if not isinstance(note, str):
+            raise ImportRowError('note 는 문자열이어야 합니다.')
+        return DiaryEntry(
+            user=user,
+            date=_parse_date(row.get('date')),
+            movie_id=resolve_movie_id(row, movie_ids),
+            emotion_id=emotion_id,
+            note=note,
+        )
+
+    def save(entries):
+        DiaryEntry.objects.bulk_create(entries)
+        votes = Counter(
+            (entry.movie_id, entry.emotion_id) for entry in entries
+            if entry.movie_id is not None and entry.emotion_id is not None
+        )
+        for (movie_id, emotion_id), count in votes.items():
+            record_vote(movie_id, emotion_id, count)
+
+    result = import_rows(rows, movie_ids_by_tmdb_id, build, save, batch_size)
+    if result['created']:
+        rebuild_profile(user.id)
+        rebuild_summaries([user.id])
+    return result
+
+
+DIARY_TRANSFER = Transfer('diary', '다이어리', DIARY_EXPORT_FIELDS, diary_export_rows, import_diary_entries)
@@ -4,5 +4,10 @@ from . import views
 urlpatterns = [
     path('', views.diary_list, name='diary-list'),
     path('monthly/<int:year>/<int:month>/', views.monthly_diary, name='diary-monthly'),
+    path('stats/<int:year>/', views.diary_stats, name='diary-stats-year'),
+    path('stats/<int:year>/<int:month>/', views.diary_stats, name='diary-stats-month'),
     path('<int:entry_id>/', views.diary_detail, name='diary-detail'),
+    path('export/', views.diary_export, name='diary-export'),
+    path('import/', views.diary_import, name='diary-import'),
+    path('recommendations/', views.diary_recommendations, name='diary-recommendations'),
 ]
@@ -3,11 +3,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import F, Q
 import datetime
 from .models import DiaryEntry
 from .serializers import DiaryEntrySerializer
+from .recommendations import MAX_RECOMMENDATIONS, recommend_for_user
+from .summary import period_stats
+from .transfer import DIARY_TRANSFER
 from accounts.models import User
+from emotions.models import Emotion
+from movies.models import Movie
+from movies.serializers import MovieListSerializer, get_liked_movie_ids
+from clou.transfer import export_response, import_response
 
 # 사용자의 모든 다이어리 항목 조회 및 생성
 @api_view(['GET', 'POST'])
@@ -20,17 +27,20 @@ def diary_list(request):
         
     if request.method == 'GET':
         entries = DiaryEntry.objects.filter(user=user)
-        serializer = DiaryEntrySerializer(entries, many=True)
+        serializer = DiaryEntrySerializer(entries, many=True, context={'request': request})
         return Response(serializer.data)
 
     elif request.method == 'POST':
-        serializer = DiaryEntrySerializer(data=request.data)
+        serializer = DiaryEntrySerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save(user=user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-# 월별 다이어리 항목 조회
+# 캘린더 모드에서 내려주는 컬럼 (중첩 직렬화 없이 값만)
+CALENDAR_FIELDS = ('id', 'date', 'emotion_id')
+
+# 월별 다이어리 항목 조회 (?view=calendar 이면 달력 칸을 그리는 데 필요한 값만)
 @api_view(['GET'])
 # @permission_classes([IsAuthenticated])
 def monthly_diary(request, year, month):
@@ -56,19 +66,59 @@ def monthly_diary(request, year, month):
         else:
             end_date = datetime.date(year, month + 1, 1) - datetime.timedelta(days=1)
         
-        # 해당 월에 속하는 다이어리 항목 조회
+        # 해당 월에 속하는 다이어리 항목 조회 ((user, date) 인덱스 범위 조회)
         entries = DiaryEntry.objects.filter(
             user=user,
             date__gte=start_date,
             date__lte=end_date
-        ).order_by('date')
-        
-        serializer = DiaryEntrySerializer(entries, many=True)
+        ).order_by('date', 'created_at')
+
+        if request.query_params.get('view') == 'calendar':
+            # 영화 포스터만 JOIN 해서 평평한 값 목록으로 (쿼리 1번)
+            rows = entries.values(*CALENDAR_FIELDS, poster_path=F('movie__poster_path'))
+            return Response(list(rows))
+
+        entries = entries.select_related('user', 'movie', 'emotion')
+        context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(user)}
+        serializer = DiaryEntrySerializer(entries, many=True, context=context)
         return Response(serializer.data)
         
     except ValueError:
         return Response({"error": "유효하지 않은 년월 형식입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
+# 연도별/월별 다이어리 통계 (일별 기록 수, 감정 분포, 최장 연속 기록, 많이 본 장르)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def diary_stats(request, year, month=None):
+    user = request.user
+    if not (1900 <= year <= 2100) or (month is not None and not 1 <= month <= 12):
+        return Response({"error": "유효하지 않은 년월입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if month is None:
+        start_date, end_date = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    else:
+        start_date = datetime.date(year, month, 1)
+        end_date = (start_date + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+
+    stats = period_stats(user, start_date, end_date)
+    emotions = Emotion.objects.in_bulk(list(stats['emotions']))
+    data = {
+        'year': year,
+        'month': month,
+        'total': stats['total'],
+        'days': stats['days'],
+        'emotions': [
+            {'emotion_id': emotion_id, 'name': emotions[emotion_id].name, 'count': count}
+            for emotion_id, count in sorted(stats['emotions'].items(), key=lambda item: (-item[1], item[0]))
+            if emotion_id in emotions
+        ],
+        'longest_streak': stats['longest_streak'],
+        'top_genres': stats['top_genres'],
+    }
+    if month is None:
+        data['months'] = [{'month': m, 'count': stats['months'].get(m, 0)} for m in range(1, 13)]
+    return Response(data)
+
 # 특정 다이어리 항목 상세 조회, 수정, 삭제
 @api_view(['GET', 'PUT', 'DELETE'])
 # @permission_classes([IsAuthenticated])
@@ -81,11 +131,11 @@ def diary_detail(request, entry_id):
     entry = get_object_or_404(DiaryEntry, pk=entry_id, user=user)
 
     if request.method == 'GET':
-        serializer = DiaryEntrySerializer(entry)
+        serializer = DiaryEntrySerializer(entry, context={'request': request})
         return Response(serializer.data)
 
     elif request.method == 'PUT':
-        serializer = DiaryEntrySerializer(entry, data=request.data, partial=True)
+        serializer = DiaryEntrySerializer(entry, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -93,4 +143,47 @@ def diary_detail(request, entry_id):
 
     elif request.method == 'DELETE':
         entry.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+# 다이어리 감정 기록 기반 영화 추천 (?limit=20)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def diary_recommendations(request):
+    # 프로필과 추천 캐시가 사용자마다 만들어지므로 로그인한 사용자만
+    user = request.user
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), MAX_RECOMMENDATIONS)
+    except ValueError:
+        limit = 20
+    profile, scored = recommend_for_user(user, limit=limit)
+
+    # 프로필은 비율로 보여줌 (합계 1)
+    total = sum(profile.weights.values()) or 1.0
+    emotions = Emotion.objects.in_bulk([int(emotion_id) for emotion_id in profile.weights])
+    emotion_profile = sorted(
+        (
+            {'emotion': emotions[int(emotion_id)].name, 'weight': round(weight / total, 4)}
+            for emotion_id, weight in profile.weights.items() if int(emotion_id) in emotions
+        ),
+        key=lambda item: -item['weight'],
+    )
+
+    movies = Movie.objects.in_bulk([movie_id for movie_id, _ in scored])
+    scored = [(movies[movie_id], score) for movie_id, score in scored if movie_id in movies]
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(user)}
+    results = MovieListSerializer([movie for movie, _ in scored], many=True, context=context).data
+    for item, (_, score) in zip(results, scored):
+        item['score'] = round(score, 4)
+    return Response({'profile': emotion_profile, 'results': results})
+
+# 다이어리 전체 내보내기 (?output=ndjson|csv) - 기록 수와 관계없이 나눠 읽으며 바로 응답으로 흘려보냄
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def diary_export(request):
+    return export_response(request, DIARY_TRANSFER)
+
+# 다이어리 대량 가져오기 - 본문은 NDJSON (Content-Type: text/csv 면 CSV), 배치마다 검증 후 bulk_create
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def diary_import(request):
+    return import_response(request, DIARY_TRANSFER)
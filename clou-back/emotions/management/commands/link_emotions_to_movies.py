@@ -1,58 +1,69 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from movies.models import Movie
 from emotions.models import Emotion, MovieEmotion
+from emotions.vectors import bump_emotion_scores_version
 import random
 
 class Command(BaseCommand):
     help = '영화와 감정을 연결하는 스크립트'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=None, help='난수 시드 (같은 시드면 같은 연결이 생성됨)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 저장할 연결 수')
+
     def handle(self, *args, **options):
         # 기존 연결 데이터 확인
         existing_count = MovieEmotion.objects.count()
         self.stdout.write(f'기존 영화-감정 연결 수: {existing_count}')
-        
-        # 모든 영화와 감정 가져오기
-        movies = Movie.objects.all()
-        emotions = Emotion.objects.all()
-        
-        if not movies.exists():
+
+        # 모든 영화와 감정 id 가져오기
+        movie_ids = list(Movie.objects.order_by('id').values_list('id', flat=True))
+        emotion_ids = list(Emotion.objects.order_by('id').values_list('id', flat=True))
+
+        if not movie_ids:
             self.stdout.write(self.style.ERROR('영화 데이터가 없습니다. 먼저 영화 데이터를 추가해주세요.'))
             return
-            
-        if not emotions.exists():
+
+        if not emotion_ids:
             self.stdout.write(self.style.ERROR('감정 데이터가 없습니다. 먼저 감정 데이터를 추가해주세요.'))
             return
-            
-        # 생성된 연결 수 카운트
-        created_count = 0
-        
+
+        # 이미 있는 (영화, 감정) 연결을 한 번에 읽어서 집합으로 확인
+        existing_pairs = set(MovieEmotion.objects.values_list('movie_id', 'emotion_id'))
+        analyzed_movie_ids = {movie_id for movie_id, _ in existing_pairs}
+
+        rng = random.Random(options['seed'])
+        new_links = []
+
         # 각 영화마다 2-4개의 감정을 랜덤으로 연결
-        for i, movie in enumerate(movies):
+        for movie_id in movie_ids:
             # 이미 분석된 영화는 건너뛰기
-            if MovieEmotion.objects.filter(movie=movie).exists():
-                self.stdout.write(f"[{i+1}/{len(movies)}] '{movie.title}' - 이미 분석됨")
+            if movie_id in analyzed_movie_ids:
                 continue
-                
+
             # 이 영화에 연결할 감정 수 (2-4개)
-            num_emotions = random.randint(2, 4)
-            
+            num_emotions = rng.randint(2, 4)
+
             # 랜덤하게 감정 선택
-            random_emotions = random.sample(list(emotions), min(num_emotions, len(emotions)))
-            
-            for emotion in random_emotions:
-                # 이미 연결이 있는지 확인
-                if not MovieEmotion.objects.filter(movie=movie, emotion=emotion).exists():
-                    # 랜덤 점수 생성 (0.5-1.0)
-                    score = random.uniform(0.5, 1.0)
-                    
-                    # 영화-감정 연결 생성
-                    MovieEmotion.objects.create(
-                        movie=movie,
-                        emotion=emotion,
-                        score=score
-                    )
-                    created_count += 1
-            
-            self.stdout.write(f"[{i+1}/{len(movies)}] '{movie.title}' 분석 완료")
-        
+            for emotion_id in rng.sample(emotion_ids, min(num_emotions, len(emotion_ids))):
+                if (movie_id, emotion_id) in existing_pairs:
+                    continue
+                # 랜덤 점수 생성 (0.5-1.0) - 연결이 없던 영화라 다이어리 투표도 없으므로 blended_score 도 같은 값
+                score = rng.uniform(0.5, 1.0)
+                new_links.append(MovieEmotion(movie_id=movie_id, emotion_id=emotion_id, score=score, blended_score=score))
+
+        skipped = len(analyzed_movie_ids)
+        self.stdout.write(f'이미 분석된 영화 {skipped}개를 건너뛰고 {len(movie_ids) - skipped}개 영화를 연결합니다.')
+
+        batch_size = max(options['batch_size'], 1)
+        for start in range(0, len(new_links), batch_size):
+            with transaction.atomic():
+                # 동시에 실행된 다른 작업이 먼저 만든 연결은 무시
+                MovieEmotion.objects.bulk_create(new_links[start:start + batch_size], ignore_conflicts=True)
+            self.stdout.write(f'{min(start + batch_size, len(new_links))}/{len(new_links)} 연결 저장 완료...')
+
+        created_count = MovieEmotion.objects.count() - existing_count
+        if created_count:
+            bump_emotion_scores_version()
         self.stdout.write(self.style.SUCCESS(f'총 {created_count}개의 영화-감정 연결이 생성되었습니다.'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emotions', '0002_movieemotion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movieemotion',
+            index=models.Index(fields=['emotion', '-score'], name='movieemotion_emotion_score_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.conf import settings
+from django.db.models import Count, F
+
+
+def fill_votes(apps, schema_editor):
+    # emotions.votes.blended_score 와 같은 식 (나중에 앱 코드가 바뀌어도 이 마이그레이션은 그대로 돌도록 옮겨 둠)
+    prior_weight = getattr(settings, 'EMOTION_VOTE_PRIOR_WEIGHT', 3)
+
+    def blended_score(score, votes, total_votes):
+        if prior_weight + total_votes <= 0:
+            return score
+        return (prior_weight * score + votes) / (prior_weight + total_votes)
+
+    DiaryEntry = apps.get_model('diary', 'DiaryEntry')
+    MovieEmotion = apps.get_model('emotions', 'MovieEmotion')
+    MovieEmotionVote = apps.get_model('emotions', 'MovieEmotionVote')
+
+    MovieEmotion.objects.update(blended_score=F('score'))
+
+    counts = (
+        DiaryEntry.objects.filter(movie__isnull=False, emotion__isnull=False)
+        .values('movie_id', 'emotion_id').annotate(count=Count('id'))
+    )
+    votes = {}
+    for row in counts:
+        votes.setdefault(row['movie_id'], {})[row['emotion_id']] = row['count']
+    MovieEmotionVote.objects.bulk_create([
+        MovieEmotionVote(movie_id=movie_id, emotion_id=emotion_id, count=count)
+        for movie_id, emotion_votes in votes.items() for emotion_id, count in emotion_votes.items()
+    ])
+
+    for movie_id, emotion_votes in votes.items():
+        total = sum(emotion_votes.values())
+        links = {link.emotion_id: link for link in MovieEmotion.objects.filter(movie_id=movie_id)}
+        for emotion_id in emotion_votes.keys() - links.keys():
+            links[emotion_id] = MovieEmotion.objects.create(movie_id=movie_id, emotion_id=emotion_id, score=0.0)
+        for link in links.values():
+            link.blended_score = blended_score(link.score, emotion_votes.get(link.emotion_id, 0), total)
+        MovieEmotion.objects.bulk_update(links.values(), ['blended_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_alter_movie_runtime'),
+        ('emotions', '0003_movieemotion_emotion_score_idx'),
+        ('diary', '0002_alter_diaryentry_options_diaryentry_date_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieEmotionVote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='movieemotion',
+            options={'ordering': ['-blended_score']},
+        ),
+        migrations.RemoveIndex(
+            model_name='movieemotion',
+            name='movieemotion_emotion_score_idx',
+        ),
+        migrations.AddField(
+            model_name='movieemotion',
+            name='blended_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='movieemotion',
+            index=models.Index(fields=['emotion', '-blended_score'], name='movieemotion_emotion_blend_idx'),
+        ),
+        migrations.AddField(
+            model_name='movieemotionvote',
+            name='emotion',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movie_votes', to='emotions.emotion'),
+        ),
+        migrations.AddField(
+            model_name='movieemotionvote',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emotion_votes', to='movies.movie'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='movieemotionvote',
+            unique_together={('movie', 'emotion')},
+        ),
+        migrations.RunPython(fill_votes, migrations.RunPython.noop),
+    ]
@@ -14,10 +14,29 @@ class MovieEmotion(models.Model):
     movie = models.ForeignKey('movies.Movie', on_delete=models.CASCADE, related_name='emotion_connections')
     emotion = models.ForeignKey(Emotion, on_delete=models.CASCADE, related_name='movie_connections')
     score = models.FloatField(default=0.0)  # 감정 관련성 점수 (0.0 ~ 1.0)
+    # 태깅 점수와 다이어리 투표(MovieEmotionVote)를 섞은 점수 - 감정 API 는 이 점수로 정렬
+    blended_score = models.FloatField(default=0.0)
     
     class Meta:
         unique_together = ('movie', 'emotion')
-        ordering = ['-score']  # 점수 높은 순으로 정렬
+        ordering = ['-blended_score']  # 점수 높은 순으로 정렬
+        indexes = [
+            # 감정별 영화 top-N 조회 (emotion = ? ORDER BY blended_score DESC)
+            models.Index(fields=['emotion', '-blended_score'], name='movieemotion_emotion_blend_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.movie.title} - {self.emotion.name} ({self.score:.2f})"
\ No newline at end of file
+        return f"{self.movie.title} - {self.emotion.name} ({self.score:.2f})"
+
+
+class MovieEmotionVote(models.Model):
+    """다이어리에서 이 영화를 보고 이 감정을 골랐다고 기록한 수 (다이어리 저장/수정/삭제 때 ±1)"""
+    movie = models.ForeignKey('movies.Movie', on_delete=models.CASCADE, related_name='emotion_votes')
+    emotion = models.ForeignKey(Emotion, on_delete=models.CASCADE, related_name='movie_votes')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('movie', 'emotion')
+
+    def __str__(self):
+        return f"{self.movie.title} - {self.emotion.name} ({self.count}표)"
@@ -0,0 +1,7 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class EmotionMoviePagination(PageNumberPagination):
+    """감정별 영화 목록 페이지네이션 (점수 높은 순 top-N 조회)"""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,21 +1,15 @@
 from rest_framework import serializers
 from movies.models import Movie
+from movies.serializers import LikedMovieMixin
 from .models import Emotion, MovieEmotion
 
 ### 영화 리스트(간략한 정보만)
-class EmotionMovieSerializer(serializers.ModelSerializer):
+class EmotionMovieSerializer(LikedMovieMixin, serializers.ModelSerializer):
     is_liked = serializers.SerializerMethodField()
     
     class Meta:
         model = Movie
         fields = ['id', 'tmdb_id', 'title', 'poster_path', 'vote_average', 'overview', 'is_liked']
-    
-    def get_is_liked(self, obj):
-        # 요청에서 사용자가 있을 경우만 좋아요 확인
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.liked_users.filter(id=request.user.id).exists()
-        return False
 
 ### 감정
 class EmotionSerializer(serializers.ModelSerializer):
@@ -30,7 +24,7 @@ class MovieEmotionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = MovieEmotion
-        fields = ['id', 'movie', 'emotion', 'score']
+        fields = ['id', 'movie', 'emotion', 'score', 'blended_score']
 
 ### 감정과 그에 관련된 영화들
 class EmotionWithMoviesSerializer(serializers.ModelSerializer):
@@ -41,9 +35,12 @@ class EmotionWithMoviesSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'movies']
     
     def get_movies(self, obj):
-        # 해당 감정과 연결된 영화들을 점수 높은 순으로 가져오기
-        movie_emotions = obj.movie_connections.all()
+        # 해당 감정과 연결된 영화들을 점수 높은 순으로 한 번의 JOIN 쿼리로 가져오기
+        movie_emotions = obj.movie_connections.select_related('movie').order_by('-blended_score', 'id')
+        limit = self.context.get('movies_limit')
+        if limit:
+            movie_emotions = movie_emotions[:limit]
         movies = [me.movie for me in movie_emotions]
         # context를 통해 request 전달
         serializer = EmotionMovieSerializer(movies, many=True, context=self.context)
-        return serializer.data
\ No newline at end of file
+        return serializer.data
@@ -0,0 +1,115 @@
+import math
+from collections import Counter
+from django.db import transaction
+from movies.models import Movie
+from .models import Emotion, MovieEmotion
+from .tagging import MOVIE_TEXT_FIELDS, MovieText, movie_fingerprint, score_movies
+from .vectors import bump_emotion_scores_version
+from .votes import blended_score, movie_votes
+
+
+def save_movie_emotions(scored, emotion_ids, only_changed=True, batch_size=500, fingerprints=None):
+    """{movie_id: [(감정 이름, 점수), ...]}를 한 트랜잭션으로 저장
+
+    only_changed=False 이면 해당 영화들의 연결을 모두 지우고 다시 만들고,
+    True 이면 기존 연결과 비교해서 바뀐 것만 추가/수정/삭제한다.
+    fingerprints({movie_id: 해시})를 주면 같은 트랜잭션에서 Movie.emotion_fingerprint도 갱신.
+    다이어리 투표(MovieEmotionVote)가 있는 감정은 태깅에서 빠져도 점수 0 으로 남기고 blended_score 에 섞는다.
+    반환값: (생성/수정/삭제 건수 Counter, DB에 없는 감정 이름 집합)
+    """
+    desired = {}
+    missing_emotions = set()
+    for movie_id, emotions in scored.items():
+        for emotion_name, score in emotions:
+            emotion_id = emotion_ids.get(emotion_name)
+            if emotion_id is None:
+                missing_emotions.add(emotion_name)
+                continue
+            desired[(movie_id, emotion_id)] = score
+
+    stats = Counter()
+    with transaction.atomic():
+        votes = movie_votes(scored.keys())
+        blended = {}
+        for movie_id, emotion_votes in votes.items():
+            for emotion_id in emotion_votes:
+                desired.setdefault((movie_id, emotion_id), 0.0)
+        for (movie_id, emotion_id), score in desired.items():
+            emotion_votes = votes.get(movie_id, {})
+            blended[(movie_id, emotion_id)] = blended_score(
+                score, emotion_votes.get(emotion_id, 0), sum(emotion_votes.values()),
+            )
+
+        existing_links = MovieEmotion.objects.filter(movie_id__in=scored.keys())
+
+        if not only_changed:
+            # 기존 감정 연결을 한 번에 제거하고 다시 생성
+            stats['deleted'], _ = existing_links.delete()
+            MovieEmotion.objects.bulk_create(
+                [
+                    MovieEmotion(movie_id=m, emotion_id=e, score=s, blended_score=blended[(m, e)])
+                    for (m, e), s in desired.items()
+                ],
+                batch_size=batch_size,
+            )
+            stats['created'] = len(desired)
+        else:
+            existing = {
+                (movie_id, emotion_id): (pk, score, blended_value)
+                for pk, movie_id, emotion_id, score, blended_value
+                in existing_links.values_list('id', 'movie_id', 'emotion_id', 'score', 'blended_score')
+            }
+            to_create = [
+                MovieEmotion(movie_id=m, emotion_id=e, score=desired[(m, e)], blended_score=blended[(m, e)])
+                for (m, e) in desired.keys() - existing.keys()
+            ]
+            to_update = [
+                MovieEmotion(id=pk, score=desired[key], blended_score=blended[key])
+                for key, (pk, score, blended_value) in existing.items()
+                if key in desired and not (
+                    math.isclose(score, desired[key]) and math.isclose(blended_value, blended[key])
+                )
+            ]
+            to_delete = [pk for key, (pk, score, blended_value) in existing.items() if key not in desired]
+
+            if to_delete:
+                MovieEmotion.objects.filter(id__in=to_delete).delete()
+            if to_update:
+                MovieEmotion.objects.bulk_update(to_update, ['score', 'blended_score'], batch_size=batch_size)
+            if to_create:
+                MovieEmotion.objects.bulk_create(to_create, batch_size=batch_size)
+            stats.update(created=len(to_create), updated=len(to_update), deleted=len(to_delete))
+
+        if fingerprints:
+            Movie.objects.bulk_update(
+                [Movie(id=movie_id, emotion_fingerprint=fp) for movie_id, fp in fingerprints.items()],
+                ['emotion_fingerprint'],
+                batch_size=batch_size,
+            )
+
+        if stats['created'] or stats['updated'] or stats['deleted']:
+            bump_emotion_scores_version()
+
+    return stats, missing_emotions
+
+
+def retag_movies(movie_ids, force=False):
+    """지정한 영화들 중 지문(fingerprint)이 바뀐 영화만 다시 태깅하고 다시 태깅한 영화 수를 반환"""
+    emotion_ids = dict(Emotion.objects.values_list('name', 'id'))
+    if not emotion_ids:
+        # 감정 데이터가 아직 없으면 지문을 남기지 않아야 나중에 다시 태깅됨
+        return 0
+
+    rows = Movie.objects.filter(id__in=movie_ids).values_list(*MOVIE_TEXT_FIELDS, 'emotion_fingerprint')
+    movies = []
+    fingerprints = {}
+    for *fields, stored_fingerprint in rows:
+        movie = MovieText(*fields)
+        fingerprint = movie_fingerprint(movie)
+        if force or fingerprint != stored_fingerprint:
+            movies.append(movie)
+            fingerprints[movie.id] = fingerprint
+
+    if movies:
+        save_movie_emotions(score_movies(movies), emotion_ids, only_changed=True, fingerprints=fingerprints)
+    return len(movies)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from movies.models import Movie
+from .models import Emotion
+from .services import retag_movies
+from .tagging import MOVIE_TEXT_FIELDS, movie_fingerprint
+from .vectors import bump_emotion_scores_version
+
+# 태깅 결과에 영향을 주는 필드
+TAGGED_FIELDS = frozenset(MOVIE_TEXT_FIELDS) - {'id'}
+
+
+# 영화가 추가/수정되면 태깅에 쓰는 내용이 바뀐 경우에만 그 영화 하나를 다시 태깅
+@receiver(post_save, sender=Movie)
+def retag_movie_on_save(sender, instance, created, raw, update_fields, **kwargs):
+    # loaddata 등 raw 저장, 자동 태깅 비활성화 시에는 건너뜀
+    if raw or not settings.EMOTION_AUTO_RETAG:
+        return
+    if update_fields is not None and not TAGGED_FIELDS & set(update_fields):
+        return
+    if movie_fingerprint(instance) == instance.emotion_fingerprint:
+        return
+
+    movie_id = instance.pk
+    transaction.on_commit(lambda: retag_movies([movie_id]))
+
+
+# 감정 종류가 바뀐 경우 (감정 점수는 save_movie_emotions 에서 한 번에 버전을 올림 -
+# MovieEmotion 에 삭제 시그널을 걸면 대량 삭제가 행마다 시그널을 보내는 느린 경로로 바뀜)
+@receiver(post_save, sender=Emotion)
+@receiver(post_delete, sender=Emotion)
+def bump_version_on_emotion_change(sender, **kwargs):
+    bump_emotion_scores_version()
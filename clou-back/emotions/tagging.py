@@ -0,0 +1,300 @@
+import hashlib
+import json
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+# 감정 태깅에 필요한 영화 필드만 담는 가벼운 구조 (ORM 객체 없이도 점수 계산 가능)
+MovieText = namedtuple('MovieText', ['id', 'title', 'genres', 'keywords', 'overview'])
+MOVIE_TEXT_FIELDS = MovieText._fields
+
+# 키워드와 감정을 연결하는 매핑 사전
+KEYWORD_TO_EMOTION = {
+    # 행복 관련 키워드
+    'comedy': '행복', 'funny': '행복', 'humor': '행복', 'laughter': '행복',
+    '코미디': '행복', '코믹': '행복', '유머': '행복', '웃음': '행복', '재밌': '행복',
+    'fun': '행복', 'joyful': '행복', 'happy': '행복', 'happiness': '행복',
+
+    # 슬픔 관련 키워드
+    'sad': '슬픔', 'tragedy': '슬픔', 'grief': '슬픔', 'tear': '슬픔',
+    '슬픔': '슬픔', '슬픈': '슬픔', '눈물': '슬픔', '비극': '슬픔', '상실': '슬픔',
+    'melancholy': '슬픔', 'sorrow': '슬픔', 'depressing': '슬픔',
+
+    # 공포 관련 키워드
+    'horror': '공포', 'scary': '공포', 'terror': '공포', 'ghost': '공포',
+    '공포': '공포', '무서운': '공포', '괴물': '공포', '귀신': '공포', '좀비': '공포',
+    'creature': '공포', 'monster': '공포', 'zombie': '공포', 'nightmare': '공포',
+    'supernatural horror': '공포',
+
+    # 분노 관련 키워드
+    'anger': '분노', 'rage': '분노', 'revenge': '분노', 'vengeance': '분노',
+    '분노': '분노', '복수': '분노', '화': '분노', '격분': '분노', '증오': '분노',
+    'fury': '분노', 'wrath': '분노', 'hate': '분노',
+
+    # 사랑 관련 키워드
+    'love': '사랑', 'romance': '사랑', 'romantic': '사랑', 'relationship': '사랑',
+    '사랑': '사랑', '로맨스': '사랑', '연애': '사랑', '로맨틱': '사랑', '커플': '사랑',
+    'passion': '사랑', 'affection': '사랑', 'kiss': '사랑',
+
+    # 놀라움 관련 키워드
+    'surprise': '놀라움', 'twist': '놀라움', 'unexpected': '놀라움', 'shocking': '놀라움',
+    '놀라움': '놀라움', '반전': '놀라움', '충격': '놀라움', '예상치 못한': '놀라움',
+    'revelation': '놀라움', 'plot twist': '놀라움', 'amazing': '놀라움',
+
+    # 평온 관련 키워드
+    'calm': '평온', 'peaceful': '평온', 'serene': '평온', 'tranquil': '평온',
+    '평온': '평온', '차분': '평온', '평화': '평온', '안정': '평온', '고요': '평온',
+    'harmony': '평온', 'relaxing': '평온',
+
+    # 긴장 관련 키워드
+    'tense': '긴장', 'suspense': '긴장', 'thriller': '긴장', 'anxiety': '긴장',
+    '긴장': '긴장', '스릴러': '긴장', '서스펜스': '긴장', '불안': '긴장',
+    'intense': '긴장', 'tension': '긴장', 'nerve-wracking': '긴장',
+
+    # 감동 관련 키워드
+    'moving': '감동', 'touching': '감동', 'emotional': '감동', 'heartwarming': '감동',
+    '감동': '감동', '울컥': '감동', '감성': '감동', '마음이 따뜻해지는': '감동',
+    'heartfelt': '감동', 'inspirational': '감동', 'poignant': '감동',
+
+    # 희망 관련 키워드
+    'hope': '희망', 'inspiring': '희망', 'uplifting': '희망', 'dream': '희망',
+    '희망': '희망', '꿈': '희망', '도전': '희망', '극복': '희망', '용기': '희망',
+    'optimistic': '희망', 'courage': '희망', 'faith': '희망'
+}
+
+# 장르와 감정을 연결하는 매핑 사전
+GENRE_TO_EMOTION = {
+    '코미디': '행복',
+    '로맨스': '사랑',
+    '로맨틱 코미디': '사랑',
+    '드라마': '감동',
+    '공포': '공포',
+    '호러': '공포',
+    '스릴러': '긴장',
+    '액션': '긴장',
+    '모험': '희망',
+    '판타지': '평온',
+    '가족': '행복',
+    '애니메이션': '행복',
+    '멜로': '슬픔',
+    '범죄': '분노',
+    '다큐멘터리': '평온',
+    '음악': '평온',
+    '미스터리': '놀라움',
+    '전쟁': '슬픔',
+    '역사': '감동',
+    '스포츠': '희망',
+    '서부': '평온',
+    '뮤지컬': '행복',
+
+    # 영어 장르
+    'comedy': '행복',
+    'romance': '사랑',
+    'romantic comedy': '사랑',
+    'drama': '감동',
+    'horror': '공포',
+    'thriller': '긴장',
+    'action': '긴장',
+    'adventure': '희망',
+    'fantasy': '평온',
+    'family': '행복',
+    'animation': '행복',
+    'crime': '분노',
+    'documentary': '평온',
+    'music': '평온',
+    'mystery': '놀라움',
+    'war': '슬픔',
+    'history': '감동',
+    'sport': '희망',
+    'western': '평온',
+    'musical': '행복',
+    'sci-fi': '놀라움',
+    'science fiction': '놀라움'
+}
+
+
+# 점수 계산 규칙을 바꿀 때 올리는 버전 (사전 내용이 바뀌면 LEXICON_VERSION은 자동으로 바뀜)
+TAGGER_VERSION = 2
+LEXICON_VERSION = hashlib.sha1(
+    json.dumps([TAGGER_VERSION, KEYWORD_TO_EMOTION, GENRE_TO_EMOTION], sort_keys=True, ensure_ascii=False).encode()
+).hexdigest()[:12]
+
+
+def movie_fingerprint(movie):
+    """태거가 읽는 필드(제목, 장르, 키워드, 줄거리)와 사전 버전의 해시
+
+    저장된 값과 같으면 다시 태깅해도 결과가 같으므로 건너뛸 수 있다.
+    """
+    fields = [LEXICON_VERSION, movie.title, movie.genres, movie.keywords, movie.overview]
+    payload = '\x1f'.join(field or '' for field in fields)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# 한 글자 한글 키워드('화', '꿈')는 뒤에 조사만 붙은 경우에만 인정 ('화면', '꿈틀' 같은 오탐 방지)
+KOREAN_PARTICLES = frozenset([
+    '이', '가', '을', '를', '은', '는', '의', '에', '도', '만', '와', '과', '로', '으로',
+    '에서', '에게', '까지', '부터', '처럼', '보다', '이나', '나', '이다', '이라', '라',
+])
+
+
+def _is_hangul(ch):
+    return '\uac00' <= ch <= '\ud7a3' or '\u3131' <= ch <= '\u318e'
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class KeywordMatcher:
+    """여러 키워드를 한 번에 찾는 Aho-Corasick 자동자
+
+    사전 크기와 관계없이 텍스트 길이에 비례하는 시간으로 모든 키워드를 찾는다.
+    매칭 규칙:
+      - 키워드는 단어 시작 위치에서만 인정
+      - 영어 키워드는 단어 끝까지 일치해야 함 ('fun'은 'funeral'에 매칭되지 않음)
+      - 한글 키워드는 뒤에 조사/어미가 붙어도 인정 ('복수를' -> '복수')
+      - 겹치는 매칭은 가장 긴 키워드 하나만 사용 ('supernatural horror' 안의 'horror'는 제외)
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append(index)
+
+        # BFS로 실패 링크 구성 (출력은 실패 링크를 따라 합쳐 둠)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def _is_valid(self, text, start, end, pattern):
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if end == len(text) or not _is_word_char(text[end]):
+            return True
+        if not _is_hangul(pattern[-1]) or not _is_hangul(text[end]):
+            return False
+        if len(pattern) >= 2:
+            return True
+        # 한 글자 한글 키워드: 남은 부분이 조사일 때만
+        word_end = end
+        while word_end < len(text) and _is_word_char(text[word_end]):
+            word_end += 1
+        return text[end:word_end] in KOREAN_PARTICLES
+
+    def find(self, text):
+        """text에서 찾은 키워드 목록 (겹치지 않는 가장 긴 매칭만, 등장 순서대로)"""
+        matches = []
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for index in self.outputs[state]:
+                pattern = self.patterns[index]
+                start = position + 1 - len(pattern)
+                if self._is_valid(text, start, position + 1, pattern):
+                    matches.append((start, position + 1, pattern))
+
+        # 시작 위치 순, 같은 위치면 긴 것 우선으로 겹치지 않게 선택
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        last_end = 0
+        for start, end, pattern in matches:
+            if start >= last_end:
+                selected.append(pattern)
+                last_end = end
+        return selected
+
+
+@lru_cache(maxsize=1)
+def get_matcher():
+    """두 매핑 사전의 모든 키워드로 만든 자동자 (프로세스당 한 번만 생성)"""
+    return KeywordMatcher(sorted(set(KEYWORD_TO_EMOTION) | set(GENRE_TO_EMOTION)))
+
+
+def _normalize(text):
+    return unicodedata.normalize('NFC', text or '').lower()
+
+
+def score_movie(movie):
+    """영화의 장르, 키워드, 줄거리를 분석해서 [(감정 이름, 점수), ...] 반환 (점수 높은 순, 최대 5개)
+
+    DB에 접근하지 않는 순수 함수라서 Movie 객체와 MovieText 모두 받을 수 있다.
+    """
+    matcher = get_matcher()
+
+    # 감정 점수 딕셔너리 초기화
+    emotion_scores = {}
+
+    # 키워드, 장르, 줄거리에서 찾은 키워드 점수 계산
+    for text in (movie.keywords, movie.genres, movie.overview):
+        for keyword in matcher.find(_normalize(text)):
+            # 키워드 매칭
+            if keyword in KEYWORD_TO_EMOTION:
+                emotion_name = KEYWORD_TO_EMOTION[keyword]
+                emotion_scores[emotion_name] = emotion_scores.get(emotion_name, 0) + 0.2
+
+            # 장르 매칭
+            if keyword in GENRE_TO_EMOTION:
+                emotion_name = GENRE_TO_EMOTION[keyword]
+                emotion_scores[emotion_name] = emotion_scores.get(emotion_name, 0) + 0.3
+
+    # 영화 제목에 특정 키워드가 있는지 확인
+    for keyword in matcher.find(_normalize(movie.title)):
+        if keyword in KEYWORD_TO_EMOTION:
+            emotion = KEYWORD_TO_EMOTION[keyword]
+            emotion_scores[emotion] = emotion_scores.get(emotion, 0) + 0.4
+
+    # 최소 2개 이상의 감정을 보장하기 위한 처리
+    if len(emotion_scores) < 2:
+        # 기본 감정 할당
+        if '공포' in movie.genres.lower() or 'horror' in movie.genres.lower():
+            emotion_scores['공포'] = emotion_scores.get('공포', 0) + 0.5
+            emotion_scores['긴장'] = emotion_scores.get('긴장', 0) + 0.3
+        elif '코미디' in movie.genres.lower() or 'comedy' in movie.genres.lower():
+            emotion_scores['행복'] = emotion_scores.get('행복', 0) + 0.5
+            emotion_scores['놀라움'] = emotion_scores.get('놀라움', 0) + 0.2
+        elif '로맨스' in movie.genres.lower() or 'romance' in movie.genres.lower():
+            emotion_scores['사랑'] = emotion_scores.get('사랑', 0) + 0.5
+            emotion_scores['감동'] = emotion_scores.get('감동', 0) + 0.2
+        else:
+            # 기본값으로 임의 감정 할당
+            emotion_scores['평온'] = emotion_scores.get('평온', 0) + 0.3
+            emotion_scores['희망'] = emotion_scores.get('희망', 0) + 0.2
+
+    # 점수 정규화 (최대 1.0)
+    for emotion_name in emotion_scores:
+        emotion_scores[emotion_name] = min(emotion_scores[emotion_name], 1.0)
+
+    # 점수가 0.2 이상인 감정만 선택 (최대 5개)
+    top_emotions = sorted(
+        [(e, s) for e, s in emotion_scores.items() if s >= 0.2],
+        key=lambda x: x[1],
+        reverse=True
+    )[:5]
+    return top_emotions
+
+
+def score_movies(movies):
+    """여러 영화를 한 번에 채점 -> {movie_id: [(감정 이름, 점수), ...]} (프로세스 풀 작업 단위)"""
+    return {movie.id: score_movie(movie) for movie in movies}
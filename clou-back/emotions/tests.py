@@ -1,3 +1,229 @@
-from django.test import TestCase
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from accounts.models import User
+from diary.models import DiaryEntry
+from movies.models import Movie
+from .models import Emotion, MovieEmotion, MovieEmotionVote
+from .services import save_movie_emotions
+from .tagging import KeywordMatcher, MovieText, movie_fingerprint, score_movie
 
 # Create your tests here.
+class KeywordMatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = KeywordMatcher(['fun', 'horror', 'supernatural horror', '복수', '화', '마음이 따뜻해지는'])
+
+    def test_english_keywords_need_word_boundaries(self):
+        self.assertEqual(self.matcher.find('a funeral with fun'), ['fun'])
+
+    def test_longest_match_wins(self):
+        self.assertEqual(self.matcher.find('supernatural horror, horror'), ['supernatural horror', 'horror'])
+
+    def test_hangul_keywords_allow_particles(self):
+        self.assertEqual(self.matcher.find('그는 복수를 다짐한다'), ['복수'])
+        self.assertEqual(self.matcher.find('마음이 따뜻해지는 이야기'), ['마음이 따뜻해지는'])
+
+    def test_single_syllable_hangul_keyword_only_with_particle(self):
+        self.assertEqual(self.matcher.find('영화 화면이 바뀌고 화를 낸다'), ['화'])
+
+
+class ScoreMovieTests(SimpleTestCase):
+    def test_scores_are_capped_and_sorted(self):
+        movie = MovieText(1, 'Love Story', '드라마, 로맨스', 'love, romance', '슬픈 사랑 이야기')
+        scores = score_movie(movie)
+
+        self.assertEqual(scores[0], ('사랑', 1.0))
+        self.assertEqual([s for _, s in scores], sorted((s for _, s in scores), reverse=True))
+        self.assertLessEqual(len(scores), 5)
+
+
+class IncrementalRetagTests(TestCase):
+    """태깅 필드가 바뀐 영화만 다시 태깅되는지 확인"""
+
+    fixtures = ['emotions']
+
+    def test_retag_on_save_only_when_fingerprint_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            movie = Movie.objects.create(tmdb_id=1, title='테스트', genres='공포', poster_path='/a.jpg')
+        movie.refresh_from_db()
+        self.assertEqual(movie.emotion_fingerprint, movie_fingerprint(movie))
+        self.assertIn('공포', movie.emotion_connections.values_list('emotion__name', flat=True))
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            movie.vote_average = 8.0
+            movie.save()
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            movie.genres = '로맨스'
+            movie.save()
+        # 다시 태깅한 뒤 감정 행렬 버전을 올리는 콜백도 함께 실행됨
+        retags = [c for c in callbacks if c.__qualname__.startswith('retag_movie_on_save')]
+        self.assertEqual(len(retags), 1)
+        self.assertIn('사랑', movie.emotion_connections.values_list('emotion__name', flat=True))
+
+
+TAGGING_MOVIES = [
+    ('Love Story', '드라마, 로맨스', 'love, romance', '슬픈 사랑 이야기'),
+    ('무서운 밤', '공포, 스릴러', 'ghost', '귀신이 나오는 공포 영화'),
+    ('웃긴 가족', '코미디, 가족', 'family', '온 가족이 웃는 코미디'),
+    ('우주 모험', '모험, SF', 'space', '희망을 찾아 떠나는 여행'),
+    ('이별', '드라마', 'loss', '눈물 나는 이별과 그리움'),
+]
+
+
+class TagMoviesCommandTests(TestCase):
+    """tag_movies 명령 - 배치 크기/워커 수와 상관없이 같은 결과, --only-changed 재실행은 쓰기 없음"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        for tmdb_id, (title, genres, keywords, overview) in enumerate(TAGGING_MOVIES, 1):
+            Movie.objects.create(
+                tmdb_id=tmdb_id, title=title, genres=genres, keywords=keywords, overview=overview, poster_path='/a.jpg',
+            )
+
+    def tag(self, **options):
+        call_command('tag_movies', stdout=StringIO(), **options)
+        return sorted(
+            (tmdb_id, emotion, round(score, 6))
+            for tmdb_id, emotion, score in MovieEmotion.objects.values_list('movie__tmdb_id', 'emotion__name', 'score')
+        )
+
+    def test_small_batches_match_one_batch(self):
+        one_batch = self.tag(batch_size=100)
+        self.assertTrue(one_batch)
+        MovieEmotion.objects.all().delete()
+        self.assertEqual(self.tag(batch_size=2), one_batch)
+
+    def test_process_pool_matches_single_process(self):
+        single = self.tag(batch_size=2, workers=1)
+        MovieEmotion.objects.all().delete()
+        # 작은 배치로 여러 작업이 풀에서 끝나는 순서와 상관없이 같은 결과여야 함
+        self.assertEqual(self.tag(batch_size=2, workers=2), single)
+
+    def test_only_changed_rerun_does_not_write(self):
+        tagged = self.tag(batch_size=2)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.tag(batch_size=2, only_changed=True), tagged)
+        writes = [q['sql'] for q in queries if q['sql'].split(' ', 1)[0] in ('INSERT', 'UPDATE', 'DELETE')]
+        self.assertEqual(writes, [])
+
+
+class LinkEmotionsCommandTests(TestCase):
+    """link_emotions_to_movies 명령 - 같은 시드면 같은 연결, 다시 실행하면 이미 연결된 영화는 건너뜀"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        for tmdb_id in range(1, 8):
+            Movie.objects.create(tmdb_id=tmdb_id, title=f'영화{tmdb_id}', poster_path='/a.jpg')
+
+    def link(self, **options):
+        call_command('link_emotions_to_movies', stdout=StringIO(), **options)
+        return sorted(MovieEmotion.objects.values_list('movie__tmdb_id', 'emotion_id', 'score'))
+
+    def test_same_seed_same_links(self):
+        links = self.link(seed=42, batch_size=3)
+        self.assertEqual({tmdb_id for tmdb_id, _, _ in links}, set(range(1, 8)))
+        MovieEmotion.objects.all().delete()
+        self.assertEqual(self.link(seed=42), links)
+
+    def test_rerun_skips_linked_movies(self):
+        links = self.link(seed=1)
+        Movie.objects.create(tmdb_id=8, title='새 영화', poster_path='/a.jpg')
+
+        rerun = self.link(seed=2)
+        self.assertEqual([link for link in rerun if link[0] != 8], links)
+        self.assertTrue(2 <= len([link for link in rerun if link[0] == 8]) <= 4)
+
+
+class EmotionVectorTests(TestCase):
+    """감정 점수 행렬로 비슷한 영화 / 기분 조합 검색"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        scores = {
+            1: {'슬픔': 0.9, '희망': 0.3},
+            2: {'슬픔': 0.8, '희망': 0.4},
+            3: {'희망': 0.9},
+            4: {'공포': 1.0},
+        }
+        self.emotion_ids = dict(Emotion.objects.values_list('name', 'id'))
+        scored = {}
+        for tmdb_id, emotion_scores in scores.items():
+            movie = Movie.objects.create(tmdb_id=tmdb_id, title=f'영화{tmdb_id}', poster_path='/a.jpg')
+            scored[movie.id] = list(emotion_scores.items())
+        with self.captureOnCommitCallbacks(execute=True):
+            save_movie_emotions(scored, self.emotion_ids)
+
+    def test_similar_emotion_profile(self):
+        response = self.client.get('/api/v1/emotions/movies/1/similar/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [2, 3])
+
+    def test_mood_blend(self):
+        response = self.client.get('/api/v1/emotions/mood/', {'mood': '슬픔:0.3,희망:0.7'})
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [3, 2, 1])
+
+        response = self.client.get('/api/v1/emotions/mood/', {'mood': '없는감정:1'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_matrix_rebuilds_after_score_change(self):
+        movie = Movie.objects.get(tmdb_id=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            save_movie_emotions({movie.id: [('공포', 0.5), ('희망', 1.0)]}, self.emotion_ids)
+        response = self.client.get('/api/v1/emotions/mood/', {'mood': '희망'})
+        self.assertEqual(response.data['results'][0]['tmdb_id'], 3)
+        self.assertEqual(response.data['results'][1]['tmdb_id'], 4)
+
+
+@override_settings(EMOTION_VOTE_PRIOR_WEIGHT=2)
+class EmotionVoteTests(TestCase):
+    """다이어리 감정 기록이 (영화, 감정) 투표로 쌓이고 감정 API 점수에 섞이는지 확인"""
+
+    fixtures = ['emotions']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.emotion_ids = dict(Emotion.objects.values_list('name', 'id'))
+        self.movie = Movie.objects.create(tmdb_id=1, title='영화1', poster_path='/a.jpg')
+        self.other = Movie.objects.create(tmdb_id=2, title='영화2', poster_path='/b.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            save_movie_emotions({self.movie.id: [('공포', 0.5)], self.other.id: [('슬픔', 0.6)]}, self.emotion_ids)
+
+    def blended(self, movie, name):
+        return MovieEmotion.objects.get(movie=movie, emotion_id=self.emotion_ids[name]).blended_score
+
+    def emotion_movies(self, name):
+        response = self.client.get(f'/api/v1/emotions/{name}/movies/')
+        return [movie['tmdb_id'] for movie in response.data['results']]
+
+    def test_votes_blend_with_tagging_score(self):
+        self.assertEqual(self.emotion_movies('슬픔'), [2])
+        entry = DiaryEntry.objects.create(user=self.user, movie=self.movie, emotion_id=self.emotion_ids['슬픔'])
+
+        # (2 x 0.5 + 0) / (2 + 1), (2 x 0 + 1) / (2 + 1)
+        self.assertAlmostEqual(self.blended(self.movie, '공포'), 1 / 3)
+        self.assertAlmostEqual(self.blended(self.movie, '슬픔'), 1 / 3)
+        self.assertEqual(self.emotion_movies('슬픔'), [2, 1])
+
+        entry = DiaryEntry.objects.get(pk=entry.pk)
+        entry.emotion_id = self.emotion_ids['공포']
+        entry.save()
+        self.assertAlmostEqual(self.blended(self.movie, '공포'), 2 / 3)
+        self.assertFalse(MovieEmotion.objects.filter(movie=self.movie, emotion_id=self.emotion_ids['슬픔']).exists())
+
+        entry.delete()
+        self.assertAlmostEqual(self.blended(self.movie, '공포'), 0.5)
+        self.assertEqual(set(MovieEmotionVote.objects.filter(movie=self.movie).values_list('count', flat=True)), {0})
+
+    def test_retagging_keeps_voted_emotions(self):
+        DiaryEntry.objects.create(user=self.user, movie=self.movie, emotion_id=self.emotion_ids['슬픔'])
+        save_movie_emotions({self.movie.id: [('공포', 0.8)]}, self.emotion_ids)
+
+        self.assertAlmostEqual(self.blended(self.movie, '공포'), 1.6 / 3)
+        self.assertAlmostEqual(self.blended(self.movie, '슬픔'), 1 / 3)
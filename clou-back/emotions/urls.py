@@ -13,4 +13,8 @@ urlpatterns = [
     
     # 영화의 감정 리스트
     path('movies/<int:tmdb_id>/', views.movie_emotions, name='movie_emotions'),
+
+    # 감정 벡터 유사도 - 비슷한 감정의 영화 / 감정 조합(기분)에 맞는 영화
+    path('movies/<int:tmdb_id>/similar/', views.movie_emotion_neighbors, name='movie_emotion_neighbors'),
+    path('mood/', views.mood_movie_list, name='mood_movie_list'),
 ]
\ No newline at end of file
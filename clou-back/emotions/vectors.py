@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+from django.db import transaction
+from movies.catalogue import bump_version, get_catalogue_version, get_version
+from .models import Emotion, MovieEmotion
+
+# 영화별 감정 점수(MovieEmotion.blended_score)를 (영화 x 감정) dense 행렬로 메모리에 들고 있다가
+# 행렬 곱 한 번으로 코사인 유사도 top-k 를 구한다.
+# 감정 점수나 영화 카탈로그가 바뀌면 버전이 달라져서 다음 조회 때 다시 만든다.
+
+EMOTION_SCORES_VERSION_KEY = 'emotions:score_version'
+
+
+def get_emotion_scores_version():
+    return get_version(EMOTION_SCORES_VERSION_KEY)
+
+
+def bump_emotion_scores_version():
+    """감정 점수가 바뀐 트랜잭션이 커밋된 뒤에 버전을 올린다"""
+    transaction.on_commit(lambda: bump_version(EMOTION_SCORES_VERSION_KEY))
+
+
+class EmotionMatrix:
+    def __init__(self, version):
+        self.version = version
+        emotions = list(Emotion.objects.order_by('id').values_list('id', 'name'))
+        self.emotion_names = [name for _, name in emotions]
+        self.emotion_index = {name: i for i, name in enumerate(self.emotion_names)}
+        self.emotion_id_index = {emotion_id: i for i, (emotion_id, _) in enumerate(emotions)}
+
+        rows = list(MovieEmotion.objects.values_list('movie_id', 'emotion_id', 'blended_score'))
+        self.movie_ids = np.array(sorted({movie_id for movie_id, _, _ in rows}), dtype=np.int64)
+        self.movie_index = {int(movie_id): i for i, movie_id in enumerate(self.movie_ids)}
+
+        matrix = np.zeros((len(self.movie_ids), len(self.emotion_names)), dtype=np.float32)
+        for movie_id, emotion_id, score in rows:
+            matrix[self.movie_index[movie_id], self.emotion_id_index[emotion_id]] = score
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        # 행을 미리 정규화해 두면 (행렬 @ 정규화된 질의 벡터) 가 곧 코사인 유사도
+        self.normalized = matrix / norms
+
+    def _top_k(self, query, limit, exclude_rows=()):
+        norm = np.linalg.norm(query)
+        if norm == 0 or not len(self.movie_ids):
+            return []
+        scores = self.normalized @ (query / norm)
+        scores[list(exclude_rows)] = -np.inf
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(self.movie_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def similar_to(self, movie_id, limit=20):
+        """감정 분포가 비슷한 영화 [(영화 id, 코사인 유사도)]"""
+        row = self.movie_index.get(movie_id)
+        if row is None:
+            return []
+        return self._top_k(self.normalized[row].copy(), limit, exclude_rows=[row])
+
+    def matching_mood(self, weights, limit=20):
+        """{'슬픔': 0.7, '희망': 0.3} 같은 감정 가중치 벡터와 비슷한 영화"""
+        query = np.zeros(len(self.emotion_names), dtype=np.float32)
+        for name, weight in weights.items():
+            query[self.emotion_index[name]] = weight
+        return self._top_k(query, limit)
+
+    def matching_emotion_ids(self, weights, limit=20, exclude_movie_ids=()):
+        """{감정 id: 가중치} 로 찾기 - 없어진 감정은 무시하고 exclude_movie_ids 는 결과에서 뺀다"""
+        query = np.zeros(len(self.emotion_names), dtype=np.float32)
+        for emotion_id, weight in weights.items():
+            index = self.emotion_id_index.get(emotion_id)
+            if index is not None:
+                query[index] = weight
+        exclude_rows = [self.movie_index[m] for m in exclude_movie_ids if m in self.movie_index]
+        return self._top_k(query, limit, exclude_rows=exclude_rows)
+
+
+_matrix = None
+_lock = threading.Lock()
+
+
+def get_emotion_matrix():
+    global _matrix
+    version = (get_catalogue_version(), get_emotion_scores_version())
+    matrix = _matrix
+    if matrix is not None and matrix.version == version:
+        return matrix
+    with _lock:
+        if _matrix is None or _matrix.version != version:
+            _matrix = EmotionMatrix(version)
+        return _matrix
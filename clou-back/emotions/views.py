@@ -1,10 +1,15 @@
+import math
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import Emotion, MovieEmotion
+from .pagination import EmotionMoviePagination
+from .vectors import get_emotion_matrix
 from movies.models import Movie
+from movies.serializers import get_liked_movie_ids
 from .serializers import (
     EmotionSerializer, 
     EmotionMovieSerializer, 
@@ -12,6 +17,40 @@ from .serializers import (
     EmotionWithMoviesSerializer
 )
 
+# 감정 벡터 유사도 결과 최대 개수
+MAX_SIMILAR_MOVIES = 100
+
+
+def _limit_param(request, default=20):
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1), MAX_SIMILAR_MOVIES)
+    except ValueError:
+        return default
+
+
+def _scored_movies(request, scored):
+    """[(영화 id, 점수)] -> 점수 순서를 유지한 영화 목록 + score"""
+    movies = Movie.objects.in_bulk([movie_id for movie_id, _ in scored])
+    scored = [(movies[movie_id], score) for movie_id, score in scored if movie_id in movies]
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+    results = EmotionMovieSerializer([movie for movie, _ in scored], many=True, context=context).data
+    for item, (_, score) in zip(results, scored):
+        item['score'] = round(score, 4)
+    return results
+
+
+def parse_mood(value):
+    """'슬픔:0.7,희망:0.3' -> {'슬픔': 0.7, '희망': 0.3} (가중치를 생략하면 1)"""
+    weights = {}
+    for part in value.split(','):
+        name, _, weight = part.partition(':')
+        name = name.strip()
+        if name:
+            weights[name] = float(weight) if weight.strip() else 1.0
+            if not math.isfinite(weights[name]):
+                raise ValueError(weight)
+    return weights
+
 # 감정 리스트 -> 버튼용
 @api_view(['GET'])
 def emotion_list(request):
@@ -19,18 +58,26 @@ def emotion_list(request):
     serializer = EmotionSerializer(emotions, many=True)
     return Response(serializer.data)
 
-# 감정별 영화 리스트
+# 감정별 영화 리스트 (?page=2&page_size=20)
 @api_view(['GET'])
 def emotion_movie_list(request, emotion_name):
     try:
         emotion = get_object_or_404(Emotion, name=emotion_name)
         
-        # 해당 감정과 연결된 영화 가져오기
-        movie_emotions = MovieEmotion.objects.filter(emotion=emotion).order_by('-score')
-        movies = [me.movie for me in movie_emotions]
+        # 해당 감정과 연결된 영화를 (emotion, -blended_score) 인덱스 순서로 JOIN 해서 한 번에 가져오기
+        movie_emotions = (
+            MovieEmotion.objects
+            .filter(emotion=emotion)
+            .select_related('movie')
+            .order_by('-blended_score', 'id')
+        )
+        paginator = EmotionMoviePagination()
+        page = paginator.paginate_queryset(movie_emotions, request)
+        movies = [me.movie for me in page]
         
-        serializer = EmotionMovieSerializer(movies, many=True, context={'request': request})
-        return Response(serializer.data)
+        context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+        serializer = EmotionMovieSerializer(movies, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
     except Emotion.DoesNotExist:
         return Response(
             {"error": f"감정 '{emotion_name}'을(를) 찾을 수 없습니다."}, 
@@ -41,13 +88,44 @@ def emotion_movie_list(request, emotion_name):
 @api_view(['GET'])
 def movie_emotions(request, tmdb_id):
     movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
-    movie_emotions = MovieEmotion.objects.filter(movie=movie).order_by('-score')
+    movie_emotions = MovieEmotion.objects.filter(movie=movie).select_related('emotion', 'movie').order_by('-blended_score')
     serializer = MovieEmotionSerializer(movie_emotions, many=True)
     return Response(serializer.data)
 
-# 감정과 연결된 영화 상세 정보 (단일 감정)
+# 감정과 연결된 영화 상세 정보 (단일 감정, ?limit=N 이면 상위 N개 영화만)
 @api_view(['GET'])
 def emotion_detail(request, emotion_id):
     emotion = get_object_or_404(Emotion, id=emotion_id)
-    serializer = EmotionWithMoviesSerializer(emotion, context={'request': request})
-    return Response(serializer.data)
\ No newline at end of file
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+    limit = request.query_params.get('limit')
+    if limit and limit.isdigit():
+        context['movies_limit'] = int(limit)
+    serializer = EmotionWithMoviesSerializer(emotion, context=context)
+    return Response(serializer.data)
+
+# 감정 분포가 비슷한 영화 (?limit=20)
+@api_view(['GET'])
+def movie_emotion_neighbors(request, tmdb_id):
+    movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
+    scored = get_emotion_matrix().similar_to(movie.id, limit=_limit_param(request))
+    return Response({'tmdb_id': tmdb_id, 'results': _scored_movies(request, scored)})
+
+# 여러 감정을 섞은 기분에 맞는 영화 (?mood=슬픔:0.7,희망:0.3&limit=20)
+@api_view(['GET'])
+def mood_movie_list(request):
+    try:
+        weights = parse_mood(request.query_params.get('mood', ''))
+    except ValueError:
+        return Response({'error': '가중치는 숫자로 입력해주세요. (예: 슬픔:0.7,희망:0.3)'}, status=status.HTTP_400_BAD_REQUEST)
+    if not weights:
+        return Response({'error': 'mood 를 입력해주세요. (예: 슬픔:0.7,희망:0.3)'}, status=status.HTTP_400_BAD_REQUEST)
+
+    matrix = get_emotion_matrix()
+    unknown = [name for name in weights if name not in matrix.emotion_index]
+    if unknown:
+        return Response(
+            {'error': f"감정 '{', '.join(unknown)}'을(를) 찾을 수 없습니다."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    scored = matrix.matching_mood(weights, limit=_limit_param(request))
+    return Response({'mood': weights, 'results': _scored_movies(request, scored)})
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from .models import MovieEmotion, MovieEmotionVote
+from .vectors import bump_emotion_scores_version
+
+# 다이어리 감정 기록을 (영화, 감정) 투표 수로 모으고 태깅 점수와 섞는다
+# 다이어리 하나가 바뀌면 해당 (영화, 감정) 의 투표 수만 ±1 하고
+# 그 영화의 감정 연결 몇 개의 blended_score 만 다시 계산한다. (전체 재계산 없음)
+
+
+def blended_score(score, votes, total_votes, prior_weight=None):
+    """태깅 점수를 prior_weight 표 만큼의 사전 투표로 보고 실제 투표와 섞은 점수 (투표가 없으면 태깅 점수 그대로)"""
+    if prior_weight is None:
+        prior_weight = settings.EMOTION_VOTE_PRIOR_WEIGHT
+    if prior_weight + total_votes <= 0:
+        return score
+    return (prior_weight * score + votes) / (prior_weight + total_votes)
+
+
+def movie_votes(movie_ids):
+    """{영화 id: {감정 id: 투표 수}}"""
+    votes = {}
+    rows = MovieEmotionVote.objects.filter(movie_id__in=movie_ids, count__gt=0)
+    for movie_id, emotion_id, count in rows.values_list('movie_id', 'emotion_id', 'count'):
+        votes.setdefault(movie_id, {})[emotion_id] = count
+    return votes
+
+
+def refresh_movie_blends(movie_id):
+    """영화 하나의 감정 연결 점수를 투표 수와 다시 섞는다"""
+    votes = movie_votes([movie_id]).get(movie_id, {})
+    total = sum(votes.values())
+
+    links = list(MovieEmotion.objects.filter(movie_id=movie_id))
+    # 투표만 있고 태깅되지 않은 감정도 태깅 점수 0 으로 연결
+    linked = {link.emotion_id for link in links}
+    new_links = [MovieEmotion(movie_id=movie_id, emotion_id=e, score=0.0) for e in votes.keys() - linked]
+    for link in new_links:
+        link.blended_score = blended_score(0.0, votes[link.emotion_id], total)
+    MovieEmotion.objects.bulk_create(new_links)
+
+    # 태깅 점수도 투표도 없어진 연결은 제거
+    empty = [link.id for link in links if link.score == 0 and not votes.get(link.emotion_id)]
+    if empty:
+        MovieEmotion.objects.filter(id__in=empty).delete()
+
+    changed = []
+    for link in links:
+        if link.id in empty:
+            continue
+        blended = blended_score(link.score, votes.get(link.emotion_id, 0), total)
+        if blended != link.blended_score:
+            link.blended_score = blended
+            changed.append(link)
+    if changed:
+        MovieEmotion.objects.bulk_update(changed, ['blended_score'])
+
+
+def record_vote(movie_id, emotion_id, delta):
+    with transaction.atomic():
+        if delta > 0:
+            # 처음 받는 투표면 0표짜리 행을 먼저 만든다 (동시에 만들어도 충돌 무시)
+            MovieEmotionVote.objects.bulk_create(
+                [MovieEmotionVote(movie_id=movie_id, emotion_id=emotion_id, count=0)], ignore_conflicts=True,
+            )
+            votes = MovieEmotionVote.objects.filter(movie_id=movie_id, emotion_id=emotion_id)
+        else:
+            votes = MovieEmotionVote.objects.filter(movie_id=movie_id, emotion_id=emotion_id, count__gte=-delta)
+        votes.update(count=F('count') + delta)
+        refresh_movie_blends(movie_id)
+        bump_emotion_scores_version()
+
+
+def update_votes(removed=None, added=None):
+    """다이어리 하나가 바뀐 만큼 투표 수를 옮긴다 - removed/added 는 (영화 id, 감정 id) 또는 None"""
+    if removed == added:
+        return
+    with transaction.atomic():
+        if removed is not None:
+            record_vote(*removed, -1)
+        if added is not None:
+            record_vote(*added, 1)
@@ -1,7 +1,14 @@
 from django.contrib import admin
-from .models import Movie
+from .models import Movie, Genre, Keyword, Person
 
 # Register your models here.
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
-    filter_horizontal = ('emotions',)
\ No newline at end of file
+    filter_horizontal = ('emotions',)
+    # 장르/키워드 관계는 문자열 필드에서 자동으로 만들어지므로 폼에서는 숨김
+    exclude = ('genre_tags', 'keyword_tags')
+
+
+@admin.register(Genre, Keyword, Person)
+class NameAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
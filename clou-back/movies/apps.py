@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    # SQLite 에서 movies_movie 테이블이 다시 만들어지면 검색 트리거가 사라지므로 매 migrate 후 확인
+    # (0009 이전으로 되돌린 경우에는 다시 만들지 않음)
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from .search import install_search_index
+    connection = connections[using]
+    if ('movies', '0009_movie_search_index') in MigrationRecorder(connection).applied_migrations():
+        install_search_index(connection)
 
 
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,114 @@
+import heapq
+import threading
+from bisect import bisect_left
+
+from .catalogue import get_catalogue_version
+from .models import Movie
+
+# 영화 제목 자동완성용 프로세스 메모리 접두사 인덱스
+# (키, 영화 번호) 를 정렬된 배열로 들고 있다가 bisect 로 접두사 범위를 찾는다.
+# 제목 전체, 제목 안의 각 단어 시작 위치, 그리고 각각의 초성 분해('파이널' -> 'ㅍㅇㄴ')를 키로 넣는다.
+
+# 한글 음절(가~힣)의 초성 19개 (호환용 자모)
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSUNG_JONGSUNG_COUNT = 21 * 28
+
+MAX_SUGGESTIONS = 20
+# 접두사 범위 끝을 찾기 위한 가장 큰 문자
+PREFIX_END = '￿'
+
+
+def normalize(text):
+    """소문자로 바꾸고 공백을 없앤다 ('파이널데' 로도 '파이널 데스티네이션' 을 찾도록)"""
+    return ''.join(text.lower().split())
+
+
+def to_chosung(text):
+    """한글 음절은 초성으로, 나머지 문자는 그대로"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSUNG[(code - HANGUL_BASE) // JUNGSUNG_JONGSUNG_COUNT])
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def has_chosung(text):
+    return any(char in CHOSUNG for char in text)
+
+
+def _title_keys(title):
+    """제목 전체와 두 번째 이후 단어부터 시작하는 꼬리들 ('데스티네이션' 으로도 찾을 수 있게)"""
+    words = title.lower().split()
+    return {''.join(words[start:]) for start in range(len(words))}
+
+
+class AutocompleteIndex:
+    def __init__(self, movies, version):
+        self.version = version
+        # 순위: 평점 높은 순 -> 찜 많은 순 (낮은 rank 가 먼저)
+        ordered = sorted(movies, key=lambda m: (-(m['vote_average'] or 0), -m['like_count'], m['id']))
+        self.movies = [
+            {
+                'tmdb_id': m['tmdb_id'],
+                'title': m['title'],
+                'poster_path': m['poster_path'],
+                'vote_average': m['vote_average'],
+            }
+            for m in ordered
+        ]
+
+        title_entries = set()
+        chosung_entries = set()
+        for rank, movie in enumerate(ordered):
+            for key in _title_keys(movie['title']):
+                title_entries.add((key, rank))
+                chosung_entries.add((to_chosung(key), rank))
+        self._title_keys, self._title_ranks = self._split(sorted(title_entries))
+        self._chosung_keys, self._chosung_ranks = self._split(sorted(chosung_entries))
+
+    @staticmethod
+    def _split(entries):
+        return [key for key, _ in entries], [rank for _, rank in entries]
+
+    def _ranks_with_prefix(self, keys, ranks, prefix):
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + PREFIX_END, start)
+        return ranks[start:end]
+
+    def suggest(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if has_chosung(prefix):
+            # 'ㅍㅇㄴ' 또는 '파ㅇㄴ' 처럼 초성이 섞이면 초성 키에서 찾는다
+            found = self._ranks_with_prefix(self._chosung_keys, self._chosung_ranks, to_chosung(prefix))
+        else:
+            found = self._ranks_with_prefix(self._title_keys, self._title_ranks, prefix)
+        return [self.movies[rank] for rank in heapq.nsmallest(limit, set(found))]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """카탈로그 버전이 바뀌었을 때만 인덱스를 다시 만든다"""
+    global _index
+    version = get_catalogue_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        if _index is None or _index.version != version:
+            movies = Movie.objects.values('id', 'tmdb_id', 'title', 'poster_path', 'vote_average', 'like_count')
+            _index = AutocompleteIndex(list(movies), version)
+        return _index
+
+
+def suggest_titles(query, limit=10):
+    return get_index().suggest(query, limit=min(limit, MAX_SUGGESTIONS))
@@ -0,0 +1,171 @@
+from datetime import MAXYEAR, MINYEAR, date
+
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+from rest_framework.exceptions import ValidationError
+from emotions.models import MovieEmotion
+from .models import Movie
+
+# 영화 탐색(browse) 필터와 패싯(facet) 집계
+# 각 패싯의 개수는 "자기 자신을 뺀 나머지 필터"를 적용한 결과에서 GROUP BY 한 번으로 센다.
+# (장르를 고르고 있어도 다른 장르를 골랐을 때 몇 편인지 보여주기 위함)
+
+# 상영 시간 구간 (분) - (이름, 최소, 최대)
+RUNTIME_BUCKETS = [
+    ('~90', None, 90),
+    ('90~120', 90, 120),
+    ('120~150', 120, 150),
+    ('150~', 150, None),
+]
+# 평점 기준선 (이상)
+VOTE_THRESHOLDS = [9, 8, 7, 6, 5]
+
+LIST_FILTERS = ('genre', 'original_language', 'emotion')
+
+
+def _split(value):
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def _number(params, name, cast=float):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValidationError({name: '숫자를 입력해주세요.'})
+
+
+def _year(params, name):
+    # date() 가 받을 수 있는 범위 밖이면 조건을 만들 때 ValueError 가 나므로 여기서 400 으로 돌려보냄
+    value = _number(params, name, int)
+    if value is not None and not MINYEAR <= value <= MAXYEAR:
+        raise ValidationError({name: f'{MINYEAR} ~ {MAXYEAR} 사이의 연도를 입력해주세요.'})
+    return value
+
+
+def parse_browse_filters(params):
+    """쿼리 파라미터 -> 필터 dict (값이 없는 필터는 빠짐)
+
+    genre/original_language/emotion 은 쉼표로 여러 개를 주면 그 중 하나라도 해당하는 영화
+    """
+    filters = {}
+    for name in LIST_FILTERS:
+        values = _split(params.get(name, ''))
+        if values:
+            filters[name] = values
+
+    year_min = _year(params, 'year_min')
+    year_max = _year(params, 'year_max')
+    if year_min is not None or year_max is not None:
+        filters['year'] = (year_min, year_max)
+
+    runtime_min = _number(params, 'runtime_min')
+    runtime_max = _number(params, 'runtime_max')
+    if runtime_min is not None or runtime_max is not None:
+        filters['runtime'] = (runtime_min, runtime_max)
+
+    vote_min = _number(params, 'vote_min')
+    if vote_min is not None:
+        filters['vote_average'] = vote_min
+    return filters
+
+
+def _condition(name, value):
+    if name == 'genre':
+        # 여러 장르를 골라도 영화가 중복되지 않도록 연결 테이블 서브쿼리로 거름
+        through = Movie.genre_tags.through
+        return Q(id__in=through.objects.filter(genre__name__in=value).values('movie_id'))
+    if name == 'emotion':
+        return Q(id__in=MovieEmotion.objects.filter(emotion__name__in=value).values('movie_id'))
+    if name == 'original_language':
+        return Q(original_language__in=value)
+    if name == 'year':
+        # 연도 함수 대신 날짜 범위로 비교해야 release_date 인덱스를 탄다
+        year_min, year_max = value
+        condition = Q()
+        if year_min is not None:
+            condition &= Q(release_date__gte=date(year_min, 1, 1))
+        if year_max is not None:
+            condition &= Q(release_date__lte=date(year_max, 12, 31))
+        return condition
+    if name == 'runtime':
+        runtime_min, runtime_max = value
+        condition = Q()
+        if runtime_min is not None:
+            condition &= Q(runtime__gte=runtime_min)
+        if runtime_max is not None:
+            condition &= Q(runtime__lte=runtime_max)
+        return condition
+    if name == 'vote_average':
+        return Q(vote_average__gte=value)
+    raise KeyError(name)
+
+
+def _runtime_bucket(low, high):
+    condition = Q(runtime__isnull=False)
+    if low is not None:
+        condition &= Q(runtime__gte=low)
+    if high is not None:
+        condition &= Q(runtime__lt=high)
+    return condition
+
+
+def filter_movies(filters, exclude=None, queryset=None):
+    movies = Movie.objects.all() if queryset is None else queryset
+    for name, value in filters.items():
+        if name != exclude:
+            movies = movies.filter(_condition(name, value))
+    return movies
+
+
+def _counts(rows, key):
+    return [{'value': row[key], 'count': row['count']} for row in rows]
+
+
+def browse_facets(filters):
+    """패싯 6개를 패싯마다 집계 쿼리 한 번씩으로 계산"""
+    facets = {}
+
+    movie_ids = filter_movies(filters, exclude='genre').values('id')
+    rows = (
+        Movie.genre_tags.through.objects.filter(movie_id__in=movie_ids)
+        .values('genre__name').annotate(count=Count('id')).order_by('-count', 'genre__name')
+    )
+    facets['genre'] = _counts(rows, 'genre__name')
+
+    rows = (
+        filter_movies(filters, exclude='original_language').exclude(original_language='')
+        .values('original_language').annotate(count=Count('id')).order_by('-count', 'original_language')
+    )
+    facets['original_language'] = _counts(rows, 'original_language')
+
+    rows = (
+        filter_movies(filters, exclude='year').filter(release_date__isnull=False)
+        .annotate(year=ExtractYear('release_date')).values('year').annotate(count=Count('id')).order_by('-year')
+    )
+    facets['year'] = _counts(rows, 'year')
+
+    movie_ids = filter_movies(filters, exclude='emotion').values('id')
+    rows = (
+        MovieEmotion.objects.filter(movie_id__in=movie_ids)
+        .values('emotion__name').annotate(count=Count('id')).order_by('-count', 'emotion__name')
+    )
+    facets['emotion'] = _counts(rows, 'emotion__name')
+
+    # 구간/기준선 패싯은 조건부 COUNT 여러 개를 한 번의 aggregate 로 계산
+    counts = filter_movies(filters, exclude='runtime').aggregate(**{
+        label: Count('id', filter=_runtime_bucket(low, high)) for label, low, high in RUNTIME_BUCKETS
+    })
+    facets['runtime'] = [
+        {'value': label, 'min': low, 'max': high, 'count': counts[label]} for label, low, high in RUNTIME_BUCKETS
+    ]
+
+    counts = filter_movies(filters, exclude='vote_average').aggregate(**{
+        f'vote_{threshold}': Count('id', filter=Q(vote_average__gte=threshold)) for threshold in VOTE_THRESHOLDS
+    })
+    facets['vote_average'] = [
+        {'value': threshold, 'count': counts[f'vote_{threshold}']} for threshold in VOTE_THRESHOLDS
+    ]
+    return facets
@@ -0,0 +1,37 @@
+import uuid
+
+from .models import CatalogueVersion
+
+# 영화 카탈로그 버전
+# 영화가 추가/수정/삭제될 때마다 바뀌고, 프로세스 메모리에 만들어 둔 인덱스들은
+# 자기가 만들어질 때의 버전과 비교해서 달라졌을 때만 다시 만든다.
+# 워커마다 따로 있는 로컬 캐시에 두면 다른 워커의 변경을 못 보므로 DB 행(CatalogueVersion)에 저장한다.
+# 값은 증가하는 숫자가 아니라 매번 새 토큰이라, 트랜잭션 롤백으로 행이 되돌아가도 예전 버전과 겹치지 않는다.
+
+CATALOGUE_VERSION_KEY = 'movies:catalogue_version'
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+def get_version(key):
+    token = CatalogueVersion.objects.filter(key=key).values_list('token', flat=True).first()
+    if token is None:
+        token = CatalogueVersion.objects.get_or_create(key=key, defaults={'token': _new_token()})[0].token
+    return token
+
+
+def bump_version(key):
+    token = _new_token()
+    if not CatalogueVersion.objects.filter(key=key).update(token=token):
+        CatalogueVersion.objects.update_or_create(key=key, defaults={'token': token})
+    return token
+
+
+def get_catalogue_version():
+    return get_version(CATALOGUE_VERSION_KEY)
+
+
+def bump_catalogue_version():
+    return bump_version(CATALOGUE_VERSION_KEY)
@@ -0,0 +1,77 @@
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# 찜/좋아요 M2M 중간 테이블을 직접 다루는 헬퍼
+# 조건부 INSERT/DELETE 한 번으로 처리하기 때문에 더블 클릭이나 재시도가 겹쳐도
+# 최종 상태와 like_count가 어긋나지 않는다.
+
+
+def _through(relation):
+    """(중간 테이블 모델, 대상 FK 이름, 사용자 FK 이름)"""
+    field = relation.field
+    return relation.through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+
+def add_like(relation, obj_id, user_id):
+    """좋아요를 추가하고, 실제로 새로 추가된 경우에만 True (이미 있으면 아무것도 하지 않음)"""
+    through, source, target = _through(relation)
+    qn = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s) ON CONFLICT DO NOTHING'.format(
+        qn(through._meta.db_table),
+        qn(through._meta.get_field(source).column),
+        qn(through._meta.get_field(target).column),
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [obj_id, user_id])
+            added = cursor.rowcount == 1
+        if added:
+            relation.field.model.objects.filter(pk=obj_id).update(like_count=F('like_count') + 1)
+    return added
+
+
+def remove_like(relation, obj_id, user_id):
+    """좋아요를 제거하고, 실제로 지워진 경우에만 True"""
+    through, source, target = _through(relation)
+    with transaction.atomic():
+        deleted, _ = through.objects.filter(**{f'{source}_id': obj_id, f'{target}_id': user_id}).delete()
+        if deleted:
+            relation.field.model.objects.filter(pk=obj_id).update(like_count=F('like_count') - 1)
+    return bool(deleted)
+
+
+def toggle_like(relation, obj_id, user_id):
+    """없으면 추가, 있으면 제거 - 변경 후 좋아요 상태를 반환"""
+    with transaction.atomic():
+        if add_like(relation, obj_id, user_id):
+            return True
+        remove_like(relation, obj_id, user_id)
+        return False
+
+
+def set_likes(relation, user_id, like_ids=(), unlike_ids=()):
+    """여러 대상의 좋아요 상태를 한 번에 맞춤 (오프라인 동기화용)
+
+    INSERT ... 충돌 무시 한 번, DELETE 한 번 후에 영향받은 행의 like_count만 다시 센다.
+    """
+    through, source, target = _through(relation)
+    model = relation.field.model
+    like_ids = set(like_ids)
+    unlike_ids = set(unlike_ids) - like_ids
+
+    with transaction.atomic():
+        if like_ids:
+            through.objects.bulk_create(
+                [through(**{f'{source}_id': obj_id, f'{target}_id': user_id}) for obj_id in like_ids],
+                ignore_conflicts=True,
+            )
+        if unlike_ids:
+            through.objects.filter(**{f'{source}_id__in': unlike_ids, f'{target}_id': user_id}).delete()
+
+        affected = like_ids | unlike_ids
+        counts = (
+            through.objects.filter(**{f'{source}_id': OuterRef('pk')})
+            .order_by().values(f'{source}_id').annotate(c=Count('pk')).values('c')
+        )
+        model.objects.filter(pk__in=affected).update(like_count=Coalesce(Subquery(counts), Value(0)))
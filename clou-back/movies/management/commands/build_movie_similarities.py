@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+from movies.recommender import DEFAULT_BLOCK_SIZE, DEFAULT_TOP_K, build_movie_similarities
+
+class Command(BaseCommand):
+    help = '찜 데이터로 영화 간 코사인 유사도를 계산해서 MovieSimilarity 테이블을 다시 만듭니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help='영화마다 저장할 이웃 수')
+        parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help='한 번에 유사도를 계산할 영화 수')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = build_movie_similarities(
+            top_k=max(options['top_k'], 1),
+            block_size=max(options['block_size'], 1),
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'총 {count}개의 영화 유사도를 저장했습니다. ({elapsed:.1f}초)'))
@@ -0,0 +1,6 @@
+from clou.transfer import ExportCommand
+from movies.transfer import REVIEW_TRANSFER
+
+class Command(ExportCommand):
+    help = '사용자의 리뷰 전체를 NDJSON/CSV 로 내보냅니다 (리뷰를 나눠 읽으며 바로 씀)'
+    transfer = REVIEW_TRANSFER
@@ -0,0 +1,6 @@
+from clou.transfer import ImportCommand
+from movies.transfer import REVIEW_TRANSFER
+
+class Command(ImportCommand):
+    help = 'NDJSON/CSV 파일의 리뷰를 사용자에게 가져옵니다 (배치마다 검증 후 bulk_create)'
+    transfer = REVIEW_TRANSFER
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from movies.search import rebuild_search_index
+
+class Command(BaseCommand):
+    help = '영화 전문 검색 인덱스를 다시 만듭니다'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{connection.vendor} 검색 인덱스를 다시 만듭니다...')
+        rebuild_search_index(connection)
+        self.stdout.write(self.style.SUCCESS('검색 인덱스 재구축을 완료했습니다.'))
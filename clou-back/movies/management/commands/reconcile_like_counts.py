@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+from movies.models import Movie, Review
+
+class Command(BaseCommand):
+    help = '영화 찜 수와 리뷰 좋아요 수(like_count)를 실제 M2M 데이터와 맞춥니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 어긋난 개수만 출력합니다')
+
+    def handle(self, *args, **options):
+        for model, relation in ((Movie, 'liked_users'), (Review, 'likes')):
+            # like_count가 실제 연결 수와 다른 행만 골라서 수정
+            mismatched = list(
+                model.objects
+                .annotate(actual_count=Count(relation))
+                .exclude(like_count=F('actual_count'))
+                .only('id', 'like_count')
+            )
+            label = model._meta.verbose_name
+            if not mismatched:
+                self.stdout.write(f'{label}: 어긋난 like_count 없음')
+                continue
+
+            self.stdout.write(self.style.WARNING(f'{label}: {len(mismatched)}개 행의 like_count가 어긋남'))
+            if options['dry_run']:
+                continue
+
+            for obj in mismatched:
+                obj.like_count = obj.actual_count
+            with transaction.atomic():
+                model.objects.bulk_update(mismatched, ['like_count'], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS('like_count 보정을 완료했습니다.'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from movies.models import Movie
+from movies.relations import RELATION_SOURCE_FIELDS, sync_movie_relations
+
+class Command(BaseCommand):
+    help = '영화의 장르/키워드/감독/출연 문자열로 Genre, Keyword, Person, Credit 관계를 다시 만듭니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 처리할 영화 수')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        movies = Movie.objects.only('id', *RELATION_SOURCE_FIELDS).order_by('id')
+
+        processed = 0
+        last_id = 0
+        while True:
+            chunk = list(movies.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            sync_movie_relations(chunk)
+            processed += len(chunk)
+            last_id = chunk[-1].id
+            self.stdout.write(f'{processed}개 영화 처리 완료...')
+
+        self.stdout.write(self.style.SUCCESS(f'총 {processed}개 영화의 관계를 다시 만들었습니다.'))
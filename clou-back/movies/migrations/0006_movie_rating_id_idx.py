@@ -0,0 +1,17 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_alter_movie_runtime'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-vote_average', '-id'], name='movie_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_like_counts(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    Review = apps.get_model('movies', 'Review')
+
+    for model, relation, fk in ((Movie, 'liked_users', 'movie_id'), (Review, 'likes', 'review_id')):
+        through = getattr(model, relation).through
+        counts = (
+            through.objects.filter(**{fk: OuterRef('pk')})
+            .order_by().values(fk).annotate(c=Count('pk')).values('c')
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_movie_rating_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_like_counts, migrations.RunPython.noop),
+    ]
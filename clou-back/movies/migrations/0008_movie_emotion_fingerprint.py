@@ -0,0 +1,18 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_like_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='emotion_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
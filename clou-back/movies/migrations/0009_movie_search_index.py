@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# 검색 인덱스 DDL 을 이 마이그레이션 시점 그대로 옮겨 둔 것 (movies.search 가 바뀌어도 이 마이그레이션은 그대로)
+# 이후 DDL 이 바뀌면 movies.search.install_search_index 가 post_migrate 에서 맞춰 준다.
+
+SEARCH_FIELDS = ('title', 'tagline', 'overview', 'director', 'cast', 'keywords')
+COLUMNS = ', '.join(f'"{field}"' for field in SEARCH_FIELDS)
+NEW_COLUMNS = ', '.join(f'new."{field}"' for field in SEARCH_FIELDS)
+OLD_COLUMNS = ', '.join(f'old."{field}"' for field in SEARCH_FIELDS)
+PG_DOCUMENT = " || ' ' || ".join(f'coalesce("{field}", \'\')' for field in SEARCH_FIELDS)
+
+SQLITE_INSTALL = [
+    f'''CREATE VIRTUAL TABLE IF NOT EXISTS movies_movie_fts USING fts5(
+        {COLUMNS}, content='movies_movie', content_rowid='id', tokenize='trigram'
+    )''',
+    f'''CREATE TRIGGER IF NOT EXISTS movies_movie_fts_ai AFTER INSERT ON movies_movie BEGIN
+        INSERT INTO movies_movie_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_COLUMNS});
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS movies_movie_fts_ad AFTER DELETE ON movies_movie BEGIN
+        INSERT INTO movies_movie_fts(movies_movie_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_COLUMNS});
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS movies_movie_fts_au AFTER UPDATE OF {COLUMNS} ON movies_movie BEGIN
+        INSERT INTO movies_movie_fts(movies_movie_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_COLUMNS});
+        INSERT INTO movies_movie_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_COLUMNS});
+    END''',
+    "INSERT INTO movies_movie_fts(movies_movie_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS movies_movie_fts_ai',
+    'DROP TRIGGER IF EXISTS movies_movie_fts_ad',
+    'DROP TRIGGER IF EXISTS movies_movie_fts_au',
+    'DROP TABLE IF EXISTS movies_movie_fts',
+]
+PG_INSTALL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'CREATE INDEX IF NOT EXISTS movies_movie_search_trgm ON movies_movie USING GIN (({PG_DOCUMENT}) gin_trgm_ops)',
+]
+PG_UNINSTALL = ['DROP INDEX IF EXISTS movies_movie_search_trgm']
+
+
+def _run(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements.get(vendor, []):
+            cursor.execute(statement)
+
+
+def install(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_INSTALL, 'postgresql': PG_INSTALL})
+
+
+def uninstall(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_UNINSTALL, 'postgresql': PG_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_movie_emotion_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
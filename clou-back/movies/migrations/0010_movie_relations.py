@@ -0,0 +1,144 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# 아래 분리/저장 코드는 movies.relations 를 이 마이그레이션 시점 그대로 옮겨 둔 것
+# (앱 코드가 바뀌어도 이 마이그레이션이 하는 일은 달라지지 않도록)
+FILL_BATCH_SIZE = 500
+
+
+def split_names(text, max_length=100):
+    names = []
+    for name in (text or '').split(','):
+        name = name.strip()[:max_length]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def name_ids(model, names):
+    if not names:
+        return {}
+    model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+    return dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def fill_relations(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    Genre = apps.get_model('movies', 'Genre')
+    Keyword = apps.get_model('movies', 'Keyword')
+    Person = apps.get_model('movies', 'Person')
+    Credit = apps.get_model('movies', 'Credit')
+    MovieGenre = Movie.genre_tags.through
+    MovieKeyword = Movie.keyword_tags.through
+
+    # 전체를 한 번에 올리지 않고 id 순으로 FILL_BATCH_SIZE 편씩 (keyset)
+    last_id = 0
+    while True:
+        rows = list(
+            Movie.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'genres', 'keywords', 'director', 'cast')[:FILL_BATCH_SIZE]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        parsed = {
+            movie_id: {
+                'genres': split_names(genres, 50),
+                'keywords': split_names(keywords),
+                'director': split_names(director),
+                'cast': split_names(cast),
+            }
+            for movie_id, genres, keywords, director, cast in rows
+        }
+        genre_ids = name_ids(Genre, {name for names in parsed.values() for name in names['genres']})
+        keyword_ids = name_ids(Keyword, {name for names in parsed.values() for name in names['keywords']})
+        person_ids = name_ids(
+            Person, {name for names in parsed.values() for name in names['director'] + names['cast']}
+        )
+
+        MovieGenre.objects.bulk_create([
+            MovieGenre(movie_id=movie_id, genre_id=genre_ids[name])
+            for movie_id, names in parsed.items() for name in names['genres']
+        ])
+        MovieKeyword.objects.bulk_create([
+            MovieKeyword(movie_id=movie_id, keyword_id=keyword_ids[name])
+            for movie_id, names in parsed.items() for name in names['keywords']
+        ])
+        Credit.objects.bulk_create([
+            Credit(movie_id=movie_id, person_id=person_ids[name], role=role, order=order)
+            for movie_id, names in parsed.items()
+            for role in ('director', 'cast')
+            for order, name in enumerate(names[role])
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_movie_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Credit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('director', '감독'), ('cast', '출연')], max_length=10)),
+                ('order', models.PositiveSmallIntegerField(default=0)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='movies.movie')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='movies.person')),
+            ],
+            options={
+                'ordering': ['movie', 'role', 'order'],
+            },
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='genre_tags',
+            field=models.ManyToManyField(blank=True, related_name='movies', to='movies.genre'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='keyword_tags',
+            field=models.ManyToManyField(blank=True, related_name='movies', to='movies.keyword'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='people',
+            field=models.ManyToManyField(blank=True, related_name='movies', through='movies.Credit', to='movies.person'),
+        ),
+        migrations.AddIndex(
+            model_name='credit',
+            index=models.Index(fields=['person', 'role'], name='credit_person_role_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='credit',
+            constraint=models.UniqueConstraint(fields=('movie', 'person', 'role'), name='unique_movie_person_role'),
+        ),
+        migrations.RunPython(fill_relations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0010_movie_relations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['original_language', '-vote_average', '-id'], name='movie_lang_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['release_date', 'vote_average'], name='movie_release_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['runtime', 'vote_average'], name='movie_runtime_rating_idx'),
+        ),
+    ]
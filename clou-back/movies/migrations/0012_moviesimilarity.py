@@ -0,0 +1,30 @@
+# Generated by Django 4.2.21 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0011_browse_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='movies.movie')),
+                ('similar_movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['movie', '-score'], name='similarity_movie_score_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='moviesimilarity',
+            constraint=models.UniqueConstraint(fields=('movie', 'similar_movie'), name='unique_movie_similarity'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from .relations import RELATION_SOURCE_FIELDS
 
 # Create your models here.
 class Movie(models.Model):
@@ -20,12 +21,108 @@ class Movie(models.Model):
     release_date = models.DateField(null=True, blank=True)
 
     liked_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='liked_movies', blank=True)
+    # liked_users 수 (찜 토글 시 F()로 증감, reconcile_like_counts 명령으로 보정)
+    like_count = models.PositiveIntegerField(default=0)
     source_type = models.CharField(max_length=50, blank=True)
     emotions = models.ManyToManyField('emotions.Emotion', related_name='movies', blank=True)
+    # 감정 태깅에 쓰인 필드 + 사전 버전의 해시 (emotions.tagging.movie_fingerprint)
+    emotion_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
+    # genres/keywords/director/cast 문자열을 정규화한 관계 (문자열 필드는 조회용 캐시로 유지)
+    # 문자열이 바뀐 저장에서만 movies.relations.sync_movie_relations 로 다시 만든다
+    genre_tags = models.ManyToManyField('Genre', related_name='movies', blank=True)
+    keyword_tags = models.ManyToManyField('Keyword', related_name='movies', blank=True)
+    people = models.ManyToManyField('Person', through='Credit', related_name='movies', blank=True)
+
+    class Meta:
+        indexes = [
+            # 영화 목록 keyset 페이지네이션 (평점순)
+            models.Index(fields=['-vote_average', '-id'], name='movie_rating_id_idx'),
+            # 영화 탐색 필터 (언어별 평점순 / 개봉일 범위 / 상영 시간 범위)
+            models.Index(fields=['original_language', '-vote_average', '-id'], name='movie_lang_rating_idx'),
+            models.Index(fields=['release_date', 'vote_average'], name='movie_release_rating_idx'),
+            models.Index(fields=['runtime', 'vote_average'], name='movie_runtime_rating_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장할 때 관계 문자열이 바뀌었는지 알 수 있도록 DB 에서 읽은 값을 기억 (movies.relations.relation_sources_changed)
+        instance._loaded_relation_sources = {
+            name: value for name, value in zip(field_names, values) if name in RELATION_SOURCE_FIELDS
+        }
+        return instance
 
     def __str__(self):
         return self.title # 이거 있으면 디버깅하기 좋다고 하는데 일단 모르겠음
 
+# 장르 / 키워드 / 인물 (이름으로 바로 찾을 수 있도록 unique 인덱스)
+class Genre(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Keyword(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Person(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+# 영화 - 인물 연결 (감독/출연 구분, 출연은 문자열에 나온 순서대로)
+class Credit(models.Model):
+    DIRECTOR = 'director'
+    CAST = 'cast'
+    ROLE_CHOICES = [(DIRECTOR, '감독'), (CAST, '출연')]
+
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='credits')
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='credits')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'person', 'role'], name='unique_movie_person_role'),
+        ]
+        indexes = [
+            # "이 배우가 나온 영화" 조회
+            models.Index(fields=['person', 'role'], name='credit_person_role_idx'),
+        ]
+        ordering = ['movie', 'role', 'order']
+
+
+# 찜 데이터로 계산한 영화 간 유사도 (build_movie_similarities 명령이 영화마다 상위 k개만 저장)
+class MovieSimilarity(models.Model):
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='similarities')
+    similar_movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()  # 코사인 유사도 (0 ~ 1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'similar_movie'], name='unique_movie_similarity'),
+        ]
+        indexes = [
+            # 영화별 이웃을 점수순으로 바로 읽기
+            models.Index(fields=['movie', '-score'], name='similarity_movie_score_idx'),
+        ]
+
+
+# 메모리 인덱스 무효화용 버전 (movies.catalogue)
+# 모든 워커가 같은 값을 보도록 DB 에 두고, 바뀔 때마다 새 토큰으로 교체한다.
+class CatalogueVersion(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    token = models.CharField(max_length=32)
+
+
 # 영화 리뷰
 class Review(models.Model):
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='reviews')
@@ -34,6 +131,7 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     # 좋아요 기능
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='liked_reviews', blank=True)
+    like_count = models.PositiveIntegerField(default=0)
 
 # 영화 리뷰에 대한 답글 (따로 있어야함, 데이터를 따로 관리해야 하기 때문에)
 class ReviewReply(models.Model):
@@ -0,0 +1,86 @@
+import base64
+import json
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class MovieCursorPagination(BasePagination):
+    """(vote_average 내림차순, id 내림차순) 기준 keyset 페이지네이션
+
+    OFFSET 대신 이전 페이지 마지막 영화의 (vote_average, id) 다음부터 읽기 때문에
+    몇 번째 페이지든 같은 비용으로 조회된다. 평점이 없는 영화는 맨 뒤에 온다.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = '유효하지 않은 cursor 입니다.'
+
+    def get_ordering(self):
+        return (F('vote_average').desc(nulls_last=True), '-id')
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+            if requested > 0:
+                page_size = min(requested, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            vote_average, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return (None if vote_average is None else float(vote_average)), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def filter_after(self, queryset, position):
+        vote_average, pk = position
+        if vote_average is None:
+            # 평점 없는 영화 구간 안에서는 id로만 이어감
+            return queryset.filter(vote_average__isnull=True, id__lt=pk)
+        return queryset.filter(
+            Q(vote_average__lt=vote_average)
+            | Q(vote_average=vote_average, id__lt=pk)
+            | Q(vote_average__isnull=True)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.get_ordering())
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = self.filter_after(queryset, position)
+
+        # 한 개 더 읽어서 다음 페이지 존재 여부 확인
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_position = (results[-1].vote_average, results[-1].id) if self.has_next else None
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,89 @@
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.db.models import Sum
+from .models import Movie, MovieSimilarity
+
+# 찜(Movie.liked_users) 기반 item-item 협업 필터링
+# 무거운 계산(사용자 x 영화 희소 행렬, 코사인 유사도)은 build_movie_similarities 명령에서 미리 하고
+# 요청 시에는 MovieSimilarity 테이블의 (movie, -score) 인덱스만 읽는다.
+
+DEFAULT_TOP_K = 20
+# 한 번에 유사도를 계산할 영화 수 (block x 전체 영화 크기의 dense 행렬만 메모리에 올라감)
+DEFAULT_BLOCK_SIZE = 256
+
+
+def load_like_matrix():
+    """(사용자 x 영화 0/1 희소 행렬, 열 번호 -> 영화 id 배열)"""
+    through = Movie.liked_users.through
+    pairs = np.array(list(through.objects.values_list('user_id', 'movie_id')), dtype=np.int64).reshape(-1, 2)
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    movie_ids, movie_index = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (user_index, movie_index)),
+        shape=(len(user_ids), len(movie_ids)),
+    )
+    return matrix, movie_ids
+
+
+def top_k_similarities(matrix, top_k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE, min_score=0.0):
+    """열(영화)끼리 코사인 유사도를 계산해서 영화마다 상위 k개 (열 번호, 이웃 열 번호, 점수) 를 낸다"""
+    items = sparse.csc_matrix(matrix)
+    norms = np.sqrt(np.asarray(items.multiply(items).sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    # 열을 미리 정규화해 두면 X^T X 가 곧 코사인 유사도
+    normalized = items @ sparse.diags(1.0 / norms)
+    normalized_t = normalized.T.tocsr()
+    n_items = items.shape[1]
+    k = min(top_k, n_items - 1)
+    if k <= 0:
+        return
+
+    for start in range(0, n_items, block_size):
+        end = min(start + block_size, n_items)
+        block = (normalized_t[start:end] @ normalized).toarray()
+        # 자기 자신은 제외
+        block[np.arange(end - start), np.arange(start, end)] = 0.0
+
+        neighbours = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(block, neighbours, axis=1)
+        for row in range(end - start):
+            for neighbour, score in zip(neighbours[row], scores[row]):
+                if score > min_score:
+                    yield start + row, int(neighbour), float(score)
+
+
+def build_movie_similarities(top_k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE, batch_size=1000):
+    """MovieSimilarity 테이블을 새로 계산한 값으로 통째로 바꾼다 - 저장한 행 수를 반환"""
+    matrix, movie_ids = load_like_matrix()
+    rows = [
+        MovieSimilarity(movie_id=int(movie_ids[i]), similar_movie_id=int(movie_ids[j]), score=score)
+        for i, j, score in top_k_similarities(matrix, top_k=top_k, block_size=block_size)
+    ]
+    with transaction.atomic():
+        MovieSimilarity.objects.all().delete()
+        MovieSimilarity.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def similar_movies(movie, limit=DEFAULT_TOP_K):
+    """[(영화, 점수)] - 인덱스 한 번 읽기"""
+    similarities = (
+        MovieSimilarity.objects.filter(movie=movie)
+        .select_related('similar_movie').order_by('-score')[:limit]
+    )
+    return [(similarity.similar_movie, similarity.score) for similarity in similarities]
+
+
+def recommended_movies(liked_movie_ids, limit=DEFAULT_TOP_K):
+    """찜한 영화들의 이웃 점수를 합산해서 아직 찜하지 않은 영화를 추천 - [(영화, 점수)]"""
+    liked_movie_ids = list(liked_movie_ids)
+    if not liked_movie_ids:
+        return []
+    ranked = list(
+        MovieSimilarity.objects.filter(movie_id__in=liked_movie_ids)
+        .exclude(similar_movie_id__in=liked_movie_ids)
+        .values('similar_movie_id').annotate(total=Sum('score')).order_by('-total', 'similar_movie_id')[:limit]
+    )
+    movies = Movie.objects.in_bulk([row['similar_movie_id'] for row in ranked])
+    return [(movies[row['similar_movie_id']], row['total']) for row in ranked if row['similar_movie_id'] in movies]
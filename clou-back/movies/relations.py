@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.db import transaction
+
+# Movie 의 쉼표 구분 문자열(genres, keywords, director, cast)을 Genre/Keyword/Person/Credit 관계로 옮기는 헬퍼
+# movies.models 가 이 모듈을 import 하므로 모델은 apps 레지스트리에서 꺼내 쓴다.
+
+RELATION_SOURCE_FIELDS = ('genres', 'keywords', 'director', 'cast')
+
+
+def split_names(text, max_length=100):
+    """'공포, 미스터리' -> ['공포', '미스터리'] (빈 값/중복 제거, 순서 유지)"""
+    names = []
+    for name in (text or '').split(','):
+        name = name.strip()[:max_length]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def relation_sources_changed(movie):
+    """DB 에서 읽은 뒤 genres/keywords/director/cast 중 하나라도 바뀌었는지 (읽은 값을 모르면 바뀐 것으로 봄)"""
+    loaded = getattr(movie, '_loaded_relation_sources', None)
+    if loaded is None:
+        return True
+    deferred = movie.get_deferred_fields()
+    return any(
+        field not in deferred and (field not in loaded or getattr(movie, field) != loaded[field])
+        for field in RELATION_SOURCE_FIELDS
+    )
+
+
+def remember_relation_sources(movie):
+    movie._loaded_relation_sources = {field: getattr(movie, field) for field in RELATION_SOURCE_FIELDS}
+
+
+def _name_ids(model, names):
+    """이름 -> id (없는 이름은 한 번의 bulk INSERT 로 만든다)"""
+    if not names:
+        return {}
+    model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+    return dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def sync_movie_relations(movies):
+    """영화들의 문자열 필드로 장르/키워드/크레딧 관계를 다시 만든다 (영화 수와 관계없이 쿼리 수 일정)"""
+    movies = list(movies)
+    if not movies:
+        return
+    Movie = apps.get_model('movies', 'Movie')
+    Genre = apps.get_model('movies', 'Genre')
+    Keyword = apps.get_model('movies', 'Keyword')
+    Person = apps.get_model('movies', 'Person')
+    Credit = apps.get_model('movies', 'Credit')
+    MovieGenre = Movie.genre_tags.through
+    MovieKeyword = Movie.keyword_tags.through
+
+    parsed = {
+        movie.id: {
+            'genres': split_names(movie.genres, Genre._meta.get_field('name').max_length),
+            'keywords': split_names(movie.keywords),
+            'director': split_names(movie.director),
+            'cast': split_names(movie.cast),
+        }
+        for movie in movies
+    }
+    all_names = {field: set() for field in RELATION_SOURCE_FIELDS}
+    for names in parsed.values():
+        for field in RELATION_SOURCE_FIELDS:
+            all_names[field].update(names[field])
+
+    with transaction.atomic():
+        genre_ids = _name_ids(Genre, all_names['genres'])
+        keyword_ids = _name_ids(Keyword, all_names['keywords'])
+        person_ids = _name_ids(Person, all_names['director'] | all_names['cast'])
+
+        movie_ids = list(parsed)
+        MovieGenre.objects.filter(movie_id__in=movie_ids).delete()
+        MovieKeyword.objects.filter(movie_id__in=movie_ids).delete()
+        Credit.objects.filter(movie_id__in=movie_ids).delete()
+
+        MovieGenre.objects.bulk_create([
+            MovieGenre(movie_id=movie_id, genre_id=genre_ids[name])
+            for movie_id, names in parsed.items() for name in names['genres']
+        ])
+        MovieKeyword.objects.bulk_create([
+            MovieKeyword(movie_id=movie_id, keyword_id=keyword_ids[name])
+            for movie_id, names in parsed.items() for name in names['keywords']
+        ])
+        Credit.objects.bulk_create([
+            Credit(movie_id=movie_id, person_id=person_ids[name], role=role, order=order)
+            for movie_id, names in parsed.items()
+            for role in ('director', 'cast')
+            for order, name in enumerate(names[role])
+        ])
@@ -0,0 +1,183 @@
+from django.db import connection
+from django.db.models import Q
+from .models import Movie
+
+# 영화 전문 검색(full-text search) 인덱스
+#  - SQLite: FTS5 외부 콘텐츠 테이블 + trigram 토크나이저 (형태소 분석 없이 한국어 부분 일치 가능)
+#            movies_movie 에 대한 트리거로 인덱스를 동기화하고 bm25()로 정렬
+#  - PostgreSQL: pg_trgm 확장 + 검색 컬럼을 이어 붙인 식(expression)에 gin_trgm_ops GIN 인덱스
+#                (SQLite 와 같은 trigram 부분 일치 - 인덱스가 자동으로 동기화됨), 일치한 컬럼의 가중치 합으로 정렬
+#  - 그 외 DB: icontains 로 대체
+# 두 DB 모두 검색어를 부분 문자열로 찾으므로 '복수' 로 '복수를', '사랑' 으로 '첫사랑' 이 검색된다.
+# (정렬은 SQLite 는 bm25, PostgreSQL 은 컬럼 가중치 합이라 같은 점수의 순서는 다를 수 있음)
+
+SEARCH_FIELDS = ('title', 'tagline', 'overview', 'director', 'cast', 'keywords')
+# bm25 가중치 (제목 > 감독/출연 > 키워드 > 태그라인 > 줄거리)
+SEARCH_WEIGHTS = {'title': 10.0, 'tagline': 2.0, 'overview': 1.0, 'director': 4.0, 'cast': 4.0, 'keywords': 3.0}
+
+MOVIE_TABLE = 'movies_movie'
+FTS_TABLE = 'movies_movie_fts'
+PG_INDEX = 'movies_movie_search_trgm'
+# 예전 버전(tsvector)의 인덱스 - 설치할 때 지움
+PG_LEGACY_INDEX = 'movies_movie_search_gin'
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH 할 수 없음 ('사랑' 같은 두 글자 단어는 LIKE로 처리)
+TRIGRAM_MIN_LENGTH = 3
+LIKE_ESCAPE = "ESCAPE '\\'"
+
+
+def _columns(prefix=''):
+    return ', '.join(f'{prefix}"{field}"' for field in SEARCH_FIELDS)
+
+
+def _sqlite_install_statements():
+    cols = _columns()
+    new_cols = _columns('new.')
+    old_cols = _columns('old.')
+    return [
+        f'''CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {cols}, content='{MOVIE_TABLE}', content_rowid='id', tokenize='trigram'
+        )''',
+        f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {MOVIE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {MOVIE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END''',
+        # 검색 대상 컬럼이 바뀔 때만 인덱스 갱신 (like_count 증감 등은 무시)
+        f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON {MOVIE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END''',
+    ]
+
+
+def _pg_document():
+    return " || ' ' || ".join(f'coalesce("{field}", \'\')' for field in SEARCH_FIELDS)
+
+
+def install_search_index(conn=connection):
+    """검색 인덱스(와 SQLite 트리거)를 만든다 - 이미 있으면 아무것도 하지 않음
+
+    SQLite 에서 Django 가 movies_movie 테이블을 다시 만드는 마이그레이션을 실행하면
+    트리거가 사라지므로 post_migrate 에서도 호출한다.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+            )
+            created = cursor.fetchone()[0] == 0
+            for statement in _sqlite_install_statements():
+                cursor.execute(statement)
+            if created:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_LEGACY_INDEX}')
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {MOVIE_TABLE} "
+                f"USING GIN (({_pg_document()}) gin_trgm_ops)"
+            )
+
+
+def uninstall_search_index(conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_LEGACY_INDEX}')
+
+
+def rebuild_search_index(conn=connection):
+    """인덱스를 영화 테이블 내용으로 다시 만든다 (트리거가 빠졌던 기간의 변경 복구용)"""
+    install_search_index(conn)
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f'REINDEX INDEX {PG_INDEX}')
+
+
+def _split_terms(query):
+    return [term.replace('"', '') for term in query.lower().split() if term.replace('"', '')]
+
+
+def _like_pattern(term):
+    # LIKE 와일드카드(%, _)를 글자 그대로 찾도록 이스케이프 (SQLite 는 LIKE 에 ESCAPE '\' 를 붙여야 함, PostgreSQL 은 기본값)
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _sqlite_search(terms, limit):
+    long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+
+    params = []
+    where = []
+    if long_terms:
+        # 각 검색어를 구(phrase)로 묶어 AND 검색
+        where.append(f'{FTS_TABLE} MATCH %s')
+        params.append(' AND '.join(f'"{term}"' for term in long_terms))
+    for term in short_terms:
+        like = _like_pattern(term)
+        where.append('(' + ' OR '.join(f'{FTS_TABLE}."{field}" LIKE %s {LIKE_ESCAPE}' for field in SEARCH_FIELDS) + ')')
+        params.extend([like] * len(SEARCH_FIELDS))
+
+    if long_terms:
+        weights = ', '.join(str(SEARCH_WEIGHTS[field]) for field in SEARCH_FIELDS)
+        order_by = f'bm25({FTS_TABLE}, {weights}), m.vote_average DESC'
+    else:
+        order_by = 'm.vote_average DESC'
+
+    sql = (
+        f'SELECT m.id FROM {FTS_TABLE} JOIN {MOVIE_TABLE} m ON m.id = {FTS_TABLE}.rowid '
+        f'WHERE {" AND ".join(where)} ORDER BY {order_by} LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _pg_search(terms, limit):
+    # 인덱스 식과 똑같은 식에 ILIKE 를 걸어야 trigram 인덱스를 탄다 (3글자 미만 검색어는 인덱스 없이 거름)
+    document = _pg_document()
+    patterns = [_like_pattern(term) for term in terms]
+    where = ' AND '.join(f'({document}) ILIKE %s' for _ in patterns)
+    score = ' + '.join(
+        f'CASE WHEN coalesce("{field}", \'\') ILIKE %s THEN {SEARCH_WEIGHTS[field]} ELSE 0 END'
+        for _ in patterns for field in SEARCH_FIELDS
+    )
+    score_params = [pattern for pattern in patterns for _ in SEARCH_FIELDS]
+    sql = (
+        f"SELECT id FROM {MOVIE_TABLE} WHERE {where} "
+        f"ORDER BY ({score}) DESC, vote_average DESC NULLS LAST LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, patterns + score_params + [limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_search(terms, limit):
+    movies = Movie.objects.all()
+    for term in terms:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': term})
+        movies = movies.filter(condition)
+    return list(movies.order_by('-vote_average').values_list('id', flat=True)[:limit])
+
+
+def search_movie_ids(query, limit=20):
+    """검색어와 관련도 높은 순서의 영화 id 목록"""
+    terms = _split_terms(query)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(terms, limit)
+    if connection.vendor == 'postgresql':
+        return _pg_search(terms, limit)
+    return _fallback_search(terms, limit)
@@ -12,7 +12,7 @@ class ReviewReplySerializer(serializers.ModelSerializer):
 class ReviewSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     replies = ReviewReplySerializer(many=True, read_only=True)
-    like_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
     movie_info = serializers.SerializerMethodField()
 
     class Meta:
@@ -20,10 +20,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('user', 'movie', 'likes', 'created_at')
 
-    # 리뷰를 직렬화할 때, 좋아요 수를 계산해서 'like_count' 필드에 넣어 달라는 뜻
-    def get_like_count(self, obj):
-        return obj.likes.count()
-    
     # 영화 정보를 추가합니다 (context에 include_movie가 True일 때만)
     def get_movie_info(self, obj):
         if self.context.get('include_movie', False):
@@ -35,27 +31,59 @@ class ReviewSerializer(serializers.ModelSerializer):
             }
         return None
 
-class MovieListSerializer(serializers.ModelSerializer):
+class LikedMovieMixin:
+    """is_liked 필드를 영화마다 쿼리하지 않고 계산하기 위한 믹스인
+
+    로그인한 사용자가 찜한 영화 id 집합을 한 번만 조회해서 context에 저장하고,
+    리스트의 모든 영화가 그 집합을 재사용한다. 뷰에서 미리 계산한
+    context['liked_movie_ids']가 있으면 그대로 사용한다.
+    """
+
+    def get_liked_movie_ids(self):
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated:
+            return frozenset()
+
+        liked_movie_ids = self.context.get('liked_movie_ids')
+        if liked_movie_ids is None:
+            liked_movie_ids = get_liked_movie_ids(request.user)
+            # 중첩/리스트 시리얼라이저는 루트의 context를 공유하므로 한 번만 조회됨
+            self.context['liked_movie_ids'] = liked_movie_ids
+        return liked_movie_ids
+
+    def get_is_liked(self, obj):
+        return obj.id in self.get_liked_movie_ids()
+
+
+def get_liked_movie_ids(user):
+    """사용자가 찜한 영화 id 집합 (쿼리 1번)"""
+    if not user.is_authenticated:
+        return frozenset()
+    return frozenset(Movie.liked_users.through.objects.filter(user_id=user.id).values_list('movie_id', flat=True))
+
+
+class MovieListSerializer(LikedMovieMixin, serializers.ModelSerializer):
     vote_average = serializers.FloatField()
     is_liked = serializers.SerializerMethodField()
     
     class Meta:
         model = Movie
         fields = ['id', 'tmdb_id', 'title', 'poster_path', 'vote_average', 'is_liked','overview']
-    
-    def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        return user.is_authenticated and obj.liked_users.filter(id=user.id).exists()
 
-class MovieDetailSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        # fields=[...] 로 필요한 필드만 직렬화 (sparse fieldset)
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+class MovieDetailSerializer(LikedMovieMixin, serializers.ModelSerializer):
     reviews = ReviewSerializer(many=True, read_only=True)
     vote_average = serializers.FloatField()
     is_liked = serializers.SerializerMethodField()
     
     class Meta:
         model = Movie
-        fields = '__all__'
-    
-    def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        return user.is_authenticated and obj.liked_users.filter(id=user.id).exists()
\ No newline at end of file
+        exclude = ('emotion_fingerprint', 'genre_tags', 'keyword_tags', 'people')
+        read_only_fields = ('like_count',)
\ No newline at end of file
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .catalogue import bump_catalogue_version
+from .models import Movie
+from .relations import (
+    RELATION_SOURCE_FIELDS,
+    relation_sources_changed,
+    remember_relation_sources,
+    sync_movie_relations,
+)
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def bump_version_on_movie_change(sender, **kwargs):
+    # 찜 수(like_count)는 F() update 로 바뀌므로 여기로 오지 않음 - 자동완성 순위에는 다음 재구축 때 반영
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=Movie)
+def sync_relations_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # loaddata 같은 raw 저장은 sync_movie_relations 명령으로 한 번에 처리
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(RELATION_SOURCE_FIELDS):
+        return
+    # 평점 등 다른 필드만 바뀐 저장은 관계를 지우고 다시 만들지 않음
+    if not relation_sources_changed(instance):
+        return
+    sync_movie_relations([instance])
+    remember_relation_sources(instance)
@@ -1,3 +1,471 @@
+import json
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from .catalogue import CATALOGUE_VERSION_KEY, get_catalogue_version
+from .likes import add_like
+from .models import CatalogueVersion, Movie, MovieSimilarity, Review, ReviewReply, Credit
+from .recommender import build_movie_similarities
 
 # Create your tests here.
+class ReviewQueryCountTests(TestCase):
+    """리뷰/답글/좋아요 수가 늘어나도 쿼리 수가 일정한지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.movie = Movie.objects.create(tmdb_id=1, title='테스트 영화', poster_path='/a.jpg', vote_average=7.0)
+        cls.users = [
+            User.objects.create_user(username=f'user{i}', password='pw', nickname=f'닉네임{i}')
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def add_reviews(self, count):
+        for i in range(count):
+            review = Review.objects.create(movie=self.movie, user=self.users[i % 5], content=f'리뷰 {i}')
+            # like_count 는 직접 쓰지 않고 좋아요 경로(add_like)가 증가시킨 값을 사용
+            for user in self.users[:i % 5]:
+                add_like(Review.likes, review.id, user.id)
+            for j in range(2):
+                ReviewReply.objects.create(review=review, user=self.users[j], content=f'답글 {j}')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_movie_detail_query_count_is_constant(self):
+        url = f'/api/v1/movies/{self.movie.tmdb_id}/?include_osts=false'
+        self.add_reviews(2)
+        baseline, _ = self.count_queries(url)
+
+        self.add_reviews(20)
+        num_queries, response = self.count_queries(url)
+
+        self.assertEqual(num_queries, baseline)
+        self.assertLessEqual(num_queries, 6)
+        self.assertEqual(len(response.data['reviews']), 22)
+
+    def test_review_list_query_count_is_constant(self):
+        url = f'/api/v1/movies/{self.movie.tmdb_id}/reviews/'
+        self.add_reviews(2)
+        baseline, _ = self.count_queries(url)
+
+        self.add_reviews(20)
+        num_queries, response = self.count_queries(url)
+
+        self.assertEqual(num_queries, baseline)
+        self.assertLessEqual(num_queries, 5)
+        self.assertEqual(len(response.data), 22)
+
+    def test_review_list_like_count_and_replies(self):
+        self.add_reviews(5)
+        response = self.client.get(f'/api/v1/movies/{self.movie.tmdb_id}/reviews/')
+
+        like_counts = sorted(review['like_count'] for review in response.data)
+        self.assertEqual(like_counts, [0, 1, 2, 3, 4])
+        actual = sorted(review.likes.count() for review in Review.objects.all())
+        self.assertEqual(like_counts, actual)
+        for review in response.data:
+            self.assertEqual(len(review['replies']), 2)
+            self.assertEqual(review['replies'][0]['user'], '닉네임0')
+
+
+class LikedMovieQueryCountTests(TestCase):
+    """로그인한 사용자의 찜 여부(is_liked)를 영화마다 조회하지 않는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        cls.movies = [
+            Movie.objects.create(tmdb_id=i, title=f'영화 {i}', poster_path='/a.jpg', vote_average=i)
+            for i in range(1, 31)
+        ]
+        cls.user.liked_movies.add(*cls.movies[::2])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_movie_list(self):
+        # 페이지 조회 1번 + 찜한 영화 id 집합 1번
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/movies/', {'page_size': 30})
+        liked = {movie['tmdb_id'] for movie in response.data['results'] if movie['is_liked']}
+        self.assertEqual(liked, {movie.tmdb_id for movie in self.movies[::2]})
+
+    def test_movie_detail(self):
+        # 영화 + 리뷰 prefetch + 찜한 영화 id 집합 + liked_users/emotions M2M 필드 (찜한 영화 수와 무관)
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/v1/movies/{self.movies[0].tmdb_id}/?include_osts=false')
+        self.assertTrue(response.data['is_liked'])
+
+
+class LikeCountTests(TestCase):
+    """찜/좋아요 토글 시 like_count 컬럼이 함께 증감하는지 확인"""
+
+    def setUp(self):
+        self.movie = Movie.objects.create(tmdb_id=1, title='테스트 영화', poster_path='/a.jpg')
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.review = Review.objects.create(movie=self.movie, user=self.user, content='리뷰')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_toggle_movie_like_updates_counter(self):
+        response = self.client.post(f'/api/v1/movies/{self.movie.tmdb_id}/like/')
+        self.assertEqual(response.data, {'liked': True, 'like_count': 1})
+
+        response = self.client.post(f'/api/v1/movies/{self.movie.tmdb_id}/like/')
+        self.assertEqual(response.data, {'liked': False, 'like_count': 0})
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.like_count, 0)
+
+    def test_toggle_review_like_updates_counter(self):
+        response = self.client.post(f'/api/v1/movies/reviews/{self.review.id}/like/')
+        self.assertEqual(response.data, {'liked': True, 'like_count': 1})
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.like_count, 1)
+
+    def test_put_and_delete_movie_like_are_idempotent(self):
+        url = f'/api/v1/movies/{self.movie.tmdb_id}/like/'
+        for _ in range(2):
+            response = self.client.put(url)
+            self.assertEqual(response.data, {'liked': True, 'like_count': 1})
+        for _ in range(2):
+            response = self.client.delete(url)
+            self.assertEqual(response.data, {'liked': False, 'like_count': 0})
+
+    def test_reconcile_like_counts_fixes_drift(self):
+        self.client.put(f'/api/v1/movies/{self.movie.tmdb_id}/like/')
+        self.client.put(f'/api/v1/movies/reviews/{self.review.id}/like/')
+        Movie.objects.filter(pk=self.movie.pk).update(like_count=5)
+        Review.objects.filter(pk=self.review.pk).update(like_count=0)
+
+        call_command('reconcile_like_counts', stdout=StringIO())
+
+        self.movie.refresh_from_db()
+        self.review.refresh_from_db()
+        self.assertEqual((self.movie.like_count, self.review.like_count), (1, 1))
+
+    def test_batch_movie_likes(self):
+        other = Movie.objects.create(tmdb_id=2, title='다른 영화', poster_path='/b.jpg')
+        self.client.put(f'/api/v1/movies/{other.tmdb_id}/like/')
+
+        response = self.client.post(
+            '/api/v1/movies/likes/batch/',
+            {'like': [self.movie.tmdb_id, self.movie.tmdb_id, 999], 'unlike': [other.tmdb_id]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = {r['tmdb_id']: (r['liked'], r['like_count']) for r in response.data['results']}
+        self.assertEqual(results, {self.movie.tmdb_id: (True, 1), other.tmdb_id: (False, 0)})
+        self.assertEqual(response.data['not_found'], [999])
+
+
+class MovieCursorPaginationTests(TestCase):
+    """영화 목록 keyset 페이지네이션 - (평점 내림차순, id 내림차순), 평점 없는 영화는 맨 뒤"""
+
+    @classmethod
+    def setUpTestData(cls):
+        votes = [7.0, None, 9.0, 7.0, None, 8.0, 7.0, None]
+        cls.movies = [
+            Movie.objects.create(tmdb_id=i, title=f'영화 {i}', vote_average=vote)
+            for i, vote in enumerate(votes, start=1)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def walk(self, page_size):
+        pages = []
+        response = self.client.get('/api/v1/movies/', {'page_size': page_size, 'fields': 'tmdb_id'})
+        while True:
+            pages.append([movie['tmdb_id'] for movie in response.data['results']])
+            if response.data['next'] is None:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_order_is_stable_across_pages(self):
+        expected = [3, 6, 7, 4, 1, 8, 5, 2]
+        for page_size in (1, 2, 3, 8, 100):
+            pages = self.walk(page_size)
+            self.assertEqual(sum(pages, []), expected, page_size)
+            self.assertTrue(all(0 < len(page) <= page_size for page in pages))
+
+    def test_cursor_inside_null_vote_block(self):
+        # 평점 없는 영화 구간(8, 5, 2) 안에서 끊겨도 id 로 이어감
+        self.assertEqual(self.walk(6), [[3, 6, 7, 4, 1, 8], [5, 2]])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/movies/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_size_is_capped(self):
+        Movie.objects.bulk_create([Movie(tmdb_id=100 + i, title=f'추가 {i}') for i in range(120)])
+        response = self.client.get('/api/v1/movies/', {'page_size': 1000, 'fields': 'tmdb_id'})
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_liked_filter(self):
+        user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        user.liked_movies.add(self.movies[0], self.movies[4])
+        self.assertEqual(self.client.get('/api/v1/movies/', {'liked': 'true'}).status_code, 401)
+
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/v1/movies/', {'liked': 'true', 'fields': 'tmdb_id,is_liked'})
+        self.assertEqual(response.data['results'], [{'tmdb_id': 1, 'is_liked': True}, {'tmdb_id': 5, 'is_liked': True}])
+
+
+class MovieSearchTests(TestCase):
+    """검색 인덱스가 영화 저장/삭제를 따라가고 관련도 순으로 정렬되는지 확인"""
+
+    def setUp(self):
+        self.final = Movie.objects.create(
+            tmdb_id=1, title='파이널 데스티네이션', poster_path='/a.jpg', overview='죽음의 설계를 피하려는 이야기',
+        )
+        self.other = Movie.objects.create(
+            tmdb_id=2, title='다른 영화', poster_path='/b.jpg', overview='파이널 라운드를 앞둔 권투 선수',
+        )
+        self.client = APIClient()
+
+    def search(self, query):
+        response = self.client.get('/api/v1/movies/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [movie['tmdb_id'] for movie in response.data['results']]
+
+    def test_title_match_ranks_first(self):
+        self.assertEqual(self.search('파이널'), [1, 2])
+
+    def test_short_korean_term(self):
+        self.assertEqual(self.search('죽음'), [1])
+
+    def test_like_wildcards_are_literal(self):
+        self.assertEqual(self.search('%'), [])
+        self.assertEqual(self.search('_'), [])
+        Movie.objects.create(tmdb_id=3, title='100% 사랑', poster_path='/c.jpg')
+        self.assertEqual(self.search('0%'), [3])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.final.title = '데스티네이션'
+        self.final.save()
+        self.assertEqual(self.search('파이널'), [2])
+
+        self.other.delete()
+        self.assertEqual(self.search('파이널'), [])
+
+    def test_missing_query(self):
+        response = self.client.get('/api/v1/movies/search/')
+        self.assertEqual(response.status_code, 400)
+
+
+class MovieAutocompleteTests(TestCase):
+    """제목 접두사/초성 자동완성과 카탈로그 변경 시 인덱스 재구축 확인"""
+
+    def setUp(self):
+        Movie.objects.create(tmdb_id=1, title='파이널 데스티네이션', poster_path='/a.jpg', vote_average=6.5)
+        Movie.objects.create(tmdb_id=2, title='파이널 데스티네이션 5', poster_path='/b.jpg', vote_average=7.0)
+        Movie.objects.create(tmdb_id=3, title='플립', poster_path='/c.jpg', vote_average=8.5)
+        self.client = APIClient()
+
+    def suggest(self, query):
+        response = self.client.get('/api/v1/movies/autocomplete/', {'q': query})
+        return [movie['tmdb_id'] for movie in response.data['results']]
+
+    def test_prefix_ranked_by_vote_average(self):
+        self.assertEqual(self.suggest('파이'), [2, 1])
+        self.assertEqual(self.suggest('데스티'), [2, 1])
+
+    def test_chosung(self):
+        self.assertEqual(self.suggest('ㅍㅇㄴ'), [2, 1])
+        self.assertEqual(self.suggest('ㅍ'), [3, 2, 1])
+        self.assertEqual(self.suggest('파ㅇㄴ ㄷ'), [2, 1])
+
+    def test_rebuilds_after_catalogue_change(self):
+        self.assertEqual(self.suggest('파이썬'), [])
+        Movie.objects.create(tmdb_id=4, title='파이썬', poster_path='/d.jpg')
+        self.assertEqual(self.suggest('파이썬'), [4])
+
+    def test_catalogue_version_is_stored_in_db(self):
+        # 다른 워커도 같은 행을 읽으므로 영화가 바뀐 것을 알 수 있어야 함
+        version = get_catalogue_version()
+        self.assertEqual(CatalogueVersion.objects.get(key=CATALOGUE_VERSION_KEY).token, version)
+        Movie.objects.filter(tmdb_id=1).get().save()
+        self.assertNotEqual(CatalogueVersion.objects.get(key=CATALOGUE_VERSION_KEY).token, version)
+
+
+class MovieRelationTests(TestCase):
+    """쉼표 문자열이 장르/키워드/크레딧 관계로 동기화되고 목록 필터에 쓰이는지 확인"""
+
+    def setUp(self):
+        self.movie = Movie.objects.create(
+            tmdb_id=1, title='테스트 영화', poster_path='/a.jpg',
+            genres='공포, 미스터리', keywords='fate, death', director='감독A', cast='배우A, 감독A',
+        )
+        Movie.objects.create(tmdb_id=2, title='다른 영화', poster_path='/b.jpg', genres='코미디', cast='배우B')
+        self.client = APIClient()
+
+    def list_ids(self, **params):
+        response = self.client.get('/api/v1/movies/', params)
+        return [movie['tmdb_id'] for movie in response.data['results']]
+
+    def test_strings_are_synced_on_save(self):
+        self.assertEqual(sorted(self.movie.genre_tags.values_list('name', flat=True)), ['공포', '미스터리'])
+        credits = list(self.movie.credits.values_list('person__name', 'role', 'order'))
+        self.assertEqual(credits, [('배우A', 'cast', 0), ('감독A', 'cast', 1), ('감독A', 'director', 0)])
+
+        self.movie.genres = '코미디'
+        self.movie.save(update_fields=['genres'])
+        self.assertEqual(list(self.movie.genre_tags.values_list('name', flat=True)), ['코미디'])
+
+    def test_unrelated_save_keeps_relations(self):
+        movie = Movie.objects.get(pk=self.movie.pk)
+        movie.vote_average = 9.0
+        # 영화 UPDATE + 카탈로그 버전 갱신뿐 (관계 DELETE/INSERT 없음)
+        with self.assertNumQueries(2):
+            movie.save()
+
+        movie.cast = '배우C'
+        movie.save()
+        self.assertEqual(list(movie.credits.filter(role=Credit.CAST).values_list('person__name', flat=True)), ['배우C'])
+
+    def test_filter_by_genre_and_person(self):
+        self.assertEqual(self.list_ids(genre='공포'), [1])
+        self.assertEqual(self.list_ids(keyword='fate'), [1])
+        self.assertEqual(self.list_ids(person='감독A'), [1])
+        self.assertEqual(self.list_ids(person='감독A', role=Credit.CAST), [1])
+        self.assertEqual(self.list_ids(person='배우A', role=Credit.DIRECTOR), [])
+
+
+class MovieBrowseTests(TestCase):
+    """탐색 필터 조합과 패싯 개수(자기 필터 제외) 확인"""
+
+    def setUp(self):
+        Movie.objects.create(
+            tmdb_id=1, title='공포 영화', poster_path='/a.jpg', genres='공포', original_language='en',
+            release_date=date(2020, 5, 1), runtime=95, vote_average=7.5,
+        )
+        Movie.objects.create(
+            tmdb_id=2, title='공포 코미디', poster_path='/b.jpg', genres='공포, 코미디', original_language='ko',
+            release_date=date(2015, 1, 1), runtime=130, vote_average=6.0,
+        )
+        Movie.objects.create(
+            tmdb_id=3, title='코미디 영화', poster_path='/c.jpg', genres='코미디', original_language='ko',
+            release_date=date(2021, 1, 1), runtime=80, vote_average=8.2,
+        )
+        self.client = APIClient()
+
+    def browse(self, **params):
+        response = self.client.get('/api/v1/movies/browse/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_combined_filters(self):
+        data = self.browse(genre='공포,코미디', year_min=2016, runtime_max=100)
+        self.assertEqual([movie['tmdb_id'] for movie in data['results']], [3, 1])
+
+        data = self.browse(original_language='ko', vote_min=7)
+        self.assertEqual([movie['tmdb_id'] for movie in data['results']], [3])
+
+    def test_facets_ignore_their_own_filter(self):
+        facets = self.browse(genre='공포')['facets']
+        self.assertEqual(facets['genre'], [{'value': '공포', 'count': 2}, {'value': '코미디', 'count': 2}])
+        self.assertEqual(facets['original_language'], [{'value': 'en', 'count': 1}, {'value': 'ko', 'count': 1}])
+        self.assertEqual(facets['year'], [{'value': 2020, 'count': 1}, {'value': 2015, 'count': 1}])
+        self.assertEqual([bucket['count'] for bucket in facets['runtime']], [0, 1, 1, 0])
+        self.assertEqual(facets['vote_average'][2], {'value': 7, 'count': 1})
+
+    def test_invalid_number(self):
+        response = self.client.get('/api/v1/movies/browse/', {'vote_min': 'high'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_year_out_of_range(self):
+        for params in ({'year_min': 0}, {'year_min': -3}, {'year_max': 10000}):
+            response = self.client.get('/api/v1/movies/browse/', params)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.browse(year_min=1, year_max=9999)['results']), 3)
+
+
+class MovieSimilarityTests(TestCase):
+    """찜 데이터로 계산한 이웃이 유사 영화/추천 API 로 나오는지 확인"""
+
+    def setUp(self):
+        self.movies = [
+            Movie.objects.create(tmdb_id=i, title=f'영화{i}', poster_path='/a.jpg') for i in range(1, 5)
+        ]
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='pw', nickname=f'닉네임{i}') for i in range(3)
+        ]
+        # 영화1, 영화2 는 같은 사람들이 찜함 / 영화3 은 그 중 한 명만 / 영화4 는 아무도 없음
+        likes = {0: [1, 2, 3], 1: [1, 2], 2: [3]}
+        for user_index, tmdb_ids in likes.items():
+            for tmdb_id in tmdb_ids:
+                self.movies[tmdb_id - 1].liked_users.add(self.users[user_index])
+        build_movie_similarities(top_k=2)
+        self.client = APIClient()
+
+    def test_similar(self):
+        response = self.client.get('/api/v1/movies/1/similar/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [2, 3])
+        self.assertAlmostEqual(response.data['results'][0]['score'], 1.0)
+        self.assertEqual(MovieSimilarity.objects.filter(movie__tmdb_id=4).count(), 0)
+
+    def test_recommended_excludes_liked(self):
+        self.client.force_authenticate(self.users[2])
+        response = self.client.get('/api/v1/movies/recommended/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [1, 2])
+
+    def test_recommended_requires_login(self):
+        response = self.client.get('/api/v1/movies/recommended/')
+        self.assertEqual(response.status_code, 401)
+
+
+class ReviewTransferTests(TestCase):
+    """리뷰 내보내기/가져오기 (NDJSON)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pw', nickname='닉네임')
+        self.movie = Movie.objects.create(tmdb_id=7, title='영화', poster_path='/a.jpg')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_roundtrip(self):
+        Review.objects.create(movie=self.movie, user=self.user, content='좋았다', like_count=3)
+        response = self.client.get('/api/v1/movies/user/reviews/export/')
+        exported = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(exported)['movie_tmdb_id'], 7)
+
+        other = User.objects.create_user(username='other', password='pw', nickname='다른')
+        self.client.force_authenticate(other)
+        body = exported + b'\n' + json.dumps({'movie_tmdb_id': 7, 'content': ' '}).encode()
+        response = self.client.post('/api/v1/movies/user/reviews/import/', body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['skipped']), (1, 1))
+        review = Review.objects.get(user=other)
+        self.assertEqual((review.movie_id, review.content, review.like_count), (self.movie.id, '좋았다', 0))
+
+    def test_invalid_rows_are_reported_not_rejected(self):
+        body = json.dumps({'movie_tmdb_id': 999, 'content': '없는 영화'})
+        response = self.client.post('/api/v1/movies/user/reviews/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['skipped']), (0, 1))
+
+    def test_malformed_payload(self):
+        for body in ('', '<html></html>\n{깨진'):
+            response = self.client.post('/api/v1/movies/user/reviews/import/', body, content_type='application/x-ndjson')
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(Review.objects.exists())
+
+    def test_requires_login(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/v1/movies/user/reviews/export/').status_code, 401)
@@ -0,0 +1,60 @@
+from django.db.models import F
+from clou.transfer import EXPORT_CHUNK_SIZE, IMPORT_BATCH_SIZE, ImportRowError, Transfer, import_rows
+from .models import Movie, Review
+
+# 리뷰 내보내기/가져오기 - 행 <-> 모델 변환만 여기서 정의하고 스트리밍/배치 처리는 clou.transfer
+# 영화는 tmdb_id 로 내보내므로 다른 DB 로 옮겨도 그대로 가져올 수 있다.
+
+REVIEW_EXPORT_FIELDS = ('id', 'movie_tmdb_id', 'content', 'like_count', 'created_at')
+
+
+def movie_ids_by_tmdb_id(rows):
+    """배치 행들이 참조하는 {tmdb_id: 영화 id} (쿼리 한 번)"""
+    tmdb_ids = set()
+    for row in rows:
+        try:
+            tmdb_ids.add(int(row.get('movie_tmdb_id')))
+        except (TypeError, ValueError):
+            continue
+    return dict(Movie.objects.filter(tmdb_id__in=tmdb_ids).values_list('tmdb_id', 'id'))
+
+
+def resolve_movie_id(row, movie_ids, required=False):
+    value = row.get('movie_tmdb_id')
+    if value is None or value == '':
+        if required:
+            raise ImportRowError('movie_tmdb_id 가 필요합니다.')
+        return None
+    try:
+        tmdb_id = int(value)
+    except (TypeError, ValueError):
+        raise ImportRowError('movie_tmdb_id 는 정수여야 합니다.')
+    if tmdb_id not in movie_ids:
+        raise ImportRowError(f'tmdb_id {tmdb_id} 영화가 없습니다.')
+    return movie_ids[tmdb_id]
+
+
+def review_export_rows(user):
+    return (
+        Review.objects.filter(user=user)
+        .order_by('id')
+        .values('id', 'content', 'like_count', 'created_at', movie_tmdb_id=F('movie__tmdb_id'))
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def import_reviews(user, rows, batch_size=IMPORT_BATCH_SIZE):
+    """리뷰 가져오기 - 좋아요는 옮기지 않으며 작성 시각은 가져온 시각이 된다"""
+    def build(row, movie_ids):
+        content = row.get('content')
+        if not isinstance(content, str) or not content.strip():
+            raise ImportRowError('content 가 비어 있습니다.')
+        return Review(user=user, movie_id=resolve_movie_id(row, movie_ids, required=True), content=content)
+
+    def save(reviews):
+        Review.objects.bulk_create(reviews)
+
+    return import_rows(rows, movie_ids_by_tmdb_id, build, save, batch_size)
+
+
+REVIEW_TRANSFER = Transfer('reviews', '리뷰', REVIEW_EXPORT_FIELDS, review_export_rows, import_reviews)
@@ -6,16 +6,24 @@ app_name = 'movies'
 urlpatterns = [
     # 영화
     path('', views.movie_list, name='movie_list'),  # GET: 전체 영화 리스트
+    path('browse/', views.movie_browse, name='movie_browse'),  # GET: 조건 필터 + 패싯
+    path('search/', views.movie_search, name='movie_search'),  # GET: 영화 검색 (?q=)
+    path('autocomplete/', views.movie_autocomplete, name='movie_autocomplete'),  # GET: 제목 자동완성 (?q=)
     path('<int:tmdb_id>/', views.movie_detail, name='movie_detail'),  # GET: 영화 상세
-    path('<int:tmdb_id>/like/', views.toggle_movie_like, name='movie_like'),  # POST: 영화 찜 토글
+    path('<int:tmdb_id>/similar/', views.movie_similar, name='movie_similar'),  # GET: 함께 찜한 영화
+    path('recommended/', views.movie_recommended, name='movie_recommended'),  # GET: 찜 기반 추천
+    path('<int:tmdb_id>/like/', views.toggle_movie_like, name='movie_like'),  # POST: 영화 찜 토글, PUT/DELETE: 찜/해제
+    path('likes/batch/', views.batch_movie_likes, name='movie_like_batch'),  # POST: 찜 일괄 동기화
 
     # 리뷰
     path('<int:tmdb_id>/reviews/', views.review_list_create, name='review_list_create'),  # GET, POST
     path('reviews/<int:review_id>/', views.review_detail, name='review_detail'),  # PUT, DELETE
-    path('reviews/<int:review_id>/like/', views.toggle_review_like, name='review_like'),  # POST
+    path('reviews/<int:review_id>/like/', views.toggle_review_like, name='review_like'),  # POST: 토글, PUT/DELETE
     
     # 사용자별 리뷰 조회
     path('user/reviews/', views.user_reviews, name='user_reviews'),  # GET: 현재 사용자의 리뷰
+    path('user/reviews/export/', views.user_reviews_export, name='user_reviews_export'),  # GET: 현재 사용자의 리뷰 내보내기
+    path('user/reviews/import/', views.user_reviews_import, name='user_reviews_import'),  # POST: 리뷰 가져오기
     path('user/<str:username>/reviews/', views.user_reviews, name='user_reviews_by_username'),  # GET: 특정 사용자의 리뷰
 
     # 대댓글
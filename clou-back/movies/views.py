@@ -3,53 +3,249 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from .models import Movie, Review, ReviewReply
-from osts.spotify_utils import search_movie_ost
+from django.db.models import Prefetch
+from .models import Movie, Review, ReviewReply, Credit
+from .likes import add_like, remove_like, set_likes, toggle_like
+from .pagination import MovieCursorPagination
+from .search import search_movie_ids
+from .autocomplete import suggest_titles
+from .browse import browse_facets, filter_movies, parse_browse_filters
+from .recommender import recommended_movies, similar_movies
+from .transfer import REVIEW_TRANSFER
+from clou.transfer import export_response, import_response
+from osts.ost_cache import get_movie_osts
 from .serializers import (
     MovieListSerializer,
     MovieDetailSerializer,
     ReviewSerializer,
-    ReviewReplySerializer
+    ReviewReplySerializer,
+    get_liked_movie_ids,
 )
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+# 검색 결과 최대 개수
+MAX_SEARCH_RESULTS = 100
+
+# 추천 결과 최대 개수
+MAX_RECOMMENDATIONS = 50
+
+# 찜 일괄 동기화 요청 한 번에 처리할 수 있는 최대 영화 수
+MAX_LIKE_BATCH_SIZE = 500
+
+
+def _apply_like(method, relation, obj_id, user_id):
+    """요청 메서드에 따라 좋아요를 추가/제거/토글하고 최종 상태를 반환"""
+    if method == 'PUT':
+        add_like(relation, obj_id, user_id)
+        return True
+    if method == 'DELETE':
+        remove_like(relation, obj_id, user_id)
+        return False
+    return toggle_like(relation, obj_id, user_id)
+
+
+def _limit_param(request, default=20, maximum=MAX_RECOMMENDATIONS):
+    try:
+        return min(max(int(request.query_params.get('limit', default)), 1), maximum)
+    except ValueError:
+        return default
+
+
+def _scored_movies_response(request, scored, **extra):
+    """[(영화, 점수)] -> 영화 목록 + score"""
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+    results = MovieListSerializer([movie for movie, _ in scored], many=True, context=context).data
+    for item, (_, score) in zip(results, scored):
+        item['score'] = round(score, 4)
+    return Response({**extra, 'results': results})
+
+
+def review_queryset():
+    """리뷰 직렬화에 필요한 작성자/답글/좋아요 수를 한 번에 읽어오는 쿼리셋
+
+    작성자는 JOIN, 답글(과 답글 작성자)은 prefetch 한 번으로 가져오고 좋아요 수는
+    Review.like_count 컬럼을 읽기 때문에 리뷰 수와 관계없이 쿼리 수가 일정하다.
+    """
+    replies = ReviewReply.objects.select_related('user').order_by('created_at')
+    return (
+        Review.objects
+        .select_related('user')
+        .prefetch_related(
+            Prefetch('replies', queryset=replies),
+            Prefetch('likes', queryset=User.objects.only('id')),
+        )
+    )
+
+
+def filter_movies_by_relations(movies, params):
+    """?genre=공포&keyword=fate&person=이름&role=cast - 이름 unique 인덱스와 연결 테이블 인덱스로 조회"""
+    if params.get('genre'):
+        movies = movies.filter(genre_tags__name=params['genre'])
+    if params.get('keyword'):
+        movies = movies.filter(keyword_tags__name=params['keyword'])
+    if params.get('person'):
+        credits = Credit.objects.filter(person__name=params['person'])
+        if params.get('role'):
+            credits = credits.filter(role=params['role'])
+        # 감독 겸 출연인 경우에도 영화가 한 번만 나오도록 서브쿼리로 거름
+        movies = movies.filter(id__in=credits.values('movie_id'))
+    return movies
+
 # Create your views here.
+# ?cursor=...&page_size=20&fields=id,title,poster_path&genre=공포
+# ?liked=true 이면 로그인한 사용자가 찜한 영화만 (마이페이지 찜 목록)
 @api_view(['GET'])
 def movie_list(request):
-    movies = Movie.objects.all()
-    serializer = MovieListSerializer(movies, many=True, context={'request': request})
-    return Response(serializer.data)
+    fields = [f for f in request.query_params.get('fields', '').split(',') if f]
+    paginator = MovieCursorPagination()
+
+    movies = filter_movies_by_relations(Movie.objects.all(), request.query_params)
+    if request.query_params.get('liked', '').lower() in ('true', '1'):
+        if not request.user.is_authenticated:
+            return Response({'error': '로그인이 필요합니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+        movies = movies.filter(liked_users=request.user)
+    if fields:
+        # 직렬화하지 않을 컬럼(overview 등)은 DB에서도 읽지 않음 (페이지네이션 키는 유지)
+        model_fields = {f.name for f in Movie._meta.concrete_fields}
+        movies = movies.only(*({'id', 'vote_average'} | (set(fields) & model_fields)))
+    page = paginator.paginate_queryset(movies, request)
+
+    context = {'request': request}
+    if not fields or 'is_liked' in fields:
+        # 찜 여부는 영화마다 조회하지 않고 찜한 영화 id 집합을 한 번만 조회
+        context['liked_movie_ids'] = get_liked_movie_ids(request.user)
+    serializer = MovieListSerializer(page, many=True, context=context, fields=fields or None)
+    return paginator.get_paginated_response(serializer.data)
+
+
+# ✅ 영화 탐색 - 조건 조합 필터 + 패싯 개수
+# ?genre=공포,스릴러&original_language=en&year_min=2000&year_max=2020&runtime_min=90&runtime_max=150
+#  &vote_min=7&emotion=긴장감&cursor=...&page_size=20
+@api_view(['GET'])
+def movie_browse(request):
+    filters = parse_browse_filters(request.query_params)
+    paginator = MovieCursorPagination()
+    page = paginator.paginate_queryset(filter_movies(filters), request)
+
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+    serializer = MovieListSerializer(page, many=True, context=context)
+    data = {'next': paginator.get_next_link(), 'results': serializer.data}
+    # 패싯은 첫 페이지에서만 계산 (다음 페이지는 같은 필터라 개수가 같음)
+    if not request.query_params.get(paginator.cursor_query_param):
+        data['facets'] = browse_facets(filters)
+    return Response(data)
+
+
+# ✅ 영화 검색 (?q=검색어&limit=20) - 제목, 태그라인, 줄거리, 감독, 출연, 키워드 대상
+@api_view(['GET'])
+def movie_search(request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': '검색어(q)를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+    movie_ids = search_movie_ids(query, limit=_limit_param(request, 20, MAX_SEARCH_RESULTS))
+    # 관련도 순서를 유지한 채로 영화 정보 조회
+    movies_by_id = Movie.objects.in_bulk(movie_ids)
+    movies = [movies_by_id[movie_id] for movie_id in movie_ids if movie_id in movies_by_id]
+
+    context = {'request': request, 'liked_movie_ids': get_liked_movie_ids(request.user)}
+    serializer = MovieListSerializer(movies, many=True, context=context)
+    return Response({'query': query, 'results': serializer.data})
+
+
+# ✅ 영화 제목 자동완성 (?q=파이&limit=10) - 초성 검색 지원 (?q=ㅍㅇㄴ)
+@api_view(['GET'])
+def movie_autocomplete(request):
+    query = request.query_params.get('q', '')
+    return Response({'query': query, 'results': suggest_titles(query, limit=_limit_param(request, 10))})
 
 
 # ✅ 영화 상세 조회 (tmdb_id 기반 + OST 포함)
+# ?include_osts=false 이면 OST를 생략 -> 클라이언트가 /<tmdb_id>/osts/ 를 병렬로 요청
+# OST 캐시가 아직 없는 영화는 osts 가 null -> 클라이언트가 /<tmdb_id>/osts/ 로 다시 요청
 @api_view(['GET'])
 def movie_detail(request, tmdb_id):
-    movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
+    movies = Movie.objects.prefetch_related(Prefetch('reviews', queryset=review_queryset()))
+    movie = get_object_or_404(movies, tmdb_id=tmdb_id)
     serializer = MovieDetailSerializer(movie, context={'request': request})
     data = serializer.data
-    data['osts'] = search_movie_ost(movie.title)
+    include_osts = request.query_params.get('include_osts', 'true').lower() not in ('false', '0', 'no')
+    if include_osts:
+        data['osts'] = get_movie_osts(movie)
     return Response(data)
 
 
+# ✅ 이 영화를 찜한 사람들이 함께 찜한 영화 (?limit=20)
+@api_view(['GET'])
+def movie_similar(request, tmdb_id):
+    movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
+    scored = similar_movies(movie, limit=_limit_param(request))
+    return _scored_movies_response(request, scored, tmdb_id=tmdb_id)
+
+
+# ✅ 내가 찜한 영화들과 비슷한 영화 추천 (?limit=20)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def movie_recommended(request):
+    scored = recommended_movies(get_liked_movie_ids(request.user), limit=_limit_param(request))
+    return _scored_movies_response(request, scored)
+
+
 # ✅ 영화 찜 기능
-@api_view(['POST'])
+# POST: 토글, PUT: 찜하기, DELETE: 찜 해제 (PUT/DELETE는 여러 번 보내도 결과가 같음)
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def toggle_movie_like(request, tmdb_id):
-    movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
-    user = request.user
-    
-    if movie.liked_users.filter(id=user.id).exists():
-        movie.liked_users.remove(user)
-        liked = False
-    else:
-        movie.liked_users.add(user)
-        liked = True
-        
+    movie = get_object_or_404(Movie.objects.only('id'), tmdb_id=tmdb_id)
+    liked = _apply_like(request.method, Movie.liked_users, movie.id, request.user.id)
+    movie.refresh_from_db(fields=['like_count'])
+
     return Response({
         'liked': liked,
-        'like_count': movie.liked_users.count()
+        'like_count': movie.like_count
+    })
+
+
+# ✅ 영화 찜 일괄 동기화 (오프라인에서 누른 찜을 한 번에 반영)
+# body: {"like": [tmdb_id, ...], "unlike": [tmdb_id, ...]}
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_movie_likes(request):
+    like_tmdb_ids = request.data.get('like', [])
+    unlike_tmdb_ids = request.data.get('unlike', [])
+    if not isinstance(like_tmdb_ids, list) or not isinstance(unlike_tmdb_ids, list):
+        return Response({'error': 'like, unlike는 tmdb_id 목록이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(like_tmdb_ids) + len(unlike_tmdb_ids) > MAX_LIKE_BATCH_SIZE:
+        return Response(
+            {'error': f'한 번에 최대 {MAX_LIKE_BATCH_SIZE}개까지 처리할 수 있습니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        like_tmdb_ids = {int(tmdb_id) for tmdb_id in like_tmdb_ids}
+        unlike_tmdb_ids = {int(tmdb_id) for tmdb_id in unlike_tmdb_ids}
+    except (TypeError, ValueError):
+        return Response({'error': 'tmdb_id는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    id_by_tmdb_id = dict(
+        Movie.objects.filter(tmdb_id__in=like_tmdb_ids | unlike_tmdb_ids).values_list('tmdb_id', 'id')
+    )
+    set_likes(
+        Movie.liked_users,
+        request.user.id,
+        like_ids=[id_by_tmdb_id[t] for t in like_tmdb_ids if t in id_by_tmdb_id],
+        unlike_ids=[id_by_tmdb_id[t] for t in unlike_tmdb_ids if t in id_by_tmdb_id],
+    )
+
+    liked_movie_ids = get_liked_movie_ids(request.user)
+    movies = Movie.objects.filter(id__in=id_by_tmdb_id.values()).values('id', 'tmdb_id', 'like_count')
+    return Response({
+        'results': [
+            {'tmdb_id': m['tmdb_id'], 'liked': m['id'] in liked_movie_ids, 'like_count': m['like_count']}
+            for m in movies
+        ],
+        'not_found': sorted((like_tmdb_ids | unlike_tmdb_ids) - set(id_by_tmdb_id)),
     })
 
 # ✅ 리뷰 목록 조회 및 생성
@@ -58,7 +254,7 @@ def toggle_movie_like(request, tmdb_id):
 def review_list_create(request, tmdb_id):
     movie = get_object_or_404(Movie, tmdb_id=tmdb_id)
     if request.method == 'GET':
-        reviews = movie.reviews.all().order_by('-created_at')
+        reviews = review_queryset().filter(movie=movie).order_by('-created_at')
         serializer = ReviewSerializer(reviews, many=True)
         return Response(serializer.data)
     elif request.method == 'POST':
@@ -91,22 +287,17 @@ def review_detail(request, review_id):
 
 
 # ✅ 리뷰 좋아요 기능
-@api_view(['POST'])
+# POST: 토글, PUT: 좋아요, DELETE: 좋아요 취소
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def toggle_review_like(request, review_id):
-    review = get_object_or_404(Review, pk=review_id)
-    user = request.user
-    
-    if review.likes.filter(id=user.id).exists():
-        review.likes.remove(user)
-        liked = False
-    else:
-        review.likes.add(user)
-        liked = True
-        
+    review = get_object_or_404(Review.objects.only('id'), pk=review_id)
+    liked = _apply_like(request.method, Review.likes, review.id, request.user.id)
+    review.refresh_from_db(fields=['like_count'])
+
     return Response({
         'liked': liked, 
-        'like_count': review.likes.count()
+        'like_count': review.like_count
     })
     
     
@@ -169,9 +360,22 @@ def user_reviews(request, username=None):
     user = get_object_or_404(User, username=username)
     
     # 사용자가 작성한 모든 리뷰 조회 (최신순 정렬)
-    reviews = Review.objects.filter(user=user).order_by('-created_at')
+    reviews = review_queryset().select_related('movie').filter(user=user).order_by('-created_at')
     
     # 각 리뷰에 영화 정보를 포함하도록 serializer 컨텍스트 설정
     serializer = ReviewSerializer(reviews, many=True, context={'include_movie': True})
     
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
+
+# 현재 사용자의 리뷰 전체 내보내기 (?output=ndjson|csv) - 나눠 읽으며 바로 응답으로 흘려보냄
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_reviews_export(request):
+    return export_response(request, REVIEW_TRANSFER)
+
+
+# 리뷰 대량 가져오기 - 본문은 NDJSON (Content-Type: text/csv 면 CSV), 배치마다 검증 후 bulk_create
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def user_reviews_import(request):
+    return import_response(request, REVIEW_TRANSFER)
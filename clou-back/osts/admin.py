@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import MovieOST
 
 # Register your models here.
+@admin.register(MovieOST)
+class MovieOSTAdmin(admin.ModelAdmin):
+    list_display = ('movie', 'status', 'fetched_at', 'expires_at')
+    list_filter = ('status',)
@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from movies.models import Movie
+from osts.models import MovieOST
+from osts.ost_cache import refresh_movie_osts
+
+class Command(BaseCommand):
+    help = '전체 영화의 OST 캐시를 미리 채웁니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='만료되지 않은 캐시도 다시 가져옵니다')
+        parser.add_argument('--delay', type=float, default=0.1, help='Spotify 요청 사이 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        movies = Movie.objects.only('id', 'title').order_by('id')
+        if not options['force']:
+            # 캐시가 없거나 만료된 영화만
+            movies = movies.filter(Q(ost_cache__isnull=True) | Q(ost_cache__expires_at__lte=timezone.now()))
+
+        total = movies.count()
+        self.stdout.write(f'OST 캐시 대상 영화: {total}개')
+
+        counts = {MovieOST.STATUS_OK: 0, MovieOST.STATUS_EMPTY: 0, MovieOST.STATUS_ERROR: 0}
+        for i, movie in enumerate(movies.iterator(), start=1):
+            entry = refresh_movie_osts(movie)
+            counts[entry.status] += 1
+            if i % 10 == 0:
+                self.stdout.write(f'{i}/{total} 영화 처리 완료...')
+            if options['delay']:
+                time.sleep(options['delay'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"OST 캐시 갱신 완료: 성공 {counts['ok']}개, 결과 없음 {counts['empty']}개, 실패 {counts['error']}개"
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.21 on 2026-10-18 14:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('movies', '0005_alter_movie_runtime'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieOST',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tracks', models.JSONField(blank=True, default=list)),
+                ('status', models.CharField(choices=[('ok', '검색 성공'), ('empty', '검색 결과 없음'), ('error', '검색 실패')], default='ok', max_length=10)),
+                ('fetched_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ost_cache', to='movies.movie')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+# 영화별 OST 검색 결과 캐시 (Spotify 응답 지연/장애와 상세 페이지를 분리하기 위함)
+class MovieOST(models.Model):
+    STATUS_OK = 'ok'
+    STATUS_EMPTY = 'empty'
+    STATUS_ERROR = 'error'
+    STATUS_CHOICES = [
+        (STATUS_OK, '검색 성공'),
+        (STATUS_EMPTY, '검색 결과 없음'),
+        (STATUS_ERROR, '검색 실패'),
+    ]
+
+    movie = models.OneToOneField('movies.Movie', on_delete=models.CASCADE, related_name='ost_cache')
+    tracks = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_OK)
+    fetched_at = models.DateTimeField()
+    # 이 시각이 지나면 stale - 기존 결과를 응답하면서 백그라운드에서 갱신
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.movie.title} OST ({self.status})"
@@ -0,0 +1,135 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import MovieOST
+from .spotify_utils import SpotifyAPIError, afetch_movie_ost, fetch_movie_ost
+
+# 같은 영화에 대한 백그라운드 갱신이 중복으로 뜨지 않도록 관리
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# 백그라운드 갱신은 스레드 수가 정해진 풀에서만 실행 (요청마다 스레드를 만들지 않음)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _ttl(status):
+    if status == MovieOST.STATUS_OK:
+        return timedelta(seconds=settings.OST_CACHE_TTL)
+    if status == MovieOST.STATUS_EMPTY:
+        return timedelta(seconds=settings.OST_NEGATIVE_CACHE_TTL)
+    return timedelta(seconds=settings.OST_ERROR_CACHE_TTL)
+
+
+def _cache_defaults(tracks):
+    if tracks is None:
+        status = MovieOST.STATUS_ERROR
+    elif tracks:
+        status = MovieOST.STATUS_OK
+    else:
+        status = MovieOST.STATUS_EMPTY
+
+    now = timezone.now()
+    defaults = {'status': status, 'fetched_at': now, 'expires_at': now + _ttl(status)}
+    # 검색 실패 시에는 기존 결과(tracks)를 지우지 않고 만료 시각만 미룬다
+    if tracks is not None:
+        defaults['tracks'] = tracks
+    return defaults
+
+
+def refresh_movie_osts(movie):
+    """Spotify에서 OST를 다시 가져와 캐시를 갱신하고 캐시 행을 반환"""
+    try:
+        tracks = fetch_movie_ost(movie.title)
+    except SpotifyAPIError:
+        tracks = None
+    entry, created = MovieOST.objects.update_or_create(movie=movie, defaults=_cache_defaults(tracks))
+    return entry
+
+
+async def arefresh_movie_osts(movie):
+    """refresh_movie_osts의 비동기 버전"""
+    try:
+        tracks = await afetch_movie_ost(movie.title)
+    except SpotifyAPIError:
+        tracks = None
+    entry, created = await MovieOST.objects.aupdate_or_create(movie=movie, defaults=_cache_defaults(tracks))
+    return entry
+
+
+def _refresh_in_background(movie):
+    try:
+        refresh_movie_osts(movie)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(movie.pk)
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(settings.OST_REFRESH_WORKERS, 1), thread_name_prefix='ost-refresh',
+            )
+        return _executor
+
+
+def _schedule_refresh(movie):
+    """백그라운드 갱신 예약 - 이미 예약된 영화이거나 대기열이 가득 차면 False"""
+    with _refreshing_lock:
+        if movie.pk in _refreshing or len(_refreshing) >= settings.OST_REFRESH_MAX_PENDING:
+            return False
+        _refreshing.add(movie.pk)
+    try:
+        _get_executor().submit(_refresh_in_background, movie)
+    except RuntimeError:
+        # 인터프리터 종료 중 - 다음 요청이나 warm_osts 에서 다시 시도
+        with _refreshing_lock:
+            _refreshing.discard(movie.pk)
+        return False
+    return True
+
+
+def get_movie_osts(movie):
+    """캐시된 OST 목록을 반환 (stale이면 기존 값을 주고 백그라운드에서 갱신)
+
+    캐시가 아예 없으면 요청 안에서 Spotify 를 기다리지 않고 None 을 반환한다.
+    (클라이언트는 비동기 OST 엔드포인트로 따로 요청, 전체 채우기는 warm_osts)
+    """
+    entry = MovieOST.objects.filter(movie=movie).first()
+    if entry is None:
+        if settings.OST_CACHE_BACKGROUND_REFRESH:
+            return None
+        return refresh_movie_osts(movie).tracks
+
+    if entry.expires_at <= timezone.now():
+        if settings.OST_CACHE_BACKGROUND_REFRESH:
+            _schedule_refresh(movie)
+        else:
+            entry = refresh_movie_osts(movie)
+    return entry.tracks
+
+
+async def aget_movie_osts(movie):
+    """get_movie_osts의 비동기 버전 (OST 전용 엔드포인트에서 사용)
+
+    처음 조회하는 영화는 Spotify 를 비동기로 기다려서 채운다.
+    """
+    entry = await MovieOST.objects.filter(movie=movie).afirst()
+    if entry is None:
+        entry = await arefresh_movie_osts(movie)
+        return entry.tracks
+
+    if entry.expires_at <= timezone.now():
+        if settings.OST_CACHE_BACKGROUND_REFRESH:
+            _schedule_refresh(movie)
+        else:
+            entry = await arefresh_movie_osts(movie)
+    return entry.tracks
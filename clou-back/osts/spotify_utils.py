@@ -1,29 +1,150 @@
+import threading
+import time
+
 import requests
+from asgiref.sync import sync_to_async
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 
+SPOTIFY_TOKEN_URL = 'https://accounts.spotify.com/api/token'
+SPOTIFY_SEARCH_URL = 'https://api.spotify.com/v1/search'
+
+# (connect, read) 타임아웃 - 외부 API가 느려도 워커가 오래 붙잡히지 않도록
+REQUEST_TIMEOUT = (3.05, 5)
+# 토큰 만료 몇 초 전에 미리 갱신할지
+TOKEN_EXPIRY_LEEWAY = 60
+
+
+def _build_session():
+    """keep-alive 커넥션 풀과 제한된 재시도를 가진 세션 생성"""
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST']),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+class SpotifyTokenManager:
+    """client-credentials 토큰을 expires_in 동안 캐시하는 매니저
+
+    토큰이 만료되면 여러 스레드가 동시에 요청해도 갱신 요청은 한 번만 나간다.
+    """
+
+    def __init__(self, session, leeway=TOKEN_EXPIRY_LEEWAY):
+        self._session = session
+        self._leeway = leeway
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+
+    def _is_valid(self):
+        return self._token is not None and time.monotonic() < self._expires_at
+
+    def get_token(self):
+        if self._is_valid():
+            return self._token
+
+        with self._lock:
+            # 락을 기다리는 동안 다른 스레드가 이미 갱신했을 수 있음
+            if self._is_valid():
+                return self._token
+            return self._refresh()
+
+    def peek_token(self):
+        """네트워크 요청 없이 캐시된 유효 토큰만 반환 (없으면 None)"""
+        return self._token if self._is_valid() else None
+
+    def invalidate(self):
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+    def _refresh(self):
+        data = {'grant_type': 'client_credentials'}
+        auth = (settings.SPOTIFY_CLIENT_ID, settings.SPOTIFY_CLIENT_SECRET)
+        try:
+            response = self._session.post(SPOTIFY_TOKEN_URL, data=data, auth=auth, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+
+        payload = response.json()
+        token = payload.get('access_token')
+        expires_in = payload.get('expires_in', 3600)
+        if token:
+            self._token = token
+            self._expires_at = time.monotonic() + max(expires_in - self._leeway, 0)
+        return token
+
+
+session = _build_session()
+token_manager = SpotifyTokenManager(session)
+
+
 def get_spotify_token():
-    url = 'https://accounts.spotify.com/api/token'
-    data = {'grant_type': 'client_credentials'}
-    auth = (settings.SPOTIFY_CLIENT_ID, settings.SPOTIFY_CLIENT_SECRET)
+    return token_manager.get_token()
 
-    response = requests.post(url, data=data, auth=auth)
-    return response.json().get('access_token')
 
-def search_movie_ost(movie_title, limit=5):
-    token = get_spotify_token()
-    headers = {'Authorization': f'Bearer {token}'}
+class SpotifyAPIError(Exception):
+    """Spotify API 호출 실패 (네트워크 오류, 인증 실패, 비정상 응답)"""
+
+
+def fetch_movie_ost(movie_title, limit=5):
+    """OST를 검색하고, 실패하면 빈 결과 대신 SpotifyAPIError를 던진다"""
     params = {'q': movie_title, 'type': 'track', 'limit': limit}
 
-    response = requests.get('https://api.spotify.com/v1/search', headers=headers, params=params)
+    response = None
+    # 캐시된 토큰이 서버에서 무효화된 경우(401) 한 번만 새 토큰으로 재시도
+    for _ in range(2):
+        token = get_spotify_token()
+        if not token:
+            raise SpotifyAPIError('Spotify 토큰을 발급받지 못했습니다.')
+        headers = {'Authorization': f'Bearer {token}'}
+        try:
+            response = session.get(SPOTIFY_SEARCH_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise SpotifyAPIError(str(e)) from e
+        if response.status_code != 401:
+            break
+        token_manager.invalidate()
+
     if response.status_code != 200:
-        return []
+        raise SpotifyAPIError(f'Spotify 검색 실패: HTTP {response.status_code}')
+    return _parse_tracks(response.json())
 
+
+def _parse_tracks(payload):
     results = []
-    for item in response.json().get('tracks', {}).get('items', []):
+    for item in payload.get('tracks', {}).get('items', []):
         results.append({
             'title': item['name'],
-            'artist_name': item['artists'][0]['name'], 
-            'preview_url': item['preview_url'],
+            'artist_name': item['artists'][0]['name'],
+            'preview_url': item.get('preview_url'),
             'spotify_url': item['external_urls']['spotify'],
         })
-    return results
\ No newline at end of file
+    return results
+
+
+async def afetch_movie_ost(movie_title, limit=5):
+    """fetch_movie_ost의 비동기 버전 - 네트워크 대기 중에 이벤트 루프를 막지 않는다
+
+    WSGI 에서는 비동기 뷰가 요청마다 새 이벤트 루프에서 실행되므로 루프별 HTTP 클라이언트를 두면
+    커넥션이 재사용되지 않고 닫히지도 않는다. 대신 keep-alive 풀을 가진 동기 세션을
+    공유 스레드 풀에서 호출한다.
+    """
+    return await sync_to_async(fetch_movie_ost, thread_sensitive=False)(movie_title, limit=limit)
+
+
+def search_movie_ost(movie_title, limit=5):
+    try:
+        return fetch_movie_ost(movie_title, limit=limit)
+    except SpotifyAPIError:
+        return []
@@ -1,3 +1,168 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from movies.models import Movie
+from .models import MovieOST
+from .ost_cache import get_movie_osts, refresh_movie_osts
+from .spotify_utils import SpotifyAPIError, SpotifyTokenManager
+
+
+def token_response(token, expires_in=3600):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {'access_token': token, 'expires_in': expires_in}
+    return response
+
+
+class SpotifyTokenManagerTests(SimpleTestCase):
+    """토큰은 만료 전까지 재사용하고, 동시에 만료를 만나도 갱신 요청은 한 번만 나가는지 확인"""
+
+    def test_concurrent_callers_share_one_refresh(self):
+        session = MagicMock()
+
+        def slow_post(*args, **kwargs):
+            # 다른 스레드들이 락 앞에서 기다리도록 갱신 요청을 잠깐 붙잡아 둔다
+            time.sleep(0.05)
+            return token_response('token-1')
+
+        session.post.side_effect = slow_post
+        manager = SpotifyTokenManager(session)
+
+        tokens = []
+        barrier = threading.Barrier(8)
+
+        def call():
+            barrier.wait()
+            tokens.append(manager.get_token())
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(session.post.call_count, 1)
+        self.assertEqual(tokens, ['token-1'] * 8)
+
+    def test_refetch_after_expiry_margin(self):
+        session = MagicMock()
+        session.post.side_effect = [token_response('token-1', expires_in=3600), token_response('token-2')]
+        manager = SpotifyTokenManager(session, leeway=60)
+
+        with patch('osts.spotify_utils.time.monotonic', return_value=1000.0):
+            self.assertEqual(manager.get_token(), 'token-1')
+        # 만료 60초 전(3540초 뒤)까지는 캐시된 토큰
+        with patch('osts.spotify_utils.time.monotonic', return_value=1000.0 + 3539):
+            self.assertEqual(manager.get_token(), 'token-1')
+        self.assertEqual(session.post.call_count, 1)
+
+        with patch('osts.spotify_utils.time.monotonic', return_value=1000.0 + 3540):
+            self.assertEqual(manager.get_token(), 'token-2')
+        self.assertEqual(session.post.call_count, 2)
+
+    def test_failed_refresh_is_not_cached(self):
+        session = MagicMock()
+        session.post.side_effect = [MagicMock(status_code=500), token_response('token-1')]
+        manager = SpotifyTokenManager(session)
+
+        self.assertIsNone(manager.get_token())
+        self.assertEqual(manager.get_token(), 'token-1')
+
+
+TRACKS = [{'title': '곡', 'artist_name': '가수', 'preview_url': None, 'spotify_url': 'https://open.spotify.com/track/1'}]
+
+
+@override_settings(OST_CACHE_TTL=3600, OST_NEGATIVE_CACHE_TTL=600, OST_ERROR_CACHE_TTL=60)
+class OSTCacheTests(TestCase):
+    """상태별 TTL, 빈 결과 캐시, 만료 시 기존 값 응답 후 백그라운드 갱신 확인"""
+
+    def setUp(self):
+        self.movie = Movie.objects.create(tmdb_id=1, title='영화')
+
+    def expire(self):
+        MovieOST.objects.filter(movie=self.movie).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    @patch('osts.ost_cache.fetch_movie_ost')
+    def test_ttl_depends_on_status(self, fetch):
+        for result, status, ttl in ((TRACKS, 'ok', 3600), ([], 'empty', 600), (SpotifyAPIError('실패'), 'error', 60)):
+            fetch.side_effect = [result]
+            before = timezone.now()
+            entry = refresh_movie_osts(self.movie)
+            self.assertEqual(entry.status, status)
+            self.assertAlmostEqual((entry.expires_at - before).total_seconds(), ttl, delta=5)
+        # 검색 실패는 마지막 빈 결과를 지우지 않고 만료 시각만 미룸
+        self.assertEqual(MovieOST.objects.get(movie=self.movie).tracks, [])
+
+    @patch('osts.ost_cache.fetch_movie_ost', return_value=[])
+    def test_empty_result_is_cached_until_expiry(self, fetch):
+        refresh_movie_osts(self.movie)
+        self.assertEqual(get_movie_osts(self.movie), [])
+        self.assertEqual(fetch.call_count, 1)
+
+        with override_settings(OST_CACHE_BACKGROUND_REFRESH=False):
+            self.expire()
+            get_movie_osts(self.movie)
+        self.assertEqual(fetch.call_count, 2)
+
+    @patch('osts.ost_cache.fetch_movie_ost', return_value=TRACKS)
+    def test_miss_does_not_call_spotify_in_request(self, fetch):
+        self.assertIsNone(get_movie_osts(self.movie))
+        fetch.assert_not_called()
+
+    @patch('osts.ost_cache._get_executor')
+    @patch('osts.ost_cache.fetch_movie_ost')
+    def test_stale_entry_served_while_refreshing(self, fetch, get_executor):
+        fetch.return_value = TRACKS
+        refresh_movie_osts(self.movie)
+        self.expire()
+
+        fetch.return_value = TRACKS * 2
+        self.assertEqual(get_movie_osts(self.movie), TRACKS)
+        # 갱신이 끝나기 전 요청은 같은 영화의 갱신을 다시 예약하지 않음
+        self.assertEqual(get_movie_osts(self.movie), TRACKS)
+        submit = get_executor.return_value.submit
+        self.assertEqual(submit.call_count, 1)
+        self.assertEqual(fetch.call_count, 1)
+
+        task, movie = submit.call_args.args
+        task(movie)
+        self.assertEqual(get_movie_osts(self.movie), TRACKS * 2)
+
+
+class MovieOstViewTests(TestCase):
+    """비동기 OST 엔드포인트 - Spotify 호출은 목으로 대체"""
+
+    def setUp(self):
+        self.movie = Movie.objects.create(tmdb_id=1, title='영화')
+
+    @patch('osts.spotify_utils.token_manager.get_token', return_value='token')
+    @patch('osts.spotify_utils.session.get')
+    async def test_fetches_once_then_serves_cache(self, get, get_token):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'tracks': {'items': [{
+            'name': '곡', 'artists': [{'name': '가수'}], 'preview_url': None,
+            'external_urls': {'spotify': 'https://open.spotify.com/track/1'},
+        }]}}
+        get.return_value = response
+
+        for _ in range(2):
+            response = await self.async_client.get('/api/v1/movies/1/osts/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {'tmdb_id': 1, 'osts': TRACKS})
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(get.call_args.kwargs['params']['q'], '영화')
+
+    @patch('osts.spotify_utils.token_manager.get_token', return_value=None)
+    async def test_spotify_failure_is_cached_as_error(self, get_token):
+        response = await self.async_client.get('/api/v1/movies/1/osts/')
+        self.assertEqual(response.json()['osts'], [])
+        entry = await MovieOST.objects.aget(movie_id=self.movie.id)
+        self.assertEqual(entry.status, MovieOST.STATUS_ERROR)
+
+    async def test_unknown_movie(self):
+        response = await self.async_client.get('/api/v1/movies/999/osts/')
+        self.assertEqual(response.status_code, 404)
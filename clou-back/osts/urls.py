@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'osts'
+
+urlpatterns = [
+    path('<int:tmdb_id>/osts/', views.movie_osts, name='movie_osts'),  # GET: 영화 OST
+]
@@ -0,0 +1,18 @@
+from django.http import JsonResponse, HttpResponseNotAllowed
+from movies.models import Movie
+from .ost_cache import aget_movie_osts
+
+# Create your views here.
+
+# ✅ 영화 OST 조회 (영화 상세와 별도로 병렬 요청할 수 있도록 분리)
+# Spotify 호출을 기다리는 동안 워커를 점유하지 않도록 비동기 뷰로 작성
+async def movie_osts(request, tmdb_id):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    movie = await Movie.objects.only('id', 'tmdb_id', 'title').filter(tmdb_id=tmdb_id).afirst()
+    if movie is None:
+        return JsonResponse({'error': '영화를 찾을 수 없습니다.'}, status=404)
+
+    tracks = await aget_movie_osts(movie)
+    return JsonResponse({'tmdb_id': movie.tmdb_id, 'osts': tracks})
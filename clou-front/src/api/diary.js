@@ -18,21 +18,34 @@ export const fetchDiaries = () => {
  * 월별 다이어리 항목 조회
  * @param {number} year - 연도
  * @param {number} month - 월(1-12)
+ * @param {string} [view] - 'calendar' 이면 달력용 요약 값만 (id, date, emotion_id, poster_path)
  * @returns {Promise} 해당 월의 다이어리 항목
  */
-export const fetchMonthlyDiaries = (year, month) => {
+export const fetchMonthlyDiaries = (year, month, view = null) => {
   try {
     // 월은 1-12 범위로 전달해야 함
     if (month < 1 || month > 12) {
       throw new Error('월은 1부터 12 사이의 값이어야 합니다.')
     }
-    return api.get(`diary/monthly/${year}/${month}/`)
+    const params = view ? { view } : {}
+    return api.get(`diary/monthly/${year}/${month}/`, { params })
   } catch (error) {
     console.error(`${year}년 ${month}월 다이어리 조회 실패:`, error)
     throw error
   }
 }
 
+/**
+ * 연도별/월별 다이어리 통계 조회
+ * @param {number} year - 연도
+ * @param {number} [month] - 월(1-12), 생략하면 연간 통계
+ * @returns {Promise} 일별 기록 수, 감정 분포, 최장 연속 기록, 많이 본 장르
+ */
+export const fetchDiaryStats = (year, month = null) => {
+  const url = month ? `diary/stats/${year}/${month}/` : `diary/stats/${year}/`
+  return api.get(url)
+}
+
 /**
  * 특정 다이어리 항목 조회
  * @param {number} id - 다이어리 ID
@@ -5,9 +5,14 @@ export const fetchEmotions = () => {
     return api.get('api/v1/emotions/')
 }
 
-// 감정별 영화 리스트
-export const fetchMoviesByEmotion = (emotionName) => {
-    return api.get(`api/v1/emotions/${emotionName}/movies/`)
+// 감정별 영화 리스트 (점수 높은 순, 페이지 단위: { count, next, previous, results })
+export const fetchMoviesByEmotion = (emotionName, params = {}) => {
+    return api.get(`api/v1/emotions/${emotionName}/movies/`, { params })
+}
+
+// 감정별 영화 리스트 다음 페이지 (응답의 next URL 그대로 요청)
+export const fetchMoviesByEmotionPage = (nextUrl) => {
+    return api.get(nextUrl)
 }
 
 // 영화의 감정 리스트
@@ -7,10 +7,12 @@ import { handleApiError, handleApiSuccess } from './auth'
  * 모든 함수는 try-catch로 감싸서 일관된 오류 처리를 제공합니다.
  */
 
-// 전체 영화 리스트 조회
-export const fetchMovies = async () => {
+// 영화 리스트 한 페이지 조회 (cursor 기반, next가 null이면 마지막 페이지)
+export const fetchMoviesPage = async (cursorUrl = null, params = {}) => {
   try {
-    const response = await api.get('/api/v1/movies/')
+    const response = cursorUrl
+      ? await api.get(cursorUrl)
+      : await api.get('/api/v1/movies/', { params })
     return handleApiSuccess(response)
   } catch (error) {
     return handleApiError(error)
@@ -27,6 +29,16 @@ export const fetchMovieById = async (tmdbId) => {
   }
 }
 
+// 영화 OST 조회 (영화 상세의 osts 가 null 이면 - 아직 캐시되지 않은 영화)
+export const fetchMovieOsts = async (tmdbId) => {
+  try {
+    const response = await api.get(`/api/v1/movies/${tmdbId}/osts/`)
+    return handleApiSuccess(response)
+  } catch (error) {
+    return handleApiError(error)
+  }
+}
+
 // 영화 찜하기/해제 토글 (같은 엔드포인트로 토글 기능 제공)
 export const toggleMovieLike = async (tmdbId) => {
   try {
@@ -100,36 +112,26 @@ export const createReviewReply = async (reviewId, content) => {
   }
 }
 
-// 사용자별 찜한 영화 목록 조회 (전체 영화 목록에서 좋아요 표시된 영화만 필터링)
+// 사용자가 찜한 영화 목록 조회 (?liked=true - 전체 카탈로그가 아니라 찜한 영화만 페이지 단위로 받음)
 export const fetchUserLikedMovies = async () => {
   try {
-    console.log('[API] fetchUserLikedMovies 호출 - 전체 영화 목록을 가져와서 필터링')
-    try {
-      // 전체 영화 목록을 가져옵니다
-      const response = await api.get('/api/v1/movies/')
-      // 응답이 배열인지 확인 (데이터 형식 오류 방지)
-      const movies = Array.isArray(response.data) ? response.data : []
-      // 응답에서 is_liked가 true인 영화만 필터링합니다
-      const likedMovies = movies.filter(movie => movie.is_liked === true)
-      console.log('[API] fetchUserLikedMovies 필터링된 결과:', likedMovies.length)
-      return {
-        success: true,
-        data: likedMovies
-      }
-    } catch (apiError) {
-      console.warn('[API] 영화 목록 API 호출 실패, 빈 결과 반환:', apiError)
-      // API 호출 실패 시에도 빈 배열 반환하여 UI 렌더링은 가능하게 함
-      return {
-        success: true,
-        data: []
-      }
+    const params = { liked: true, page_size: 100, fields: 'id,tmdb_id,title,poster_path,vote_average,is_liked' }
+    const likedMovies = []
+    let response = await api.get('/api/v1/movies/', { params })
+    likedMovies.push(...response.data.results)
+    // 찜한 영화가 100개를 넘는 경우에만 다음 페이지를 이어서 요청
+    while (response.data.next) {
+      response = await api.get(response.data.next)
+      likedMovies.push(...response.data.results)
     }
+    console.log('[API] fetchUserLikedMovies 결과:', likedMovies.length)
+    return { success: true, data: likedMovies }
   } catch (error) {
-    console.error('[API] fetchUserLikedMovies 치명적 오류:', error)
-    // 치명적 오류가 발생해도 빈 배열을 반환하여 UI 표시는 가능하도록 함
-    return { 
-      success: false, 
-      data: [], 
+    console.error('[API] fetchUserLikedMovies 오류:', error)
+    // 오류가 발생해도 빈 배열을 반환하여 UI 표시는 가능하도록 함
+    return {
+      success: false,
+      data: [],
       message: '찜한 영화를 불러오는 중 오류가 발생했습니다.'
     }
   }
@@ -157,7 +159,7 @@ export const deleteReviewReply = async (replyId) => {
 
 // ✅ 영화 검색
 export const searchMovies = (query) => {
-  return api.get(`/movies/search/?query=${encodeURIComponent(query)}`)
+  return api.get('/api/v1/movies/search/', { params: { q: query } })
 }
 
 // 사용자 리뷰 목록 조회 - 백엔드 API 활용
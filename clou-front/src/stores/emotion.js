@@ -1,11 +1,13 @@
 import { defineStore } from 'pinia'
-import { fetchEmotions, fetchMoviesByEmotion } from '@/api/emotions'
+import { fetchEmotions, fetchMoviesByEmotion, fetchMoviesByEmotionPage } from '@/api/emotions'
 
 export const useEmotionStore = defineStore('emotion', {
   state: () => ({
     emotions: [],
     selectedEmotion: null,
     moviesByEmotion: [],
+    // 감정별 영화 다음 페이지 URL (null 이면 마지막 페이지)
+    moviesByEmotionNext: null,
     loading: false,
     error: null
   }),
@@ -42,14 +44,15 @@ export const useEmotionStore = defineStore('emotion', {
       }
     },
 
-    // 특정 감정에 해당하는 영화 목록 가져오기
+    // 특정 감정에 해당하는 영화 목록 첫 페이지 가져오기 (다음 페이지는 fetchMoreMoviesByEmotion)
     async fetchMoviesByEmotion(emotionName) {
       this.loading = true
       this.error = null
       
       try {
         const response = await fetchMoviesByEmotion(emotionName)
-        this.moviesByEmotion = response.data
+        this.moviesByEmotion = response.data.results
+        this.moviesByEmotionNext = response.data.next
         
         // 선택된 감정 설정
         const selectedEmotion = this.emotions.find(emotion => emotion.name === emotionName)
@@ -57,7 +60,7 @@ export const useEmotionStore = defineStore('emotion', {
           this.selectedEmotion = selectedEmotion
         }
         
-        return response.data
+        return response.data.results
       } catch (error) {
         this.error = error.message || `'${emotionName}' 감정의 영화 목록을 불러오는데 실패했습니다.`
         console.error(`'${emotionName}' 감정의 영화 목록 조회 실패:`, error)
@@ -67,6 +70,26 @@ export const useEmotionStore = defineStore('emotion', {
       }
     },
 
+    // 감정별 영화 목록 다음 페이지를 이어 붙이기
+    async fetchMoreMoviesByEmotion() {
+      if (!this.moviesByEmotionNext || this.loading) return []
+      this.loading = true
+      this.error = null
+
+      try {
+        const response = await fetchMoviesByEmotionPage(this.moviesByEmotionNext)
+        this.moviesByEmotion = [...this.moviesByEmotion, ...response.data.results]
+        this.moviesByEmotionNext = response.data.next
+        return response.data.results
+      } catch (error) {
+        this.error = error.message || '영화 목록을 더 불러오는데 실패했습니다.'
+        console.error('감정별 영화 목록 추가 조회 실패:', error)
+        return []
+      } finally {
+        this.loading = false
+      }
+    },
+
     // 선택된 감정 설정
     setSelectedEmotion(emotion) {
       this.selectedEmotion = emotion
@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia'
 import { 
-  fetchMovies, 
+  fetchMoviesPage, 
   fetchMovieById, 
   toggleMovieLike,
   searchMovies,
@@ -10,6 +10,8 @@ import {
 export const useMovieStore = defineStore('movie', {
   state: () => ({
     movies: [],
+    // 다음 페이지 URL (null 이면 마지막 페이지)
+    nextPageUrl: null,
     currentMovie: null,
     likedMovies: [],
     loading: false,
@@ -31,15 +33,17 @@ export const useMovieStore = defineStore('movie', {
   },
 
   actions: {
-    // 영화 목록 가져오기
-    async fetchMovies() {
+    // 영화 목록 첫 페이지 가져오기 (다음 페이지는 fetchMoreMovies)
+    async fetchMovies(params = {}) {
       this.loading = true
       this.error = null
       
       try {
-        const response = await fetchMovies()
-        this.movies = response.data
-        return response.data
+        const response = await fetchMoviesPage(null, params)
+        if (!response.success) throw new Error(response.message)
+        this.movies = response.data.results
+        this.nextPageUrl = response.data.next
+        return this.movies
       } catch (error) {
         this.error = error.message || '영화 목록을 불러오는데 실패했습니다.'
         console.error('영화 목록 조회 실패:', error)
@@ -49,6 +53,27 @@ export const useMovieStore = defineStore('movie', {
       }
     },
 
+    // 영화 목록 다음 페이지를 이어 붙이기
+    async fetchMoreMovies() {
+      if (!this.nextPageUrl || this.loading) return []
+      this.loading = true
+      this.error = null
+
+      try {
+        const response = await fetchMoviesPage(this.nextPageUrl)
+        if (!response.success) throw new Error(response.message)
+        this.movies = [...this.movies, ...response.data.results]
+        this.nextPageUrl = response.data.next
+        return response.data.results
+      } catch (error) {
+        this.error = error.message || '영화 목록을 불러오는데 실패했습니다.'
+        console.error('영화 목록 조회 실패:', error)
+        return []
+      } finally {
+        this.loading = false
+      }
+    },
+
     // 특정 영화 상세 정보 가져오기
     async fetchMovieById(id) {
       this.loading = true
@@ -153,7 +178,7 @@ export const useMovieStore = defineStore('movie', {
       
       try {
         const response = await searchMovies(query)
-        return response.data
+        return response.data.results
       } catch (error) {
         this.error = error.message || '영화 검색에 실패했습니다.'
         console.error('영화 검색 실패:', error)